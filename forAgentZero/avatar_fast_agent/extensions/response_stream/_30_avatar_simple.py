@@ -9,7 +9,6 @@ from agent import LoopData
 import requests
 import base64
 import re
-import time
 import asyncio
 from openai import OpenAI
 import wave
@@ -20,14 +19,10 @@ import os
 class AvatarSimple(Extension):
     """Simple Avatar integration that just works"""
 
-    # Class-level tracking to persist across instances
-    _sent_messages = set()
-    _last_clear_time = time.time()
-    _pending_response = ""
-    _last_update_time = 0
-    _send_task = None
-    _last_sent_length = 0  # Track how much we've already sent
-    _sent_sentence_hashes = set()  # Track which sentences we've sent
+    # Streaming state keyed by agent.context.id, so contexts streaming in
+    # parallel (e.g. the Twitch agent and a web user) keep separate dedup state.
+    # Cleared by the response_stream_end extension when the response finishes.
+    _stream_states = {}
 
     # Configuration - will be loaded from agent config and Avatar API
     AVATAR_API_URL = None
@@ -42,6 +37,20 @@ class AvatarSimple(Extension):
         if not AvatarSimple._config_loaded:
             self._load_avatar_url_from_agent_config()
             self._load_config_from_avatar()
+        # Expose the state registry to the response_stream_end cleanup extension
+        self.agent.data["_avatar_stream_states"] = AvatarSimple._stream_states
+
+    def _get_stream_state(self):
+        """Get (or create) the streaming state for the current agent context"""
+        context_id = self.agent.context.id
+        state = AvatarSimple._stream_states.get(context_id)
+        if state is None:
+            state = {
+                "pending_response": "",
+                "sent_sentence_hashes": set(),  # Track which sentences we've sent
+            }
+            AvatarSimple._stream_states[context_id] = state
+        return state
 
     def _load_avatar_url_from_agent_config(self):
         """Load Avatar API URL from agent's config file"""
@@ -117,18 +126,19 @@ class AvatarSimple(Extension):
         if not response_text:
             return
 
+        state = self._get_stream_state()
+
         # Reset tracking if this is a completely new response
-        if not AvatarSimple._pending_response or not response_text.startswith(AvatarSimple._pending_response):
-            AvatarSimple._last_sent_length = 0
-            AvatarSimple._sent_sentence_hashes.clear()
+        if not state["pending_response"] or not response_text.startswith(state["pending_response"]):
+            state["sent_sentence_hashes"].clear()
 
         # Update pending response
-        AvatarSimple._pending_response = response_text
+        state["pending_response"] = response_text
 
         # Process any new complete sentences immediately
-        await self._process_new_sentences(response_text)
+        await self._process_new_sentences(response_text, state)
 
-    async def _process_new_sentences(self, full_text):
+    async def _process_new_sentences(self, full_text, state):
         """Process any new complete sentences in the streaming text"""
         try:
             # Extract all complete sentences from the FULL text
@@ -141,14 +151,14 @@ class AvatarSimple(Extension):
 
                 # Use hash to track if we've sent this exact sentence before
                 sentence_hash = hash(sentence_stripped)
-                if sentence_hash in AvatarSimple._sent_sentence_hashes:
+                if sentence_hash in state["sent_sentence_hashes"]:
                     continue
 
                 # Sentence already has emotion tag - send directly without adding emotion
                 await self._send_single_emotion_direct(sentence_stripped)
 
                 # Mark as sent
-                AvatarSimple._sent_sentence_hashes.add(sentence_hash)
+                state["sent_sentence_hashes"].add(sentence_hash)
 
         except Exception as e:
             # Don't interrupt streaming on errors
@@ -169,9 +179,9 @@ class AvatarSimple(Extension):
             num_chunks = max(1, duration_ms // 20)
             volumes = [0.7] * num_chunks
 
-            # Extract emotion and motion tags, keep original text with all tags for Avatar
-            # Avatar backend will extract both emotions and motions from the text
-            # The frontend will strip them for display
+            # Keep the original text with all emotion and motion tags: the Avatar
+            # backend turns them into structured actions and, with display_clean,
+            # removes them from the displayed text
             payload = {
                 "type": "external_audio",
                 "audio": base64.b64encode(audio_data).decode('utf-8'),
@@ -179,10 +189,11 @@ class AvatarSimple(Extension):
                 "slice_length": 20,
                 "display_text": {
                     "text": text_with_emotion,  # Keep original with ALL tags (emotions + motions)
-                    "display_clean": True,  # Signal to frontend: strip emotion and motion tags
+                    "display_clean": True,  # Signal to Avatar: strip emotion and motion tags
                     "duration": len(volumes) * 0.02
                 },
-                "source": "agent_zero_streaming"
+                "source": "agent_zero_streaming",
+                "context_id": self.agent.context.id  # Routes audio to this chat's clients
             }
 
             response = requests.post(
@@ -220,7 +231,8 @@ class AvatarSimple(Extension):
                     "text": f"{emotion} {text}",
                     "duration": len(volumes) * 0.02
                 },
-                "source": "agent_zero_streaming"
+                "source": "agent_zero_streaming",
+                "context_id": self.agent.context.id  # Routes audio to this chat's clients
             }
 
             response = requests.post(
@@ -331,7 +343,8 @@ class AvatarSimple(Extension):
                     "text": text_with_emotion,
                     "duration": len(volumes) * 0.02
                 },
-                "source": "agent_zero_extension"
+                "source": "agent_zero_extension",
+                "context_id": self.agent.context.id  # Routes audio to this chat's clients
             }
 
             response = requests.post(
@@ -0,0 +1,18 @@
+"""
+Avatar Simple Cleanup Extension
+Drops the per-context streaming state once the response has finished
+"""
+
+from python.helpers.extension import Extension
+
+
+class AvatarSimpleCleanup(Extension):
+    """Clears AvatarSimple dedup state for this context at response end"""
+
+    async def execute(self, loop_data=None, **kwargs):
+        # Registry is shared by the response_stream AvatarSimple extension
+        stream_states = self.agent.data.get("_avatar_stream_states")
+        if stream_states is None:
+            return
+
+        stream_states.pop(self.agent.context.id, None)
@@ -4,6 +4,8 @@ from loguru import logger
 from .agents.agent_interface import AgentInterface
 from .agents.basic_memory_agent import BasicMemoryAgent
 from .stateless_llm_factory import LLMFactory as StatelessLLMFactory
+from .memory_window import MemoryPolicy
+from ..utils.sentence_divider import ChunkPolicy
 
 
 class AgentFactory:
@@ -59,6 +61,19 @@ class AgentFactory:
                 tts_preprocessor_config=tts_preprocessor_config,
                 faster_first_response=basic_memory_settings.get("faster_first_response", True),
                 segment_method=basic_memory_settings.get("segment_method", "pysbd"),
+                segment_language=basic_memory_settings.get("segment_language"),
+                chunk_policy=ChunkPolicy(
+                    first_words=basic_memory_settings.get("first_chunk_words", 10),
+                    first_timeout_ms=basic_memory_settings.get("first_chunk_timeout_ms", 800),
+                    growth=basic_memory_settings.get("chunk_growth", 2.0),
+                    max_words=basic_memory_settings.get("max_chunk_words", 40),
+                ),
+                memory_policy=MemoryPolicy(
+                    mode=basic_memory_settings.get("memory_mode", "turns"),
+                    max_turns=basic_memory_settings.get("memory_max_turns", 0),
+                    max_tokens=basic_memory_settings.get("memory_max_tokens", 4000),
+                    summary_chars=basic_memory_settings.get("memory_summary_chars", 1000),
+                ),
                 interrupt_method=interrupt_method,
                 tts_enabled=basic_memory_settings.get("tts_enabled", True),
             )
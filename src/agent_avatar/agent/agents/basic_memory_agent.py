@@ -11,6 +11,7 @@ from typing import (
 from loguru import logger
 from .agent_interface import AgentInterface
 from ..output_types import SentenceOutput, DisplayText
+from ..memory_window import MemoryPolicy, MemoryWindow
 from ..stateless_llm.stateless_llm_interface import StatelessLLMInterface
 from ...chat_history_manager import get_history
 from ..transformers import (
@@ -20,6 +21,7 @@ from ..transformers import (
     display_processor,
 )
 from ...config_manager import TTSPreprocessorConfig
+from ...utils.sentence_divider import ChunkPolicy, chunking_metrics
 from ..input_types import BatchInput, TextSource, BaseInput
 from ..output_types import BaseOutput
 from prompts import prompt_loader
@@ -38,16 +40,21 @@ class BasicMemoryAgent(AgentInterface):
         tts_preprocessor_config: TTSPreprocessorConfig = None,
         faster_first_response: bool = True,
         segment_method: str = "pysbd",
+        segment_language: Optional[str] = None,
+        chunk_policy: Optional[ChunkPolicy] = None,
+        memory_policy: Optional[MemoryPolicy] = None,
         interrupt_method: Literal["system", "user"] = "user",
         tts_enabled: bool = True,
     ):
         """Initialize agent with LLM and configuration."""
         super().__init__()
-        self._memory = []
+        self._memory = MemoryWindow(memory_policy)
         self._live2d_model = live2d_model
         self._tts_preprocessor_config = tts_preprocessor_config
         self._faster_first_response = faster_first_response
         self._segment_method = segment_method
+        self._segment_language = segment_language
+        self._chunk_policy = chunk_policy
         self.interrupt_method = interrupt_method
         self._interrupt_handled = False
         self.prompt_mode_flag = False
@@ -67,12 +74,14 @@ class BasicMemoryAgent(AgentInterface):
         """Create a chat function with transformers applied."""
 
         @tts_filter(self._tts_preprocessor_config)
-        @display_processor()
+        @display_processor(self._live2d_model)
         @actions_extractor(self._live2d_model)
         @sentence_divider(
             faster_first_response=self._faster_first_response,
             segment_method=self._segment_method,
             valid_tags=["think"],
+            language=self._segment_language,
+            chunk_policy=self._chunk_policy,
         )
         async def chat_completion(
             messages: List[Dict[str, Any]]
@@ -95,19 +104,35 @@ class BasicMemoryAgent(AgentInterface):
 
     def get_memory(self):
         """Get current memory/conversation history."""
-        return self._memory
+        return self._memory.messages()
+
+    def get_chunking_metrics(self) -> Dict[str, Any]:
+        """Get time-to-first-chunk and chunk split statistics of the sentence divider"""
+        return chunking_metrics.to_dict()
 
     def load_memory_from_list(self, history_list: List[Dict[str, Any]]):
-        """Load memory from conversation history list."""
-        self._memory = history_list
-        logger.info(f"Loaded {len(history_list)} messages from history.")
+        """Load memory from conversation history list, keeping what the memory policy allows."""
+        self._memory.clear()
+        self._memory.extend(history_list)
+        logger.info(
+            f"Loaded {len(self._memory)} of {len(history_list)} messages from history "
+            f"(~{self._memory.tokens} tokens)."
+        )
 
     def _to_messages(self, input_data: BatchInput) -> List[Dict[str, str]]:
         """Convert input to message format."""
         messages = [{"role": "system", "content": self._system}]
 
-        # Add memory/history
-        messages.extend(self._memory)
+        # Add memory/history, bounded by the memory policy
+        summary = self._memory.summary
+        if summary:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Summary of the earlier conversation:\n{summary}",
+                }
+            )
+        messages.extend(self._memory.messages())
 
         # Add current input
         for item in input_data.items:
@@ -130,6 +155,7 @@ class BasicMemoryAgent(AgentInterface):
             # Generate response
             async for output in self.chat(messages):
                 yield output
+            logger.debug(f"Chunking: {chunking_metrics.summary()}")
 
             # Update memory with the conversation
             for item in input_data.items:
@@ -148,7 +174,7 @@ class BasicMemoryAgent(AgentInterface):
 
     def clear_memory(self):
         """Clear conversation memory."""
-        self._memory = []
+        self._memory.clear()
         logger.info("Memory cleared.")
 
     async def interrupt(self, input_data: BatchInput) -> AsyncIterator[SentenceOutput]:
@@ -184,4 +210,4 @@ class BasicMemoryAgent(AgentInterface):
             self.load_memory_from_list(history_list)
         except Exception as e:
             logger.error(f"Failed to load history {history_uid}: {e}")
-            self._memory = []
\ No newline at end of file
+            self._memory.clear()
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Bounded conversation memory for agents.
+
+The agent's memory used to grow by one message per turn for as long as a
+session lasted, and the whole list was copied into every request. MemoryWindow
+keeps only what the MemoryPolicy allows, trimming the oldest messages as new
+ones arrive, and keeps a running token estimate so enforcing a token budget
+never rescans the window.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Literal, Optional
+
+# Roles that start a new turn; histories use "human", LLM messages "user"
+_TURN_ROLES = ("user", "human")
+
+
+@dataclass
+class MemoryPolicy:
+    """
+    How much conversation memory an agent keeps.
+
+    - "turns": the last `max_turns` turns (a turn starts at a user message)
+    - "tokens": as many recent messages as fit in `max_tokens`
+    - "summary": like "tokens", but messages leaving the window are condensed
+      into a running summary of at most `summary_chars` characters that is
+      sent ahead of the recent messages
+
+    A limit of 0 disables it.
+    """
+
+    mode: Literal["turns", "tokens", "summary"] = "turns"
+    max_turns: int = 0
+    max_tokens: int = 4000
+    summary_chars: int = 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without a tokenizer: about four characters per token
+    for ASCII text, one token per character otherwise (CJK and the like).
+    """
+    ascii_chars = sum(1 for c in text if c < "\x80")
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content", "")
+    if isinstance(content, list):
+        # Multimodal content: only the text parts count
+        return " ".join(
+            part.get("text", "") for part in content if isinstance(part, dict)
+        )
+    return str(content)
+
+
+class MemoryWindow:
+    """Recent conversation messages, trimmed to a MemoryPolicy as they are added"""
+
+    # Characters kept from each message folded into the summary
+    SUMMARY_LINE_CHARS = 200
+
+    def __init__(self, policy: Optional[MemoryPolicy] = None):
+        self.policy = policy or MemoryPolicy()
+        self._messages: Deque[Dict[str, Any]] = deque()
+        self._message_tokens: Deque[int] = deque()
+        self._tokens = 0
+        self._turns = 0
+        self._summary_lines: Deque[str] = deque()
+        self._summary_length = 0
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of the messages in the window"""
+        return self._tokens
+
+    @property
+    def summary(self) -> str:
+        """Condensed earlier conversation ("summary" mode), or an empty string"""
+        return "\n".join(self._summary_lines)
+
+    def append(self, message: Dict[str, Any]) -> None:
+        self._messages.append(message)
+        tokens = estimate_tokens(_message_text(message))
+        self._message_tokens.append(tokens)
+        self._tokens += tokens
+        if message.get("role") in _TURN_ROLES:
+            self._turns += 1
+        self._trim()
+
+    def extend(self, messages: Iterable[Dict[str, Any]]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self._message_tokens.clear()
+        self._tokens = 0
+        self._turns = 0
+        self._summary_lines.clear()
+        self._summary_length = 0
+
+    def messages(self) -> List[Dict[str, Any]]:
+        """The messages in the window, oldest first"""
+        return list(self._messages)
+
+    def _over_budget(self) -> bool:
+        policy = self.policy
+        if policy.mode == "turns":
+            return 0 < policy.max_turns < self._turns
+        return 0 < policy.max_tokens < self._tokens
+
+    def _trim(self) -> None:
+        # The newest message always stays, even if it alone is over budget
+        trimmed = False
+        while len(self._messages) > 1 and self._over_budget():
+            self._pop_oldest()
+            trimmed = True
+        if trimmed and self.policy.mode == "turns":
+            # Don't start the window with the rest of an evicted turn
+            while (
+                len(self._messages) > 1
+                and self._messages[0].get("role") not in _TURN_ROLES
+            ):
+                self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        message = self._messages.popleft()
+        self._tokens -= self._message_tokens.popleft()
+        if message.get("role") in _TURN_ROLES:
+            self._turns -= 1
+        if self.policy.mode == "summary":
+            self._add_to_summary(message)
+
+    def _add_to_summary(self, message: Dict[str, Any]) -> None:
+        text = " ".join(_message_text(message).split())
+        if not text or self.policy.summary_chars <= 0:
+            return
+        if len(text) > self.SUMMARY_LINE_CHARS:
+            text = text[: self.SUMMARY_LINE_CHARS - 3] + "..."
+        line = f"{message.get('role', 'unknown')}: {text}"
+        self._summary_lines.append(line)
+        self._summary_length += len(line) + 1
+        while self._summary_length > self.policy.summary_chars and self._summary_lines:
+            self._summary_length -= len(self._summary_lines.popleft()) + 1
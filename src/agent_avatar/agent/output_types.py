@@ -10,6 +10,7 @@ class Actions:
     expressions: Optional[List[str] | List[int]] = None
     pictures: Optional[List[str]] = None
     sounds: Optional[List[str]] = None
+    motions: Optional[List[str]] = None
 
     def to_dict(self) -> dict:
         """Convert Actions object to a dictionary for JSON serialization"""
@@ -51,7 +52,7 @@ class SentenceOutput(BaseOutput):
     Attributes:
         display_text: Text to be displayed in UI
         tts_text: Text to be sent to TTS engine
-        actions: Associated actions (expressions, pictures, sounds)
+        actions: Associated actions (expressions, motions, pictures, sounds)
     """
 
     display_text: DisplayText  # Changed from str to DisplayText
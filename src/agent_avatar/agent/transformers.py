@@ -1,11 +1,12 @@
-from typing import AsyncIterator, Tuple, Callable, List
+from typing import AsyncIterator, Tuple, Callable, List, Optional
 from functools import wraps
 from .output_types import Actions, SentenceOutput, DisplayText
 from ..utils.tts_preprocessor import tts_filter as filter_text
 from ..live2d_model import Live2dModel
 from ..config_manager import TTSPreprocessorConfig
-from ..utils.sentence_divider import SentenceDivider
+from ..utils.sentence_divider import ChunkPolicy, SentenceDivider
 from ..utils.sentence_divider import SentenceWithTags, TagState
+from ..utils.text_rules import strip_action_tags
 from loguru import logger
 
 # Emotion extraction now handled per-sentence, no global state needed
@@ -15,6 +16,8 @@ def sentence_divider(
     faster_first_response: bool = True,
     segment_method: str = "pysbd",
     valid_tags: List[str] = None,
+    language: Optional[str] = None,
+    chunk_policy: Optional[ChunkPolicy] = None,
 ):
     """
     Decorator that transforms token stream into sentences with tags
@@ -23,6 +26,8 @@ def sentence_divider(
         faster_first_response: bool - Whether to enable faster first response
         segment_method: str - Method for sentence segmentation
         valid_tags: List[str] - List of valid tags to process
+        language: Optional[str] - Language for pysbd, detected per stream if None
+        chunk_policy: Optional[ChunkPolicy] - When to cut text without punctuation
     """
 
     def decorator(
@@ -34,6 +39,8 @@ def sentence_divider(
                 faster_first_response=faster_first_response,
                 segment_method=segment_method,
                 valid_tags=valid_tags or [],
+                language=language,
+                chunk_policy=chunk_policy,
             )
             token_stream = func(*args, **kwargs)
             async for sentence in divider.process_stream(token_stream):
@@ -48,7 +55,8 @@ def sentence_divider(
 def actions_extractor(live2d_model: Live2dModel):
     """
     Decorator that extracts actions from sentences.
-    For Agent-Zero integration, uses globally stored expressions.
+    `[emotion]` tags become expressions and `{motion}` tags become motions,
+    both validated against the model's entry in model_dict.json.
     """
 
     def decorator(
@@ -69,32 +77,28 @@ def actions_extractor(live2d_model: Live2dModel):
                 if not any(
                     tag.state in [TagState.START, TagState.END] for tag in sentence.tags
                 ):
-                    expressions = live2d_model.extract_emotion(sentence.text)
+                    expressions, motions, _ = live2d_model.parse_action_tags(
+                        sentence.text
+                    )
+                    if motions:
+                        actions.motions = motions
                     if expressions:
                         actions.expressions = expressions
                         last_emotion = expressions  # Remember this emotion for next sentence
                         logger.debug(f"Extracted expressions from sentence '{sentence.text[:50]}...': {expressions}")
                     else:
                         # Check if sentence contains emotion keywords (like "reflecting joy")
-                        sentence_lower = sentence.text.lower()
-                        if any(emotion_word in sentence_lower for emotion_word in ["joy", "happy", "smile", "laughter", "cheerful"]):
-                            actions.expressions = [3]  # Joy expression (fixed mapping)
-                            last_emotion = [3]
-                            logger.debug(f"Inferred joy emotion from text content: '{sentence.text[:50]}...'")
-                        elif any(emotion_word in sentence_lower for emotion_word in ["sad", "sadness", "sorrow", "grief"]):
-                            actions.expressions = [1]  # Sadness expression (fixed mapping)
-                            last_emotion = [1]
-                            logger.debug(f"Inferred sadness emotion from text content: '{sentence.text[:50]}...'")
-                        elif any(emotion_word in sentence_lower for emotion_word in ["anger", "angry", "mad", "furious"]):
-                            actions.expressions = [2]  # Anger expression
-                            last_emotion = [2]
-                            logger.debug(f"Inferred anger emotion from text content: '{sentence.text[:50]}...'")
+                        inferred = live2d_model.emotion_classifier.classify(sentence.text)
+                        if inferred:
+                            actions.expressions = inferred[:1]  # Strongest emotion only
+                            last_emotion = inferred[:1]
+                            logger.debug(f"Inferred expression {inferred[0]} from text content: '{sentence.text[:50]}...'")
                         else:
                             # Use last emotion context instead of defaulting to neutral
                             actions.expressions = last_emotion
                             logger.debug(f"No emotion tags in sentence, using previous emotion context: {last_emotion}")
 
-                logger.debug(f"EMOTION_DEBUG: Final actions for sentence '{sentence.text[:30]}...': expressions={actions.expressions}")
+                logger.debug(f"EMOTION_DEBUG: Final actions for sentence '{sentence.text[:30]}...': expressions={actions.expressions}, motions={actions.motions}")
                 yield sentence, actions
 
         return wrapper
@@ -102,9 +106,13 @@ def actions_extractor(live2d_model: Live2dModel):
     return decorator
 
 
-def display_processor():
+def display_processor(live2d_model: Optional[Live2dModel] = None):
     """
     Decorator that processes text for display.
+
+    Args:
+        live2d_model: Optional[Live2dModel] - Model whose emotion tags are stripped.
+            Falls back to the default emotion and motion tags if None.
     """
 
     def decorator(
@@ -117,12 +125,11 @@ def display_processor():
             stream = func(*args, **kwargs)
 
             async for sentence, actions in stream:
-                text = sentence.text
-
-                # Remove emotion tags from display text
-                emotion_tags = ['[neutral]', '[joy]', '[sadness]', '[anger]', '[surprise]', '[fear]', '[disgust]', '[smirk]']
-                for tag in emotion_tags:
-                    text = text.replace(tag, '').replace(tag.upper(), '').replace(tag.lower(), '')
+                # Remove emotion and motion tags from display text
+                if live2d_model is not None:
+                    text = live2d_model.remove_action_tags(sentence.text)
+                else:
+                    text = strip_action_tags(sentence.text)
                 text = text.strip()
 
                 # Handle think tag states
@@ -4,24 +4,70 @@ Handles sending messages and receiving responses from Agent-Zero.
 """
 
 import asyncio
+import time
 import aiohttp
 import json
+from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from loguru import logger
 
+DEFAULT_BASE_URL = "http://localhost:50001"
+
+# Connection pool settings for the shared aiohttp session
+CONNECTION_LIMIT = 100  # Total simultaneous connections
+CONNECTION_LIMIT_PER_HOST = 20  # Simultaneous connections to Agent-Zero
+KEEPALIVE_TIMEOUT = 60  # Seconds an idle connection is kept open
+DNS_CACHE_TTL = 300  # Seconds a resolved Agent-Zero address is cached
+WARM_UP_TIMEOUT = 5  # Seconds to wait for the warm-up request
+
+
+@dataclass
+class RequestMetrics:
+    """Latency statistics for requests sent to Agent-Zero"""
+
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+
+    def record(self, latency_ms: float, error: bool = False) -> None:
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        self.last_ms = latency_ms
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.avg_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "last_ms": round(self.last_ms, 1),
+        }
+
 
 class AgentZeroClient:
     """Client for bidirectional communication with Agent-Zero"""
 
     def __init__(
         self,
-        base_url: str,
+        base_url: str = DEFAULT_BASE_URL,
         context_id: Optional[str] = None,
         enabled: bool = False
     ):
         """
         Initialize the Agent-Zero client.
 
+        The HTTP session is opened by `start()` (called on server startup) and
+        released by `close()` (called on shutdown).
+
         Args:
             base_url: Base URL for Agent-Zero API (default: http://localhost:50001)
             context_id: Optional context ID for maintaining conversation state
@@ -31,17 +77,74 @@ class AgentZeroClient:
         self.context_id = context_id or "avatar_context"
         self.enabled = enabled
         self.session: Optional[aiohttp.ClientSession] = None
+        self.metrics = RequestMetrics()
 
     async def __aenter__(self):
         """Async context manager entry"""
-        if self.enabled:
-            self.session = aiohttp.ClientSession()
+        await self.start()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
+        await self.close()
+
+    async def start(self) -> None:
+        """Open the shared HTTP session with a pooled, keep-alive connector"""
+        if not self.enabled or (self.session and not self.session.closed):
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            limit_per_host=CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
+        logger.debug("Agent-Zero HTTP session opened")
+
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self.session and not self.session.closed:
             await self.session.close()
+            logger.debug("Agent-Zero HTTP session closed")
+        self.session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, opening it if startup did not"""
+        if not self.session or self.session.closed:
+            await self.start()
+        return self.session
+
+    async def warm_up(self) -> bool:
+        """
+        Send a lightweight request so the DNS lookup and the first pooled
+        connection are ready before the first user message.
+
+        Returns:
+            bool: True if Agent-Zero answered (with any status code)
+        """
+        if not self.enabled:
+            return False
+
+        session = await self._get_session()
+        start_time = time.perf_counter()
+        try:
+            async with session.get(
+                self.base_url, timeout=aiohttp.ClientTimeout(total=WARM_UP_TIMEOUT)
+            ) as response:
+                await response.read()
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            logger.info(
+                f"Agent-Zero warm-up succeeded in {latency_ms:.0f} ms (status {response.status})"
+            )
+            return True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Agent-Zero warm-up failed, is {self.base_url} reachable? {e}")
+            return False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get latency statistics for requests sent to Agent-Zero"""
+        return self.metrics.to_dict()
 
     async def send_message_streaming(
         self,
@@ -81,16 +184,17 @@ class AgentZeroClient:
             payload["images"] = images
             logger.info(f"Including {len(images)} images in Agent-Zero message")
 
+        start_time = time.perf_counter()
+        failed = True
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            session = await self._get_session()
 
             url = f"{self.base_url}/avatar_message_stream"
             logger.info(f"Sending message to Agent-Zero: {text[:50]}...")
 
             # Send request and wait for complete response
             # Real-time chunks are sent via intercept extension to /stream/{history_uid}
-            async with self.session.post(
+            async with session.post(
                 url,
                 json=payload,
                 headers={"Content-Type": "application/json"},
@@ -99,6 +203,8 @@ class AgentZeroClient:
                 if response.status == 200:
                     data = await response.json()
                     if data.get("success") and "message" in data:
+                        failed = False
+                        self._record_latency(start_time, failed)
                         # Yield the complete response
                         yield data["message"]
                     else:
@@ -117,6 +223,18 @@ class AgentZeroClient:
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
             yield "Sorry, I encountered an unexpected error."
+        finally:
+            if failed:
+                self._record_latency(start_time, failed)
+
+    def _record_latency(self, start_time: float, failed: bool) -> None:
+        """Record the latency of a request to Agent-Zero"""
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        self.metrics.record(latency_ms, error=failed)
+        logger.info(
+            f"Agent-Zero request {'failed' if failed else 'completed'} in {latency_ms:.0f} ms "
+            f"(avg {self.metrics.avg_ms:.0f} ms over {self.metrics.count} requests)"
+        )
 
 
     def set_enabled(self, enabled: bool):
@@ -155,7 +273,11 @@ _agent_zero_client: Optional[AgentZeroClient] = None
 
 
 def get_agent_zero_client() -> AgentZeroClient:
-    """Get the global Agent-Zero client instance"""
+    """
+    Get the global Agent-Zero client instance.
+
+    Returns a disabled client if `init_agent_zero_client` has not been called.
+    """
     global _agent_zero_client
     if _agent_zero_client is None:
         _agent_zero_client = AgentZeroClient()
@@ -1,11 +1,17 @@
+import asyncio
 import os
 import re
-import json
 import uuid
 from datetime import datetime
-from typing import Literal, List, TypedDict, Optional
+from typing import Any, Callable, Dict, Literal, List, Tuple, TypedDict, Optional
 from loguru import logger
 
+from .history_store.history_cache import CachedHistoryStore
+from .history_store.history_store_factory import HistoryStoreFactory
+from .history_store.history_store_interface import HistoryStoreInterface
+from .history_store.history_writer import HistoryWriter
+from .history_store.jsonl_store import JsonlHistoryStore
+
 
 class HistoryMessage(TypedDict):
     role: Literal["human", "ai"]
@@ -16,6 +22,31 @@ class HistoryMessage(TypedDict):
     avatar: Optional[str]
 
 
+class HistoryPage(TypedDict):
+    messages: List[HistoryMessage]
+    # Index of the first message of the page within the whole history
+    offset: int
+    total: int
+
+
+# Separates the timestamp and offset of a page cursor
+CURSOR_SEPARATOR = "|"
+
+
+def page_cursor(page: HistoryPage) -> Optional[str]:
+    """
+    Cursor of a page, to pass as `before` to get the page preceding it.
+
+    It holds the timestamp and the offset of the page's first message.
+    Messages are only ever appended, so the offset stays exact and breaks
+    ties between messages stored within the same second.
+    """
+    if not page["messages"]:
+        return None
+    timestamp = page["messages"][0].get("timestamp", "")
+    return f"{timestamp}{CURSOR_SEPARATOR}{page['offset']}"
+
+
 def _is_safe_filename(filename: str) -> bool:
     """Validate filename for safety and allowed characters"""
     if not filename or len(filename) > 255:
@@ -38,26 +69,79 @@ def _sanitize_path_component(component: str) -> str:
     return sanitized
 
 
-def _ensure_conf_dir(conf_uid: str) -> str:
-    """Ensure the directory for a specific conf exists and return its path"""
-    if not conf_uid:
-        raise ValueError("conf_uid cannot be empty")
+# Backend all history functions go through
+_history_store: HistoryStoreInterface = CachedHistoryStore(JsonlHistoryStore())
+# Delete empty histories while listing; off when the maintenance task prunes them
+_prune_empty_on_list = True
 
-    safe_conf_uid = _sanitize_path_component(conf_uid)
-    base_dir = os.path.join("chat_history", safe_conf_uid)
-    os.makedirs(base_dir, exist_ok=True)
-    return base_dir
+
+def init_history_store(
+    history_backend: str = "jsonl",
+    base_dir: str = "chat_history",
+    db_path: str = "",
+    cache_messages: int = 20000,
+    prune_empty_on_list: bool = True,
+) -> HistoryStoreInterface:
+    """
+    Select the backend all history functions go through.
+
+    Args:
+        history_backend: "jsonl" (one file per history) or "sqlite"
+        base_dir: Chat history directory
+        db_path: SQLite database path, defaults to <base_dir>/history.db
+        cache_messages: Messages of recently used histories kept in memory.
+            0 disables the cache.
+        prune_empty_on_list: Delete empty histories when listing histories.
+            Disable when the maintenance task prunes them instead.
+
+    Returns:
+        HistoryStoreInterface: The store now in use
+    """
+    global _history_store, _prune_empty_on_list
+    _prune_empty_on_list = prune_empty_on_list
+    backend = HistoryStoreFactory.get_history_store(
+        history_backend, base_dir=base_dir, db_path=db_path
+    )
+    _history_store = CachedHistoryStore(backend, max_messages=cache_messages)
+    return _history_store
 
 
-def _get_safe_history_path(conf_uid: str, history_uid: str) -> str:
-    """Get sanitized path for history file"""
-    safe_conf_uid = _sanitize_path_component(conf_uid)
-    safe_history_uid = _sanitize_path_component(history_uid)
-    base_dir = os.path.join("chat_history", safe_conf_uid)
-    full_path = os.path.normpath(os.path.join(base_dir, f"{safe_history_uid}.json"))
-    if not full_path.startswith(base_dir):
-        raise ValueError("Invalid path: Path traversal detected")
-    return full_path
+def recover_history_store() -> Dict[str, int]:
+    """
+    Repair histories left damaged by a crash. Call at startup, before any
+    history is read or written.
+
+    Returns:
+        Dict[str, int]: Number of problems fixed per kind
+    """
+    try:
+        report = _history_store.recover()
+    except Exception as e:
+        logger.error(f"History recovery failed: {e}")
+        return {}
+    fixed = {kind: count for kind, count in report.items() if count}
+    if fixed:
+        logger.warning(f"Recovered chat history after an unclean shutdown: {fixed}")
+    return report
+
+
+def get_history_store() -> HistoryStoreInterface:
+    """Return the history store in use"""
+    return _history_store
+
+
+# Queues writes per history so async callers never wait on disk I/O
+_history_writer = HistoryWriter(get_history_store)
+
+
+def get_history_writer() -> HistoryWriter:
+    """Return the writer queueing async history writes"""
+    return _history_writer
+
+
+def _safe_uids(conf_uid: str, history_uid: str) -> tuple[str, str]:
+    """Sanitize conf_uid and history_uid before they reach the store"""
+    return _sanitize_path_component(conf_uid), _sanitize_path_component(history_uid)
 
 
 def create_new_history(conf_uid: str) -> str:
@@ -69,24 +153,23 @@ def create_new_history(conf_uid: str) -> str:
     # Use uuid.uuid4().hex to generate a UUID without hyphens
     # New format: UUID_YYYY-MM-DD_HH-MM-SS
     history_uid = f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{uuid.uuid4().hex}"
-    conf_dir = _ensure_conf_dir(conf_uid)  # conf_uid is sanitized here
 
     # Create history file with empty metadata
     try:
-        filepath = os.path.join(conf_dir, f"{history_uid}.json")
-        initial_data = [
+        safe_conf_uid, safe_history_uid = _safe_uids(conf_uid, history_uid)
+        _history_store.create(
+            safe_conf_uid,
+            safe_history_uid,
             {
                 "role": "metadata",
                 "timestamp": datetime.now().isoformat(timespec="seconds"),
-            }
-        ]
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(initial_data, f, ensure_ascii=False, indent=2)
+            },
+        )
     except Exception as e:
         logger.error(f"Failed to create new history file: {e}")
         return ""
 
-    logger.debug(f"Created new history file with empty metadata: {filepath}")
+    logger.debug(f"Created new history file with empty metadata: {history_uid}")
     return history_uid
 
 
@@ -115,18 +198,17 @@ def store_message(
             logger.warning("Missing history_uid")
         return
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
-    logger.debug(f"Storing {role} message to {filepath}")
+    safe_conf_uid, safe_history_uid = _safe_uids(conf_uid, history_uid)
+    logger.debug(f"Storing {role} message to history {history_uid}")
+
+    _history_store.append_message(
+        safe_conf_uid, safe_history_uid, _new_message(role, content, name, avatar)
+    )
+    logger.debug(f"Successfully stored {role} message")
 
-    history_data = []
-    if os.path.exists(filepath):
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
-        except Exception:
-            logger.error(f"Failed to load history file: {filepath}")
-            pass
 
+def _new_message(role: str, content: str, name: str | None, avatar: str | None) -> dict:
+    """Build a history message stamped with the current time"""
     now_str = datetime.now().isoformat(timespec="seconds")
     new_item = {
         "role": role,
@@ -139,12 +221,7 @@ def store_message(
         new_item["name"] = name
     if avatar is not None:
         new_item["avatar"] = avatar
-
-    history_data.append(new_item)
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(history_data, f, ensure_ascii=False, indent=2)
-    logger.debug(f"Successfully stored {role} message")
+    return new_item
 
 
 def get_metadata(conf_uid: str, history_uid: str) -> dict:
@@ -152,16 +229,8 @@ def get_metadata(conf_uid: str, history_uid: str) -> dict:
     if not conf_uid or not history_uid:
         return {}
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
-    if not os.path.exists(filepath):
-        return {}
-
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-
-        if history_data and history_data[0]["role"] == "metadata":
-            return history_data[0]
+        return _history_store.get_metadata(*_safe_uids(conf_uid, history_uid))
     except Exception as e:
         logger.error(f"Failed to get metadata: {e}")
     return {}
@@ -176,29 +245,11 @@ def update_metadate(conf_uid: str, history_uid: str, metadata: dict) -> bool:
     if not conf_uid or not history_uid:
         return False
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
-    if not os.path.exists(filepath):
-        return False
-
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-
-        if history_data and history_data[0]["role"] == "metadata":
-            # Update existing metadata while preserving other fields
-            history_data[0].update(metadata)
-        else:
-            # Create new metadata with timestamp if none exists
-            new_metadata = {
-                "role": "metadata",
-                "timestamp": datetime.now().isoformat(timespec="seconds"),
-            }
-            new_metadata.update(metadata)  # Add new fields
-            history_data.insert(0, new_metadata)
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(history_data, f, ensure_ascii=False, indent=2)
-
+        if not _history_store.update_metadata(
+            *_safe_uids(conf_uid, history_uid), metadata
+        ):
+            return False
         logger.debug(f"Updated metadata for history {history_uid}")
         return True
     except Exception as e:
@@ -215,19 +266,81 @@ def get_history(conf_uid: str, history_uid: str) -> List[HistoryMessage]:
             logger.warning("Missing history_uid")
         return []
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    try:
+        messages = _history_store.get_messages(*_safe_uids(conf_uid, history_uid))
+    except Exception as e:
+        # Not the same as an empty history: say why nothing is returned
+        logger.error(f"Failed to read history {history_uid}: {e}")
+        return []
 
-    if not os.path.exists(filepath):
-        logger.warning(f"History file not found: {filepath}")
+    if messages is None:
+        logger.warning(f"History file not found: {history_uid}")
         return []
+    return messages
+
+
+def get_history_page(
+    conf_uid: str,
+    history_uid: str,
+    offset: Optional[int] = None,
+    limit: int = 50,
+    before: Optional[str] = None,
+) -> HistoryPage:
+    """Read one page of chat history
+
+    Args:
+        conf_uid: Configuration unique identifier
+        history_uid: History unique identifier
+        offset: Index of the first message to return. None returns the
+            latest `limit` messages (before the cursor, if given).
+        limit: Maximum number of messages to return
+        before: Cursor from page_cursor(), used when offset is None: only
+            messages older than the page it came from are returned. A bare
+            timestamp is accepted as well and returns messages older than it.
+
+    Returns:
+        HistoryPage: The messages, their offset and the total message count.
+        Empty if the history does not exist.
+    """
+    empty: HistoryPage = {"messages": [], "offset": 0, "total": 0}
+    if not conf_uid or not history_uid:
+        logger.warning("Missing conf_uid or history_uid")
+        return empty
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-            # Filter out metadata
-            return [msg for msg in history_data if msg["role"] != "metadata"]
-    except Exception:
-        return []
+        safe_uids = _safe_uids(conf_uid, history_uid)
+        if offset is None:
+            page = _history_page_before(safe_uids, before, limit)
+        else:
+            page = _history_store.get_message_page(*safe_uids, offset, limit)
+    except Exception as e:
+        logger.error(f"Failed to read history page: {e}")
+        return empty
+
+    if page is None:
+        logger.warning(f"History file not found: {history_uid}")
+        return empty
+    messages, offset, total = page
+    return {"messages": messages, "offset": offset, "total": total}
+
+
+def _history_page_before(
+    safe_uids: Tuple[str, str], before: Optional[str], limit: int
+) -> Optional[Tuple[List[HistoryMessage], int, int]]:
+    """Page of the latest messages older than the `before` cursor (or of all)"""
+    limit = max(0, limit)
+    if before is None:
+        return _history_store.get_message_page(*safe_uids, None, limit)
+
+    _, separator, offset = before.rpartition(CURSOR_SEPARATOR)
+    if separator and offset.isdigit():
+        end = int(offset)
+    else:
+        end = _history_store.count_messages_before(*safe_uids, before)
+        if end is None:
+            return None
+    start = max(0, end - limit)
+    return _history_store.get_message_page(*safe_uids, start, end - start)
 
 
 def delete_history(conf_uid: str, history_uid: str) -> bool:
@@ -236,11 +349,9 @@ def delete_history(conf_uid: str, history_uid: str) -> bool:
         logger.warning("Missing conf_uid or history_uid")
         return False
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
     try:
-        if os.path.exists(filepath):
-            os.remove(filepath)
-            logger.debug(f"Successfully deleted history file: {filepath}")
+        if _history_store.delete(*_safe_uids(conf_uid, history_uid)):
+            logger.debug(f"Successfully deleted history file: {history_uid}")
             return True
     except Exception as e:
         logger.error(f"Failed to delete history file: {e}")
@@ -248,52 +359,40 @@ def delete_history(conf_uid: str, history_uid: str) -> bool:
 
 
 def get_history_list(conf_uid: str) -> List[dict]:
-    """Get list of histories with their latest messages"""
+    """Get list of histories with their latest messages and message counts
+
+    Served from the history store's index, so only the first call for a
+    conf_uid reads the histories.
+    """
     if not conf_uid:
         return []
 
     histories = []
-    conf_dir = _ensure_conf_dir(conf_uid)
     empty_history_uids = []
 
     try:
-        for filename in os.listdir(conf_dir):
-            if not filename.endswith(".json"):
-                continue
+        safe_conf_uid = _sanitize_path_component(conf_uid)
+        summaries = _history_store.list_history_summaries(safe_conf_uid)
 
-            history_uid = filename[:-5]
-            filepath = os.path.join(conf_dir, filename)
-
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    messages = json.load(f)
-
-                    # Filter out metadata for checking if history is empty
-                    actual_messages = [
-                        msg for msg in messages if msg["role"] != "metadata"
-                    ]
-                    if not actual_messages:
-                        empty_history_uids.append(history_uid)
-                        continue
-
-                    latest_message = actual_messages[-1]
-                    history_info = {
-                        "uid": history_uid,
-                        "latest_message": latest_message,
-                        "timestamp": (
-                            latest_message["timestamp"] if latest_message else None
-                        ),
-                    }
-                    histories.append(history_info)
-            except Exception as e:
-                logger.error(f"Error reading history file {filename}: {e}")
+        for history_uid, latest_message, message_count in summaries:
+            if latest_message is None:
+                empty_history_uids.append(history_uid)
                 continue
 
-        # Clean up empty histories if there are other non-empty ones
-        if len(empty_history_uids) > 0 and len(os.listdir(conf_dir)) > 1:
+            history_info = {
+                "uid": history_uid,
+                "latest_message": latest_message,
+                "timestamp": latest_message.get("timestamp"),
+                "message_count": message_count,
+            }
+            histories.append(history_info)
+
+        # Clean up empty histories if there are other non-empty ones, unless
+        # the maintenance task prunes them
+        if _prune_empty_on_list and empty_history_uids and len(summaries) > 1:
             for uid in empty_history_uids:
                 try:
-                    os.remove(os.path.join(conf_dir, f"{uid}.json"))
+                    _history_store.delete(safe_conf_uid, uid)
                     logger.info(f"Removed empty history file: {uid}")
                 except Exception as e:
                     logger.error(f"Failed to remove empty history file {uid}: {e}")
@@ -319,30 +418,11 @@ def modify_latest_message(
         logger.warning("Missing conf_uid or history_uid")
         return False
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
-    if not os.path.exists(filepath):
-        logger.warning(f"History file not found: {filepath}")
-        return False
-
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-
-        if not history_data:
-            logger.warning("History is empty")
+        if not _history_store.modify_latest_message(
+            *_safe_uids(conf_uid, history_uid), role, new_content
+        ):
             return False
-
-        latest_message = history_data[-1]
-        if latest_message["role"] != role:
-            logger.warning(
-                f"Latest message role ({latest_message['role']}) doesn't match requested role ({role})"
-            )
-            return False
-
-        latest_message["content"] = new_content
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(history_data, f, ensure_ascii=False, indent=2)
-
         logger.debug(f"Successfully modified latest {role} message")
         return True
 
@@ -359,12 +439,10 @@ def rename_history_file(
         logger.warning("Missing required parameters for rename")
         return False
 
-    old_filepath = _get_safe_history_path(conf_uid, old_history_uid)
-    new_filepath = _get_safe_history_path(conf_uid, new_history_uid)
-
     try:
-        if os.path.exists(old_filepath):
-            os.rename(old_filepath, new_filepath)
+        safe_conf_uid, safe_old_uid = _safe_uids(conf_uid, old_history_uid)
+        safe_new_uid = _sanitize_path_component(new_history_uid)
+        if _history_store.rename(safe_conf_uid, safe_old_uid, safe_new_uid):
             logger.info(
                 f"Renamed history file from {old_history_uid} to {new_history_uid}"
             )
@@ -372,3 +450,225 @@ def rename_history_file(
     except Exception as e:
         logger.error(f"Failed to rename history file: {e}")
     return False
+
+
+def compact_history(conf_uid: str, history_uid: str) -> bool:
+    """Rewrite a history in compact form, folding in metadata updates and edits"""
+    if not conf_uid or not history_uid:
+        logger.warning("Missing conf_uid or history_uid")
+        return False
+
+    try:
+        if _history_store.compact(*_safe_uids(conf_uid, history_uid)):
+            logger.debug(f"Compacted history {history_uid}")
+            return True
+    except Exception as e:
+        logger.error(f"Failed to compact history {history_uid}: {e}")
+    return False
+
+
+# ==== async API
+# For use from the event loop: writes are queued per history and carried out
+# in a worker thread, reads first wait for the writes queued before them.
+
+
+async def async_store_message(
+    conf_uid: str,
+    history_uid: str,
+    role: Literal["human", "ai", "system"],
+    content: str,
+    name: str | None = None,
+    avatar: str | None = None,
+    wait: bool = False,
+) -> None:
+    """Queue a message for a specific history without blocking on disk I/O
+
+    Args:
+        conf_uid: Configuration unique identifier
+        history_uid: History unique identifier
+        role: Message role ("human", "ai" or "system")
+        content: Message content
+        name: Optional display name (default None)
+        avatar: Optional avatar URL (default None)
+        wait: Return only once the message is on disk (default False).
+            Otherwise use async_flush_history as the durability point.
+    """
+    if not conf_uid or not history_uid:
+        if not conf_uid:
+            logger.warning("Missing conf_uid")
+        if not history_uid:
+            logger.warning("Missing history_uid")
+        return
+
+    safe_conf_uid, safe_history_uid = _safe_uids(conf_uid, history_uid)
+    logger.debug(f"Queuing {role} message for history {history_uid}")
+    written = _history_writer.append(
+        safe_conf_uid, safe_history_uid, _new_message(role, content, name, avatar)
+    )
+    if wait:
+        await written
+
+
+async def async_flush_history(
+    conf_uid: Optional[str] = None, history_uid: Optional[str] = None
+) -> None:
+    """Wait until the queued writes are on disk
+
+    Args:
+        conf_uid: Only wait for this conf_uid (default: all)
+        history_uid: Only wait for this history (default: all of conf_uid)
+    """
+    try:
+        safe_conf_uid = _sanitize_path_component(conf_uid) if conf_uid else None
+        safe_history_uid = (
+            _sanitize_path_component(history_uid) if history_uid else None
+        )
+    except ValueError as e:
+        logger.warning(f"Not flushing history: {e}")
+        return
+    await _history_writer.flush(safe_conf_uid, safe_history_uid)
+
+
+async def _in_write_queue(
+    conf_uid: str, history_uid: str, func: Callable[..., Any], *args: Any
+) -> Any:
+    """Run a sync history function in a thread, after the history's queued writes"""
+    try:
+        safe_conf_uid, safe_history_uid = _safe_uids(conf_uid, history_uid)
+    except ValueError:
+        # Let func report the invalid uid the way it always does
+        return await asyncio.to_thread(func, conf_uid, history_uid, *args)
+    return await _history_writer.submit(
+        safe_conf_uid,
+        safe_history_uid,
+        lambda _store, _conf_uid, _history_uid: func(conf_uid, history_uid, *args),
+    )
+
+
+async def async_create_new_history(conf_uid: str) -> str:
+    """Async version of create_new_history"""
+    return await asyncio.to_thread(create_new_history, conf_uid)
+
+
+async def async_get_history(conf_uid: str, history_uid: str) -> List[HistoryMessage]:
+    """Async version of get_history, including messages still queued"""
+    if not conf_uid or not history_uid:
+        return get_history(conf_uid, history_uid)
+    return await _in_write_queue(conf_uid, history_uid, get_history)
+
+
+async def async_get_history_page(
+    conf_uid: str,
+    history_uid: str,
+    offset: Optional[int] = None,
+    limit: int = 50,
+    before: Optional[str] = None,
+) -> HistoryPage:
+    """Async version of get_history_page, including messages still queued"""
+    if not conf_uid or not history_uid:
+        return get_history_page(conf_uid, history_uid, offset, limit, before)
+    return await _in_write_queue(
+        conf_uid, history_uid, get_history_page, offset, limit, before
+    )
+
+
+async def async_get_history_list(conf_uid: str) -> List[dict]:
+    """Async version of get_history_list, including messages still queued"""
+    await async_flush_history(conf_uid)
+    return await asyncio.to_thread(get_history_list, conf_uid)
+
+
+async def async_delete_history(conf_uid: str, history_uid: str) -> bool:
+    """Async version of delete_history, run after the history's queued writes"""
+    if not conf_uid or not history_uid:
+        return delete_history(conf_uid, history_uid)
+    return await _in_write_queue(conf_uid, history_uid, delete_history)
+
+
+async def async_update_metadate(
+    conf_uid: str, history_uid: str, metadata: dict
+) -> bool:
+    """Async version of update_metadate, run after the history's queued writes"""
+    if not conf_uid or not history_uid:
+        return False
+    return await _in_write_queue(conf_uid, history_uid, update_metadate, metadata)
+
+
+async def async_modify_latest_message(
+    conf_uid: str,
+    history_uid: str,
+    role: Literal["human", "ai", "system"],
+    new_content: str,
+) -> bool:
+    """Async version of modify_latest_message, run after the history's queued writes"""
+    if not conf_uid or not history_uid:
+        return modify_latest_message(conf_uid, history_uid, role, new_content)
+    return await _in_write_queue(
+        conf_uid, history_uid, modify_latest_message, role, new_content
+    )
+
+
+async def async_compact_history(conf_uid: str, history_uid: str) -> bool:
+    """Async version of compact_history, run after the history's queued writes"""
+    if not conf_uid or not history_uid:
+        return compact_history(conf_uid, history_uid)
+    return await _in_write_queue(conf_uid, history_uid, compact_history)
+
+
+class HistoryBatch:
+    """
+    Write-behind buffer for messages going to several histories.
+
+    Group conversations store every message in each member's history. A batch
+    collects them in memory and flush hands each history its messages as a
+    single queued write, so a history is written once per flush instead of
+    once per message.
+    """
+
+    def __init__(self) -> None:
+        self._messages: Dict[Tuple[str, str], List[dict]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(messages) for messages in self._messages.values())
+
+    def add(
+        self,
+        conf_uid: str,
+        history_uid: str,
+        role: Literal["human", "ai", "system"],
+        content: str,
+        name: str | None = None,
+        avatar: str | None = None,
+    ) -> None:
+        """Buffer a message for a history; arguments as in store_message"""
+        if not conf_uid or not history_uid:
+            if not conf_uid:
+                logger.warning("Missing conf_uid")
+            if not history_uid:
+                logger.warning("Missing history_uid")
+            return
+        key = _safe_uids(conf_uid, history_uid)
+        self._messages.setdefault(key, []).append(
+            _new_message(role, content, name, avatar)
+        )
+
+    async def flush(self, wait: bool = False) -> None:
+        """
+        Queue the buffered messages, one write per history.
+
+        Args:
+            wait: Return only once they are on disk
+        """
+        if not self._messages:
+            return
+        messages, self._messages = self._messages, {}
+        written = [
+            _history_writer.append_many(conf_uid, history_uid, history_messages)
+            for (conf_uid, history_uid), history_messages in messages.items()
+        ]
+        logger.debug(
+            f"Flushed {sum(map(len, messages.values()))} buffered messages "
+            f"to {len(messages)} histories"
+        )
+        if wait:
+            await asyncio.gather(*written, return_exceptions=True)
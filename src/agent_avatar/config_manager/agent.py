@@ -18,6 +18,17 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
 
     faster_first_response: Optional[bool] = Field(True, alias="faster_first_response")
     segment_method: Literal["regex", "pysbd"] = Field("pysbd", alias="segment_method")
+    segment_language: Optional[str] = Field(None, alias="segment_language")
+    first_chunk_words: int = Field(10, ge=0, alias="first_chunk_words")
+    first_chunk_timeout_ms: int = Field(800, ge=0, alias="first_chunk_timeout_ms")
+    chunk_growth: float = Field(2.0, ge=1.0, alias="chunk_growth")
+    max_chunk_words: int = Field(40, ge=0, alias="max_chunk_words")
+    memory_mode: Literal["turns", "tokens", "summary"] = Field(
+        "turns", alias="memory_mode"
+    )
+    memory_max_turns: int = Field(0, ge=0, alias="memory_max_turns")
+    memory_max_tokens: int = Field(4000, ge=0, alias="memory_max_tokens")
+    memory_summary_chars: int = Field(1000, ge=0, alias="memory_summary_chars")
     tts_enabled: Optional[bool] = Field(True, alias="tts_enabled")
     
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
@@ -33,6 +44,42 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
             en="Method for segmenting sentences: 'regex' or 'pysbd' (default: 'pysbd')",
             zh="分割句子的方法：'regex' 或 'pysbd'（默认：'pysbd'）",
         ),
+        "segment_language": Description(
+            en="Language code for pysbd sentence segmentation, e.g. 'en'. Detected from the response if not set (default: None)",
+            zh="pysbd 分句使用的语言代码，例如 'en'。未设置时根据回复自动检测（默认：None）",
+        ),
+        "first_chunk_words": Description(
+            en="With faster_first_response, cut the first chunk after this many words if no punctuation arrived yet; 0 disables (default: 10)",
+            zh="启用 faster_first_response 时，若尚无标点，在这么多个词后切出第一段；0 表示禁用（默认：10）",
+        ),
+        "first_chunk_timeout_ms": Description(
+            en="With faster_first_response, cut the first chunk at a word boundary once this many milliseconds passed since the first token; 0 disables (default: 800)",
+            zh="启用 faster_first_response 时，自首个 token 起经过这么多毫秒后在词边界切出第一段；0 表示禁用（默认：800）",
+        ),
+        "chunk_growth": Description(
+            en="Factor the word limit grows by after each chunk, so later chunks are longer (default: 2.0)",
+            zh="每输出一段后词数上限的增长倍数，使后续分段更长（默认：2.0）",
+        ),
+        "max_chunk_words": Description(
+            en="Once the word limit exceeds this, chunks are only cut at punctuation (default: 40)",
+            zh="词数上限超过该值后，仅在标点处分段（默认：40）",
+        ),
+        "memory_mode": Description(
+            en="How much conversation memory to keep: 'turns' (last memory_max_turns turns), 'tokens' (recent messages within memory_max_tokens) or 'summary' (like 'tokens', plus a short summary of older messages) (default: 'turns')",
+            zh="保留多少对话记忆：'turns'（最近 memory_max_turns 轮）、'tokens'（memory_max_tokens 以内的最近消息）或 'summary'（同 'tokens'，并附带更早消息的简短摘要）（默认：'turns'）",
+        ),
+        "memory_max_turns": Description(
+            en="Number of recent turns kept in 'turns' mode; 0 keeps the whole conversation, as before memory limits existed (default: 0)",
+            zh="'turns' 模式下保留的最近轮数；0 表示保留全部对话，与引入记忆上限之前相同（默认：0）",
+        ),
+        "memory_max_tokens": Description(
+            en="Estimated token budget for recent messages in 'tokens' and 'summary' modes; 0 disables the limit (default: 4000)",
+            zh="'tokens' 和 'summary' 模式下最近消息的估算 token 预算；0 表示不限制（默认：4000）",
+        ),
+        "memory_summary_chars": Description(
+            en="Maximum length of the summary of older messages in 'summary' mode (default: 1000)",
+            zh="'summary' 模式下更早消息摘要的最大长度（默认：1000）",
+        ),
         "tts_enabled": Description(
             en="Enable or disable TTS generation (default: True). Set to False to disable VTube's built-in TTS (useful when using external audio)",
             zh="启用或禁用 TTS 生成（默认：True）。设置为 False 以禁用 VTube 的内置 TTS（在使用外部音频时很有用）",
@@ -1,6 +1,6 @@
 # config_manager/system.py
 from pydantic import Field, model_validator
-from typing import Dict, ClassVar, Optional
+from typing import Dict, ClassVar, Literal, Optional
 from .i18n import I18nMixin, Description
 
 
@@ -20,6 +20,22 @@ class SystemConfig(I18nMixin):
     agent_zero_url: str = Field(..., alias="agent_zero_url")
     agent_zero_context_id: str = Field("vtube_context", alias="agent_zero_context_id")
 
+    # Chat history storage
+    history_backend: Literal["jsonl", "sqlite"] = Field(
+        "jsonl", alias="history_backend"
+    )
+    history_db_path: str = Field("chat_history/history.db", alias="history_db_path")
+    history_cache_messages: int = Field(20000, ge=0, alias="history_cache_messages")
+
+    # Background maintenance of chat_history and cache
+    maintenance_interval_minutes: float = Field(
+        30, ge=0, alias="maintenance_interval_minutes"
+    )
+    history_max_age_days: int = Field(0, ge=0, alias="history_max_age_days")
+    history_max_count: int = Field(0, ge=0, alias="history_max_count")
+    history_max_size_mb: float = Field(0, ge=0, alias="history_max_size_mb")
+    cache_max_age_minutes: float = Field(10, ge=0, alias="cache_max_age_minutes")
+
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_version": Description(en="Configuration version", zh="配置文件版本"),
         "host": Description(en="Server host address", zh="服务器主机地址"),
@@ -40,6 +56,38 @@ class SystemConfig(I18nMixin):
         "agent_zero_context_id": Description(
             en="Agent-Zero context ID for conversations", zh="Agent-Zero对话上下文ID"
         ),
+        "history_backend": Description(
+            en="Chat history storage: 'jsonl' (one file per history) or 'sqlite' (indexed database)",
+            zh="聊天记录存储方式：'jsonl'（每个记录一个文件）或 'sqlite'（带索引的数据库）",
+        ),
+        "history_db_path": Description(
+            en="SQLite database file used when history_backend is 'sqlite'",
+            zh="history_backend 为 'sqlite' 时使用的 SQLite 数据库文件",
+        ),
+        "history_cache_messages": Description(
+            en="Maximum number of messages of recently used histories kept in memory (0 disables the cache)",
+            zh="在内存中缓存的最近使用的聊天记录消息数上限（0 表示禁用缓存）",
+        ),
+        "maintenance_interval_minutes": Description(
+            en="Minutes between background passes that apply history retention, prune empty histories, compact histories and sweep leftover cache files (0 disables; empty histories are then deleted when the history list is fetched, and nothing else is cleaned up)",
+            zh="后台维护的间隔分钟数：执行聊天记录保留策略、清理空记录、压缩记录并清除残留缓存文件（0 表示禁用；此时空记录会在获取聊天记录列表时删除，其他内容不再清理）",
+        ),
+        "history_max_age_days": Description(
+            en="Delete histories whose latest message is older than this many days (0 keeps all)",
+            zh="删除最新消息早于该天数的聊天记录（0 表示全部保留）",
+        ),
+        "history_max_count": Description(
+            en="Keep at most this many of the most recent histories per character (0 keeps all)",
+            zh="每个角色最多保留的最近聊天记录数（0 表示全部保留）",
+        ),
+        "history_max_size_mb": Description(
+            en="Keep the most recent histories of each character up to this total size in MB (0 keeps all)",
+            zh="每个角色保留的最近聊天记录总大小上限（MB，0 表示全部保留）",
+        ),
+        "cache_max_age_minutes": Description(
+            en="Remove files left in the cache directory for longer than this many minutes (0 disables)",
+            zh="删除在缓存目录中保留超过该分钟数的文件（0 表示禁用）",
+        ),
     }
 
     @model_validator(mode="after")
@@ -62,6 +62,9 @@ class TranslatorConfig(I18nMixin):
     )
     deeplx: Optional[DeepLXConfig] = Field(None, alias="deeplx")
     tencent: Optional[TencentConfig] = Field(None, alias="tencent")
+    batch_window_ms: int = Field(20, ge=0, alias="batch_window_ms")
+    max_batch_size: int = Field(16, ge=1, alias="max_batch_size")
+    cache_size: int = Field(256, ge=0, alias="cache_size")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "translate_audio": Description(
@@ -77,6 +80,18 @@ class TranslatorConfig(I18nMixin):
         "tencent": Description(
             en="Configuration for TenCent translation service", zh="腾讯 翻译服务配置"
         ),
+        "batch_window_ms": Description(
+            en="How long to wait for more sentences to send in the same translation request (ms)",
+            zh="等待更多句子合并到同一个翻译请求中的时间（毫秒）",
+        ),
+        "max_batch_size": Description(
+            en="Maximum number of sentences sent in one translation request",
+            zh="单个翻译请求中最多发送的句子数",
+        ),
+        "cache_size": Description(
+            en="Number of translations kept in memory for repeated sentences (0 disables)",
+            zh="为重复句子在内存中保留的翻译数量（0 表示禁用）",
+        ),
     }
 
     @model_validator(mode="after")
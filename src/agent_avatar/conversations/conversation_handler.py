@@ -7,7 +7,7 @@ from fastapi import WebSocket
 from loguru import logger
 
 from ..chat_group import ChatGroupManager
-from ..chat_history_manager import store_message
+from ..chat_history_manager import HistoryBatch, async_store_message
 from ..service_context import ServiceContext
 from .group_conversation import process_group_conversation
 from .single_conversation import process_single_conversation
@@ -163,7 +163,7 @@ async def handle_individual_interrupt(
             logger.error(f"Error handling interrupt: {e}")
 
         if context.history_uid:
-            store_message(
+            await async_store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="ai",
@@ -171,7 +171,7 @@ async def handle_individual_interrupt(
                 name=context.character_config.character_name,
                 avatar=context.character_config.avatar,
             )
-            store_message(
+            await async_store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="system",
@@ -216,14 +216,15 @@ async def handle_group_interrupt(
     current_conversation_tasks.pop(group_id, None)
     GroupConversationState.remove_state(group_id)  # Clean up state after we've used it
 
-    # Store messages with speaker info
+    # Store messages with speaker info, one write per member history
     if context and group:
+        history_batch = HistoryBatch()
         for member_uid in group.members:
             if member_uid in client_contexts:
                 try:
                     member_ctx = client_contexts[member_uid]
                     member_ctx.agent_engine.handle_interrupt(heard_response)
-                    store_message(
+                    history_batch.add(
                         conf_uid=member_ctx.character_config.conf_uid,
                         history_uid=member_ctx.history_uid,
                         role="ai",
@@ -231,7 +232,7 @@ async def handle_group_interrupt(
                         name=context.character_config.character_name,
                         avatar=context.character_config.avatar,
                     )
-                    store_message(
+                    history_batch.add(
                         conf_uid=member_ctx.character_config.conf_uid,
                         history_uid=member_ctx.history_uid,
                         role="system",
@@ -239,6 +240,7 @@ async def handle_group_interrupt(
                     )
                 except Exception as e:
                     logger.error(f"Error handling interrupt for {member_uid}: {e}")
+        await history_batch.flush()
 
     await broadcast_to_group(
         list(group.members),
@@ -1,6 +1,5 @@
 import asyncio
-import re
-from typing import Optional, Union, Any, List, Dict
+from typing import AsyncIterator, Awaitable, Optional, Tuple, Union, Any, List, Dict
 import numpy as np
 import json
 from loguru import logger
@@ -14,6 +13,11 @@ from ..asr.asr_interface import ASRInterface
 from ..live2d_model import Live2dModel
 from ..tts.tts_interface import TTSInterface
 from ..utils.stream_audio import prepare_audio_payload
+from ..translate.translate_interface import TranslateInterface
+from ..utils.text_rules import is_non_speech
+
+# Sentences the translation stage may run ahead of TTS
+TRANSLATION_QUEUE_SIZE = 4
 
 
 # Convert class methods to standalone functions
@@ -49,6 +53,7 @@ async def process_agent_output(
     tts_manager: TTSTaskManager,
     translate_engine: Optional[Any] = None,
     tts_enabled: bool = True,
+    translation: Optional[Awaitable[str]] = None,
 ) -> str:
     """Process agent output with character information and optional translation"""
     output.display_text.name = character_config.character_name
@@ -65,6 +70,7 @@ async def process_agent_output(
                 tts_manager,
                 translate_engine,
                 tts_enabled,
+                translation,
             )
         elif isinstance(output, AudioOutput):
             full_response = await handle_audio_output(output, websocket_send)
@@ -83,6 +89,15 @@ async def process_agent_output(
     return full_response
 
 
+async def _spoken_translation(translation: Awaitable[str], source_text: str) -> str:
+    """Await a translation, falling back to the source text if it failed"""
+    try:
+        return await translation
+    except Exception as e:
+        logger.warning(f"Translation failed, speaking the source text: {e}")
+        return source_text
+
+
 async def handle_sentence_output(
     output: SentenceOutput,
     live2d_model: Live2dModel,
@@ -91,15 +106,26 @@ async def handle_sentence_output(
     tts_manager: TTSTaskManager,
     translate_engine: Optional[Any] = None,
     tts_enabled: bool = True,
+    translation: Optional[Awaitable[str]] = None,
 ) -> str:
-    """Handle sentence output type with optional translation support"""
+    """
+    Handle sentence output type with optional translation support.
+
+    translation is the pending result of translate_ahead for this sentence;
+    when given, it is awaited instead of translating inline.
+    """
     full_response = ""
     async for display_text, tts_text, actions in output:
         logger.debug(f"🏃 Processing output: '''{tts_text}'''...")
 
-        if translate_engine:
-            if len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", tts_text)):
-                tts_text = translate_engine.translate(tts_text)
+        if translation is not None:
+            tts_text = await _spoken_translation(translation, tts_text)
+            logger.info(f"🏃 Text after translation: '''{tts_text}'''...")
+        elif translate_engine:
+            if not is_non_speech(tts_text):
+                tts_text = await _spoken_translation(
+                    translate_engine.async_translate(tts_text), tts_text
+                )
             logger.info(f"🏃 Text after translation: '''{tts_text}'''...")
         else:
             logger.debug("🚫 No translation engine available. Skipping translation.")
@@ -128,6 +154,87 @@ async def handle_sentence_output(
     return full_response
 
 
+_END_OF_OUTPUT = object()
+
+
+async def translate_ahead(
+    agent_output: AsyncIterator[Any],
+    translate_engine: Optional[TranslateInterface],
+    max_pending: int = TRANSLATION_QUEUE_SIZE,
+) -> AsyncIterator[Tuple[Any, Optional[Awaitable[str]]]]:
+    """
+    Run translation as its own pipeline stage.
+
+    A producer task reads the agent stream and starts translating each
+    sentence as soon as it arrives, so agent streaming, translation and TTS
+    overlap instead of waiting on each other. Outputs come back in their
+    original order, each paired with its pending translation (None when
+    there is nothing to translate). The bounded queue stops the producer
+    from running more than max_pending sentences ahead of the consumer.
+
+    Args:
+        agent_output: The agent's output stream
+        translate_engine: Engine to translate with, or None to pass outputs
+            through untouched
+        max_pending: Maximum number of sentences queued ahead
+
+    Yields:
+        Tuple of the agent output and its pending translation
+    """
+    if translate_engine is None:
+        async for output in agent_output:
+            yield output, None
+        return
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+
+    async def produce() -> None:
+        translation = None
+        try:
+            async for output in agent_output:
+                translation = None
+                if isinstance(output, SentenceOutput) and not is_non_speech(
+                    output.tts_text
+                ):
+                    translation = asyncio.create_task(
+                        translate_engine.async_translate(output.tts_text)
+                    )
+                await queue.put((output, translation))
+        except asyncio.CancelledError:
+            # Cancelled while waiting for room in the queue
+            if translation is not None:
+                translation.cancel()
+            raise
+        except Exception as e:
+            await queue.put((e, None))
+        else:
+            await queue.put((_END_OF_OUTPUT, None))
+
+    producer = asyncio.create_task(produce())
+    translation = None
+    try:
+        while True:
+            output, translation = await queue.get()
+            if output is _END_OF_OUTPUT:
+                break
+            if isinstance(output, Exception):
+                raise output
+            yield output, translation
+    finally:
+        # The producer may be blocked on a full queue; stop it and wait until
+        # it has finished so it never outlives the conversation
+        producer.cancel()
+        await asyncio.wait([producer])
+        # Translations started for sentences that will not be spoken,
+        # including the one handed out last if the consumer stopped early
+        if translation is not None:
+            translation.cancel()
+        while not queue.empty():
+            _, translation = queue.get_nowait()
+            if translation is not None:
+                translation.cancel()
+
+
 async def handle_audio_output(
     output: AudioOutput,
     websocket_send: WebSocketSend,
@@ -8,6 +8,7 @@ import numpy as np
 from .conversation_utils import (
     create_batch_input,
     process_agent_output,
+    translate_ahead,
     process_user_input,
     finalize_conversation_turn,
     cleanup_conversation,
@@ -20,7 +21,7 @@ from .types import (
     WebSocketSend,
 )
 from ..service_context import ServiceContext
-from ..chat_history_manager import store_message
+from ..chat_history_manager import HistoryBatch
 from .tts_manager import TTSTaskManager
 
 
@@ -48,6 +49,8 @@ async def process_group_conversation(
     """
     # Create TTSTaskManager for each member
     tts_managers = {uid: TTSTaskManager() for uid in group_members}
+    # Messages for the members' histories, written once per turn
+    history_batch = HistoryBatch()
 
     try:
         logger.info(f"Group Conversation Chain {session_emoji} started!")
@@ -85,7 +88,7 @@ async def process_group_conversation(
 
         for member_uid in group_members:
             member_context = client_contexts[member_uid]
-            store_message(
+            history_batch.add(
                 conf_uid=member_context.character_config.conf_uid,
                 history_uid=member_context.history_uid,
                 role="human",
@@ -108,6 +111,7 @@ async def process_group_conversation(
                     group_members=group_members,
                     images=images,
                     tts_manager=tts_managers[current_member_uid],
+                    history_batch=history_batch,
                 )
             except Exception as e:
                 logger.error(f"Error in group member turn: {e}")
@@ -127,6 +131,8 @@ async def process_group_conversation(
         )
         raise
     finally:
+        # Write whatever the interrupted turn had buffered
+        await history_batch.flush()
         # Cleanup all TTS managers
         for uid, tts_manager in tts_managers.items():
             cleanup_conversation(tts_manager, session_emoji)
@@ -213,8 +219,16 @@ async def handle_group_member_turn(
     group_members: List[str],
     images: Optional[List[Dict[str, Any]]],
     tts_manager: TTSTaskManager,
+    history_batch: Optional[HistoryBatch] = None,
 ) -> None:
-    """Handle a single group member's conversation turn"""
+    """Handle a single group member's conversation turn
+
+    The response is buffered in history_batch together with anything added
+    earlier (such as the human input), and every member's history is written
+    once at the end of the turn.
+    """
+    if history_batch is None:
+        history_batch = HistoryBatch()
     # Update current speaker before processing
     state.current_speaker_uid = current_member_uid
 
@@ -266,7 +280,7 @@ async def handle_group_member_turn(
 
         for member_uid in group_members:
             member_context = client_contexts[member_uid]
-            store_message(
+            history_batch.add(
                 conf_uid=member_context.character_config.conf_uid,
                 history_uid=member_context.history_uid,
                 role="ai",
@@ -274,6 +288,7 @@ async def handle_group_member_turn(
                 name=context.character_config.character_name,
                 avatar=context.character_config.avatar,
             )
+    await history_batch.flush()
 
     state.memory_index[current_member_uid] = len(state.conversation_history)
     state.group_queue.append(current_member_uid)
@@ -321,14 +336,17 @@ async def process_member_response(
     full_response = ""
 
     try:
+        # Get tts_enabled from agent if it's a BasicMemoryAgent
+        tts_enabled = True
+        if hasattr(context.agent_engine, 'tts_enabled'):
+            tts_enabled = context.agent_engine.tts_enabled
+
         agent_output = context.agent_engine.chat(batch_input)
 
-        async for output in agent_output:
-            # Get tts_enabled from agent if it's a BasicMemoryAgent
-            tts_enabled = True
-            if hasattr(context.agent_engine, 'tts_enabled'):
-                tts_enabled = context.agent_engine.tts_enabled
-            
+        # Translation only matters for TTS, and runs ahead of it
+        async for output, translation in translate_ahead(
+            agent_output, context.translate_engine if tts_enabled else None
+        ):
             response_part = await process_agent_output(
                 output=output,
                 character_config=context.character_config,
@@ -336,8 +354,8 @@ async def process_member_response(
                 tts_engine=context.tts_engine,
                 websocket_send=current_ws_send,
                 tts_manager=tts_manager,
-                translate_engine=context.translate_engine,
                 tts_enabled=tts_enabled,
+                translation=translation,
             )
             full_response += response_part
 
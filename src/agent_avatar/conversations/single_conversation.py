@@ -1,13 +1,13 @@
 from typing import Union, List, Dict, Any, Optional
 import asyncio
 import json
-import re
 from loguru import logger
 import numpy as np
 
 from .conversation_utils import (
     create_batch_input,
     process_agent_output,
+    translate_ahead,
     send_conversation_start_signals,
     process_user_input,
     finalize_conversation_turn,
@@ -16,9 +16,10 @@ from .conversation_utils import (
 )
 from .types import WebSocketSend
 from .tts_manager import TTSTaskManager
-from ..chat_history_manager import store_message
+from ..chat_history_manager import async_store_message
 from ..service_context import ServiceContext
 from ..agent_zero_client import get_agent_zero_client
+from ..utils.emotion_classifier import convert_emojis_to_tags
 
 
 
@@ -30,75 +31,7 @@ def convert_agent_zero_to_vtube_format(text: str) -> str:
 
     Supported emotions: neutral, anger, disgust, fear, joy, smirk, sadness, surprise
     """
-    import re
-
-    # Comprehensive emoji to emotion tag mapping for shizuku-local model
-    emoji_map = {
-        # Joy/Happy emotions (maps to expression 3)
-        '😊': '[joy]',
-        '😄': '[joy]',
-        '😂': '[joy]',
-        '🎉': '[joy]',
-        '😃': '[joy]',
-        '😁': '[joy]',
-        '😆': '[joy]',
-        '🥰': '[joy]',
-        '😍': '[joy]',  # Love -> Joy
-
-        # Sadness emotions (maps to expression 1)
-        '😢': '[sadness]',
-        '😭': '[sadness]',
-        '😞': '[sadness]',
-        '☹️': '[sadness]',
-        '😔': '[sadness]',
-        '😿': '[sadness]',
-
-        # Anger emotions (maps to expression 2)
-        '😠': '[anger]',
-        '😡': '[anger]',
-        '🤬': '[anger]',
-        '😤': '[anger]',
-        '💢': '[anger]',
-
-        # Surprise emotions (maps to expression 3)
-        '😮': '[surprise]',
-        '😲': '[surprise]',
-        '🤯': '[surprise]',
-        '😱': '[surprise]',  # Also fear, but using surprise
-        '🤔': '[surprise]',  # Thinking -> Surprise
-
-        # Fear emotions (maps to expression 1)
-        '😨': '[fear]',
-        '😰': '[fear]',
-        '😬': '[fear]',
-
-        # Disgust emotions (maps to expression 2)
-        '🤢': '[disgust]',
-        '🤮': '[disgust]',
-        '😖': '[disgust]',
-        '🤧': '[disgust]',
-
-        # Smirk emotions (maps to expression 3)
-        '😏': '[smirk]',
-        '😼': '[smirk]',
-        '😎': '[smirk]',  # Cool -> Smirk
-
-        # Other emojis mapped to appropriate emotions
-        '😴': '[neutral]',  # Sleepy -> Neutral
-        '🙄': '[disgust]',  # Eye roll -> Disgust
-        '😵': '[surprise]', # Dizzy -> Surprise
-    }
-
-    result = text
-
-    # Replace emojis with emotion tags
-    for emoji, tag in emoji_map.items():
-        result = result.replace(emoji, f' {tag}')
-
-    # Clean up extra spaces
-    result = re.sub(r'\s+', ' ', result).strip()
-
-    return result
+    return convert_emojis_to_tags(text)
 
 
 def extract_emotions_from_text(text: str, live2d_model) -> List[int]:
@@ -110,41 +43,20 @@ def extract_emotions_from_text(text: str, live2d_model) -> List[int]:
         live2d_model: The Live2D model with emotion mappings
 
     Returns:
-        List of expression indices for Live2D
+        List of expression indices for Live2D, strongest emotion first
     """
     if not text:
         return [0]  # Default to neutral
 
-    text_lower = text.lower()
-    expressions = []
-
-    # Emotion keyword mappings for Agent-Zero responses
-    emotion_keywords = {
-        'joy': ['😊', '😄', '😂', '🎉', '😃', 'happy', 'joy', 'excited', 'cheerful', 'glad', 'smile', 'laugh', 'joke'],
-        'sadness': ['😢', '😭', '😞', 'sad', 'sorry', 'disappointed', 'upset', 'depressed', 'grief'],
-        'anger': ['😠', '😡', '🤬', 'angry', 'mad', 'furious', 'irritated', 'annoyed', 'rage'],
-        'surprise': ['😮', '😲', '🤯', 'wow', 'amazing', 'incredible', 'surprised', 'shocked', 'unexpected'],
-        'fear': ['😨', '😰', '😱', 'scared', 'afraid', 'terrified', 'nervous', 'worried', 'anxious'],
-        'disgust': ['🤢', '🤮', '😖', 'disgusting', 'gross', 'awful', 'terrible', 'yuck'],
-        'smirk': ['😏', '😼', 'smirk', 'clever', 'sly', 'mischievous']
-    }
-
-    # Check for emotion keywords and emojis
-    for emotion, keywords in emotion_keywords.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                if emotion in live2d_model.emo_map:
-                    expressions.append(live2d_model.emo_map[emotion])
-                    break
+    # Emotion keywords and emojis, ranked by number of hits
+    expressions = live2d_model.emotion_classifier.classify(text)
 
     # Also check for existing emotion tags like [happy], [sad], etc.
-    existing_expressions = live2d_model.extract_emotion(text)
-    expressions.extend(existing_expressions)
+    expressions.extend(live2d_model.extract_emotion(text))
 
     # Remove duplicates and return, default to neutral if no emotions found
-    expressions = list(set(expressions)) if expressions else [live2d_model.emo_map.get('neutral', 0)]
-
-    return expressions
+    expressions = list(dict.fromkeys(expressions))
+    return expressions or [live2d_model.emo_map.get('neutral', 0)]
 
 
 async def process_single_conversation(
@@ -193,7 +105,7 @@ async def process_single_conversation(
 
         # Store user message
         if context.history_uid:
-            store_message(
+            await async_store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="human",
@@ -231,7 +143,7 @@ async def process_single_conversation(
         )
 
         if context.history_uid and full_response:
-            store_message(
+            await async_store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="ai",
@@ -275,19 +187,22 @@ async def process_agent_response(
     """
     full_response = ""
     try:
+        # Get tts_enabled from agent if it's a BasicMemoryAgent
+        tts_enabled = True
+        if hasattr(context.agent_engine, 'tts_enabled'):
+            tts_enabled = context.agent_engine.tts_enabled
+
         agent_output = context.agent_engine.chat(batch_input)
-        async for output in agent_output:
+        # Translation only matters for TTS, and runs ahead of it
+        async for output, translation in translate_ahead(
+            agent_output, context.translate_engine if tts_enabled else None
+        ):
             # Process agent output
             if isinstance(output, dict):
                 # Skip dict outputs for now
                 continue
-            
+
             # Process non-dict outputs (SentenceOutput, etc.)
-            # Get tts_enabled from agent if it's a BasicMemoryAgent
-            tts_enabled = True
-            if hasattr(context.agent_engine, 'tts_enabled'):
-                tts_enabled = context.agent_engine.tts_enabled
-            
             response_part = await process_agent_output(
                 output=output,
                 character_config=context.character_config,
@@ -295,8 +210,8 @@ async def process_agent_response(
                 tts_engine=context.tts_engine,
                 websocket_send=websocket_send,
                 tts_manager=tts_manager,
-                translate_engine=context.translate_engine,
                 tts_enabled=tts_enabled,
+                translation=translation,
             )
             logger.debug(f"Got response_part: {response_part} (type: {type(response_part)})")
             full_response += response_part
@@ -1,6 +1,5 @@
 import asyncio
 import json
-import re
 import uuid
 from datetime import datetime
 from typing import List, Optional, Dict
@@ -10,6 +9,7 @@ from ..agent.output_types import DisplayText, Actions
 from ..live2d_model import Live2dModel
 from ..tts.tts_interface import TTSInterface
 from ..utils.stream_audio import prepare_audio_payload
+from ..utils.text_rules import is_non_speech
 from .types import WebSocketSend
 
 
@@ -47,7 +47,7 @@ class TTSTaskManager:
             tts_engine: TTS engine instance
             websocket_send: WebSocket send function
         """
-        if len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", tts_text)) == 0:
+        if is_non_speech(tts_text):
             logger.debug("Empty TTS text, sending silent display payload")
             # Get current sequence number for silent payload
             current_sequence = self._sequence_counter
@@ -171,6 +171,28 @@ class TTSTaskManager:
             file_name_no_ext=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
         )
 
+    def is_idle(self) -> bool:
+        """Whether every queued payload has been sent"""
+        return self._next_sequence_to_send == self._sequence_counter
+
+    async def wait_until_idle(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until all queued TTS tasks have finished and their payloads were sent.
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait indefinitely
+
+        Raises:
+            asyncio.TimeoutError: If the queue did not drain within the timeout
+        """
+
+        async def _drain() -> None:
+            if self.task_list:
+                await asyncio.gather(*self.task_list, return_exceptions=True)
+            await self._payload_queue.join()
+
+        await asyncio.wait_for(_drain(), timeout)
+
     def clear(self) -> None:
         """Clear all pending tasks and reset state"""
         self.task_list.clear()
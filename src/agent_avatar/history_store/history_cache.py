@@ -0,0 +1,304 @@
+"""
+In-memory cache of recently active histories.
+
+Reloading a history, paging through it and restoring agent memory all read
+the same few histories over and over. CachedHistoryStore keeps their
+messages in an LRU bounded by the total number of cached messages, so those
+reads skip the backend entirely. Appends extend a cached history in place;
+every other write drops it so the next read reloads it from the backend.
+
+It also keeps an index of every history's latest message and message count
+per conf_uid. The index is built from the backend the first time a conf_uid
+is listed and then updated by each write, so the history list is served
+without reading any history again.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .history_store_interface import (
+    HistoryStoreInterface,
+    HistorySummary,
+    count_before,
+)
+
+HistoryKey = Tuple[str, str]
+
+
+class CachedHistoryStore(HistoryStoreInterface):
+    """History store serving recently used histories from memory"""
+
+    def __init__(self, backend: HistoryStoreInterface, max_messages: int = 20000):
+        """
+        Args:
+            backend: The store holding the histories
+            max_messages: Maximum number of messages kept in memory across all
+                cached histories. 0 disables the cache.
+        """
+        self.backend = backend
+        self.max_messages = max(0, max_messages)
+        self._cache: "OrderedDict[HistoryKey, List[dict]]" = OrderedDict()
+        self._cached_messages = 0
+        self._lock = threading.Lock()
+        # Bumped after every write; a load that raced with a write is not
+        # cached since it may have read the history before the write landed
+        self._write_count = 0
+        # conf_uid -> history_uid -> summary, for conf_uids listed before
+        self._summaries: Dict[str, Dict[str, HistorySummary]] = {}
+        # Backends with indexed paging are asked directly on a cache miss
+        # instead of loading the whole history
+        self._indexed_pages = (
+            type(backend).get_message_page is not HistoryStoreInterface.get_message_page
+        )
+        self._indexed_counts = (
+            type(backend).count_messages_before
+            is not HistoryStoreInterface.count_messages_before
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cached_messages = 0
+            self._summaries.clear()
+            self._write_count += 1
+
+    def _get_cached(self, key: HistoryKey) -> Optional[List[dict]]:
+        """Cached messages of a history, marked as recently used. Call with the lock held."""
+        messages = self._cache.get(key)
+        if messages is not None:
+            self._cache.move_to_end(key)
+        return messages
+
+    def _evict(self) -> None:
+        """Drop least recently used histories until within bounds. Call with the lock held."""
+        while self._cached_messages > self.max_messages and self._cache:
+            _, messages = self._cache.popitem(last=False)
+            self._cached_messages -= len(messages)
+
+    def _invalidate(self, *keys: HistoryKey, failed: bool = False) -> None:
+        """
+        Drop cached histories after a write. A failed write may have left the
+        backend in any state, so the index of its conf_uid is dropped too.
+        """
+        with self._lock:
+            self._write_count += 1
+            for key in keys:
+                messages = self._cache.pop(key, None)
+                if messages is not None:
+                    self._cached_messages -= len(messages)
+                if failed:
+                    self._summaries.pop(key[0], None)
+
+    def _summaries_of(self, conf_uid: str) -> Optional[Dict[str, HistorySummary]]:
+        """Index of a conf_uid, if it was built. Call with the lock held."""
+        return self._summaries.get(conf_uid)
+
+    def _load(self, key: HistoryKey) -> Optional[List[dict]]:
+        """Messages of a history, from the cache or loaded into it"""
+        with self._lock:
+            messages = self._get_cached(key)
+            write_count = self._write_count
+        if messages is not None:
+            return messages
+
+        messages = self.backend.get_messages(*key)
+        if messages is None or len(messages) > self.max_messages:
+            return messages
+        with self._lock:
+            if self._write_count == write_count and key not in self._cache:
+                self._cache[key] = messages
+                self._cached_messages += len(messages)
+                self._evict()
+        return messages
+
+    def create(self, conf_uid: str, history_uid: str, metadata: dict) -> None:
+        try:
+            self.backend.create(conf_uid, history_uid, metadata)
+        except Exception:
+            self._invalidate((conf_uid, history_uid), failed=True)
+            raise
+        self._invalidate((conf_uid, history_uid))
+        with self._lock:
+            summaries = self._summaries_of(conf_uid)
+            if summaries is not None:
+                summaries[history_uid] = HistorySummary(history_uid, None, 0)
+
+    def exists(self, conf_uid: str, history_uid: str) -> bool:
+        with self._lock:
+            if (conf_uid, history_uid) in self._cache:
+                return True
+        return self.backend.exists(conf_uid, history_uid)
+
+    def append_message(self, conf_uid: str, history_uid: str, message: dict) -> None:
+        self.append_messages(conf_uid, history_uid, [message])
+
+    def append_messages(
+        self, conf_uid: str, history_uid: str, messages: List[dict], sync: bool = False
+    ) -> None:
+        key = (conf_uid, history_uid)
+        try:
+            self.backend.append_messages(conf_uid, history_uid, messages, sync)
+        except Exception:
+            self._invalidate(key, failed=True)
+            raise
+        if not messages:
+            return
+        with self._lock:
+            self._write_count += 1
+            cached = self._cache.get(key)
+            if cached is not None:
+                cached.extend(dict(message) for message in messages)
+                self._cached_messages += len(messages)
+                self._evict()
+            summaries = self._summaries_of(conf_uid)
+            if summaries is not None:
+                previous = summaries.get(history_uid)
+                summaries[history_uid] = HistorySummary(
+                    history_uid,
+                    dict(messages[-1]),
+                    len(messages) + (previous.message_count if previous else 0),
+                )
+
+    def get_metadata(self, conf_uid: str, history_uid: str) -> dict:
+        return self.backend.get_metadata(conf_uid, history_uid)
+
+    def update_metadata(self, conf_uid: str, history_uid: str, metadata: dict) -> bool:
+        # Metadata is not cached
+        return self.backend.update_metadata(conf_uid, history_uid, metadata)
+
+    def get_messages(self, conf_uid: str, history_uid: str) -> Optional[List[dict]]:
+        if self.max_messages == 0:
+            return self.backend.get_messages(conf_uid, history_uid)
+        messages = self._load((conf_uid, history_uid))
+        if messages is None:
+            return None
+        # Callers get their own copies so the cached entries stay intact
+        with self._lock:
+            return [dict(m) for m in messages]
+
+    def get_message_page(
+        self, conf_uid: str, history_uid: str, offset: Optional[int], limit: int
+    ) -> Optional[Tuple[List[dict], int, int]]:
+        key = (conf_uid, history_uid)
+        with self._lock:
+            messages = self._get_cached(key)
+            if messages is not None:
+                limit = max(0, limit)
+                offset = max(0, len(messages) - limit if offset is None else offset)
+                page = [dict(m) for m in messages[offset : offset + limit]]
+                return page, offset, len(messages)
+        if self._indexed_pages:
+            return self.backend.get_message_page(conf_uid, history_uid, offset, limit)
+        return super().get_message_page(conf_uid, history_uid, offset, limit)
+
+    def count_messages_before(
+        self, conf_uid: str, history_uid: str, timestamp: str
+    ) -> Optional[int]:
+        with self._lock:
+            messages = self._get_cached((conf_uid, history_uid))
+            if messages is not None:
+                return count_before(messages, timestamp)
+        if self._indexed_counts:
+            return self.backend.count_messages_before(conf_uid, history_uid, timestamp)
+        return super().count_messages_before(conf_uid, history_uid, timestamp)
+
+    def modify_latest_message(
+        self, conf_uid: str, history_uid: str, role: str, content: str
+    ) -> bool:
+        try:
+            modified = self.backend.modify_latest_message(
+                conf_uid, history_uid, role, content
+            )
+        except Exception:
+            self._invalidate((conf_uid, history_uid), failed=True)
+            raise
+        self._invalidate((conf_uid, history_uid))
+        if modified:
+            with self._lock:
+                summaries = self._summaries_of(conf_uid)
+                summary = summaries.get(history_uid) if summaries else None
+                if summary is not None and summary.latest_message is not None:
+                    summaries[history_uid] = summary._replace(
+                        latest_message={**summary.latest_message, "content": content}
+                    )
+        return modified
+
+    def delete(self, conf_uid: str, history_uid: str) -> bool:
+        try:
+            deleted = self.backend.delete(conf_uid, history_uid)
+        except Exception:
+            self._invalidate((conf_uid, history_uid), failed=True)
+            raise
+        self._invalidate((conf_uid, history_uid))
+        with self._lock:
+            summaries = self._summaries_of(conf_uid)
+            if summaries is not None:
+                summaries.pop(history_uid, None)
+        return deleted
+
+    def rename(self, conf_uid: str, old_history_uid: str, new_history_uid: str) -> bool:
+        keys = ((conf_uid, old_history_uid), (conf_uid, new_history_uid))
+        try:
+            renamed = self.backend.rename(conf_uid, old_history_uid, new_history_uid)
+        except Exception:
+            self._invalidate(*keys, failed=True)
+            raise
+        self._invalidate(*keys)
+        if renamed:
+            with self._lock:
+                summaries = self._summaries_of(conf_uid)
+                summary = summaries.pop(old_history_uid, None) if summaries else None
+                if summary is not None:
+                    summaries[new_history_uid] = summary._replace(
+                        history_uid=new_history_uid
+                    )
+        return renamed
+
+    def recover(self) -> Dict[str, int]:
+        report = self.backend.recover()
+        self.clear()
+        return report
+
+    def history_size(self, conf_uid: str, history_uid: str) -> int:
+        return self.backend.history_size(conf_uid, history_uid)
+
+    def list_conf_uids(self) -> List[str]:
+        return self.backend.list_conf_uids()
+
+    def list_history_summaries(self, conf_uid: str) -> List[HistorySummary]:
+        with self._lock:
+            summaries = self._summaries_of(conf_uid)
+            if summaries is not None:
+                return [
+                    summary._replace(latest_message=dict(summary.latest_message))
+                    if summary.latest_message is not None
+                    else summary
+                    for summary in summaries.values()
+                ]
+            write_count = self._write_count
+
+        listed = self.backend.list_history_summaries(conf_uid)
+        with self._lock:
+            # A write during the scan may be missing from it; build next time
+            if self._write_count == write_count:
+                self._summaries[conf_uid] = {
+                    summary.history_uid: summary for summary in listed
+                }
+        return listed
+
+    def compact(self, conf_uid: str, history_uid: str) -> bool:
+        # Compaction keeps the messages as they are; the index stays valid
+        try:
+            return self.backend.compact(conf_uid, history_uid)
+        finally:
+            self._invalidate((conf_uid, history_uid))
+
+    def stats(self) -> Dict[str, int]:
+        """Number of cached histories and messages, and of indexed conf_uids"""
+        with self._lock:
+            return {
+                "histories": len(self._cache),
+                "messages": self._cached_messages,
+                "indexed_confs": len(self._summaries),
+            }
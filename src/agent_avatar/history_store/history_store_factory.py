@@ -0,0 +1,18 @@
+from .history_store_interface import HistoryStoreInterface
+from .jsonl_store import JsonlHistoryStore
+
+
+class HistoryStoreFactory:
+    @staticmethod
+    def get_history_store(
+        history_backend: str, base_dir: str = "chat_history", db_path: str = ""
+    ) -> HistoryStoreInterface:
+        history_backend = history_backend.lower()
+        if history_backend == "jsonl":
+            return JsonlHistoryStore(base_dir=base_dir)
+        elif history_backend == "sqlite":
+            from .sqlite_store import SqliteHistoryStore
+
+            return SqliteHistoryStore(db_path=db_path or f"{base_dir}/history.db")
+        else:
+            raise ValueError(f"Unsupported history backend: {history_backend}")
@@ -0,0 +1,161 @@
+import abc
+import bisect
+import json
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class HistorySummary(NamedTuple):
+    """What the history list shows for one history"""
+
+    history_uid: str
+    latest_message: Optional[dict]
+    message_count: int
+
+
+class HistoryStoreInterface(metaclass=abc.ABCMeta):
+    """
+    Storage backend for chat histories.
+
+    conf_uid and history_uid are already sanitized by chat_history_manager.
+    Messages are plain dicts with role, timestamp, content and the optional
+    name/avatar fields; the metadata entry is kept separately.
+    """
+
+    @abc.abstractmethod
+    def create(self, conf_uid: str, history_uid: str, metadata: dict) -> None:
+        """Create an empty history with the given metadata"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def exists(self, conf_uid: str, history_uid: str) -> bool:
+        """Check whether a history exists"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def append_message(self, conf_uid: str, history_uid: str, message: dict) -> None:
+        """Append a message, creating the history if it does not exist"""
+        raise NotImplementedError
+
+    def append_messages(
+        self, conf_uid: str, history_uid: str, messages: List[dict], sync: bool = False
+    ) -> None:
+        """
+        Append several messages in order. With sync, they are flushed to
+        disk before returning. Backends should override this to write the
+        batch at once.
+        """
+        for message in messages:
+            self.append_message(conf_uid, history_uid, message)
+
+    @abc.abstractmethod
+    def get_metadata(self, conf_uid: str, history_uid: str) -> dict:
+        """Return the metadata entry, or {} if there is none"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def update_metadata(self, conf_uid: str, history_uid: str, metadata: dict) -> bool:
+        """Merge fields into the metadata entry"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_messages(self, conf_uid: str, history_uid: str) -> Optional[List[dict]]:
+        """Return all messages in order, or None if the history does not exist"""
+        raise NotImplementedError
+
+    def get_message_page(
+        self, conf_uid: str, history_uid: str, offset: Optional[int], limit: int
+    ) -> Optional[Tuple[List[dict], int, int]]:
+        """
+        Return up to limit messages starting at offset, or the latest limit
+        messages if offset is None.
+
+        By default this slices get_messages; indexed backends override it.
+
+        Returns:
+            (messages, offset of the first one, total message count), or
+            None if the history does not exist
+        """
+        messages = self.get_messages(conf_uid, history_uid)
+        if messages is None:
+            return None
+        limit = max(0, limit)
+        offset = max(0, len(messages) - limit if offset is None else offset)
+        return messages[offset : offset + limit], offset, len(messages)
+
+    def count_messages_before(
+        self, conf_uid: str, history_uid: str, timestamp: str
+    ) -> Optional[int]:
+        """
+        Count the messages older than timestamp, i.e. the offset of the first
+        message at or after it. Messages are stored in time order.
+
+        By default this bisects get_messages; indexed backends override it.
+
+        Returns:
+            The count, or None if the history does not exist
+        """
+        messages = self.get_messages(conf_uid, history_uid)
+        if messages is None:
+            return None
+        return count_before(messages, timestamp)
+
+    @abc.abstractmethod
+    def modify_latest_message(
+        self, conf_uid: str, history_uid: str, role: str, content: str
+    ) -> bool:
+        """Replace the content of the latest message if it has the given role"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, conf_uid: str, history_uid: str) -> bool:
+        """Delete a history"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def rename(self, conf_uid: str, old_history_uid: str, new_history_uid: str) -> bool:
+        """Give a history a new history_uid"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def list_conf_uids(self) -> List[str]:
+        """Return every conf_uid that has histories"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def list_history_summaries(self, conf_uid: str) -> List[HistorySummary]:
+        """Return the latest message (or None) and message count of every history"""
+        raise NotImplementedError
+
+    def history_size(self, conf_uid: str, history_uid: str) -> int:
+        """
+        Approximate storage used by a history in bytes, 0 if it does not exist.
+        By default this measures the serialized messages; backends override it
+        with what they actually store.
+        """
+        messages = self.get_messages(conf_uid, history_uid)
+        if not messages:
+            return 0
+        return sum(len(json.dumps(m, ensure_ascii=False).encode()) for m in messages)
+
+    def recover(self) -> Dict[str, int]:
+        """
+        Repair damage an interrupted write can leave behind. Run once at
+        startup, before the store is used.
+
+        Returns:
+            Dict[str, int]: Number of problems fixed per kind
+        """
+        return {}
+
+    def compact(self, conf_uid: str, history_uid: str) -> bool:
+        """
+        Rewrite a history in its most compact form. Backends that never
+        accumulate overhead can keep this no-op.
+        """
+        return True
+
+
+def count_before(messages: List[dict], timestamp: str) -> int:
+    """Number of messages (in time order) with a timestamp before the given one"""
+    timestamps = [message.get("timestamp", "") for message in messages]
+    return bisect.bisect_left(timestamps, timestamp)
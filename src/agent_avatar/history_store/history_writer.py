@@ -0,0 +1,178 @@
+"""
+Asynchronous history writes.
+
+Every write goes into a queue for its history and is carried out by a worker
+task that runs the store call in a thread, so disk I/O never blocks the event
+loop. Messages queued while the previous write is in flight are appended
+together with a single fsync. Writes for one history keep their order;
+different histories are written independently.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .history_store_interface import HistoryStoreInterface
+
+HistoryKey = Tuple[str, str]
+
+
+@dataclass
+class _WriteOp:
+    """A queued write: either messages to append or a store call"""
+
+    future: asyncio.Future
+    messages: Optional[List[dict]] = None
+    call: Optional[Callable[[HistoryStoreInterface, str, str], Any]] = None
+
+
+class HistoryWriter:
+    """Per-history write queues in front of a history store"""
+
+    def __init__(
+        self,
+        get_store: Callable[[], HistoryStoreInterface],
+        max_batch_size: int = 256,
+    ):
+        """
+        Args:
+            get_store: Returns the store to write to, looked up per write so
+                the backend can be switched at startup
+            max_batch_size: Maximum number of messages appended in one write
+        """
+        self._get_store = get_store
+        self.max_batch_size = max(1, max_batch_size)
+        self._queues: Dict[HistoryKey, Deque[_WriteOp]] = {}
+        self._workers: Dict[HistoryKey, asyncio.Task] = {}
+        # Future of the last write queued per history; writes complete in
+        # order, so waiting on it waits on everything queued before
+        self._last: Dict[HistoryKey, asyncio.Future] = {}
+
+    def append(self, conf_uid: str, history_uid: str, message: dict) -> asyncio.Future:
+        """
+        Queue a message to append.
+
+        Returns:
+            asyncio.Future: Resolves once the message is written and synced
+        """
+        return self._enqueue((conf_uid, history_uid), messages=[message])
+
+    def append_many(
+        self, conf_uid: str, history_uid: str, messages: List[dict]
+    ) -> asyncio.Future:
+        """
+        Queue several messages to append in one write.
+
+        Returns:
+            asyncio.Future: Resolves once all of them are written and synced
+        """
+        return self._enqueue((conf_uid, history_uid), messages=list(messages))
+
+    def submit(
+        self,
+        conf_uid: str,
+        history_uid: str,
+        call: Callable[[HistoryStoreInterface, str, str], Any],
+    ) -> asyncio.Future:
+        """
+        Queue a store call, run after every write already queued for the
+        history.
+
+        Args:
+            call: Called as call(store, conf_uid, history_uid) in a thread
+
+        Returns:
+            asyncio.Future: Resolves to the call's return value
+        """
+        return self._enqueue((conf_uid, history_uid), call=call)
+
+    def pending(self, conf_uid: Optional[str] = None) -> int:
+        """Number of queued writes, optionally only for one conf_uid"""
+        return sum(
+            len(queue)
+            for key, queue in self._queues.items()
+            if conf_uid is None or key[0] == conf_uid
+        )
+
+    async def flush(
+        self, conf_uid: Optional[str] = None, history_uid: Optional[str] = None
+    ) -> None:
+        """
+        Wait until every write queued so far is on disk.
+
+        Args:
+            conf_uid: Only wait for this conf_uid's histories
+            history_uid: Only wait for this history (requires conf_uid)
+        """
+        futures = [
+            future
+            for key, future in self._last.items()
+            if (conf_uid is None or key[0] == conf_uid)
+            and (history_uid is None or key[1] == history_uid)
+        ]
+        if futures:
+            # Failures were already logged by the worker
+            await asyncio.gather(*futures, return_exceptions=True)
+
+    def _enqueue(self, key: HistoryKey, **op_fields) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queues.setdefault(key, deque()).append(_WriteOp(future, **op_fields))
+        self._last[key] = future
+        if key not in self._workers:
+            self._workers[key] = loop.create_task(self._drain(key))
+        return future
+
+    async def _drain(self, key: HistoryKey) -> None:
+        """Carry out the queued writes of one history until none are left"""
+        queue = self._queues[key]
+        try:
+            while queue:
+                op = queue.popleft()
+                if op.messages is None:
+                    await self._run(key, [op])
+                    continue
+                batch = [op]
+                size = len(op.messages)
+                while (
+                    queue
+                    and queue[0].messages is not None
+                    and size + len(queue[0].messages) <= self.max_batch_size
+                ):
+                    size += len(queue[0].messages)
+                    batch.append(queue.popleft())
+                await self._run(key, batch)
+        finally:
+            del self._workers[key]
+            if not queue:
+                del self._queues[key]
+                if self._last.get(key) is not None and self._last[key].done():
+                    del self._last[key]
+
+    async def _run(self, key: HistoryKey, ops: List[_WriteOp]) -> None:
+        conf_uid, history_uid = key
+        store = self._get_store()
+        try:
+            if ops[0].messages is not None:
+                messages = [message for op in ops for message in op.messages]
+                result = await asyncio.to_thread(
+                    store.append_messages, conf_uid, history_uid, messages, True
+                )
+            else:
+                result = await asyncio.to_thread(
+                    ops[0].call, store, conf_uid, history_uid
+                )
+        except Exception as e:
+            logger.error(f"Failed to write history {history_uid}: {e}")
+            for op in ops:
+                if not op.future.done():
+                    op.future.set_exception(e)
+                    # Mark retrieved: fire-and-forget writers never await it
+                    op.future.exception()
+            return
+        for op in ops:
+            if not op.future.done():
+                op.future.set_result(result)
@@ -0,0 +1,503 @@
+"""
+Append-only JSONL history files.
+
+Each history is one `<history_uid>.jsonl` file. The first line is the
+metadata header and every message is one appended line, so storing a
+message costs the same no matter how long the conversation is, and a crash
+can at most lose the line being written.
+
+Updates never rewrite the file either:
+- metadata changes are appended as further `{"role": "metadata", ...}` lines
+  and merged into the header on read
+- modifying the latest message appends an `{"role": "edit", ...}` line that
+  replaces the content of the message before it on read
+
+Compaction folds these overlay lines back into a plain header + messages
+file; files without any are left untouched. Histories still in the old
+single-JSON-array format (`.json`) are read as-is and migrated to JSONL the
+first time they are written to.
+
+Whole-file writes (creation, compaction, migration) go to a temp file that
+is fsynced and renamed over the target, so a crash leaves either the old or
+the new file. Operations on one history hold a per-history lock, so threads
+never interleave a read-modify-append. recover() repairs what a crash can
+still leave behind: stale temp files, a torn last line, and half-finished
+migrations.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .history_store_interface import HistoryStoreInterface, HistorySummary
+
+HISTORY_EXT = ".jsonl"
+LEGACY_HISTORY_EXT = ".json"
+METADATA_ROLE = "metadata"
+EDIT_ROLE = "edit"
+
+_METADATA_LINE_PREFIX = '{"role": "metadata"'
+TMP_SUFFIX = ".tmp"
+CORRUPT_SUFFIX = ".corrupt"
+
+# Histories share this many locks, picked by path hash
+_LOCK_STRIPES = 64
+
+
+def _dump_line(record: dict) -> bytes:
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def fold_records(records: List[dict]) -> Tuple[dict, List[dict]]:
+    """
+    Apply metadata and edit lines to get the current state of a history.
+
+    Args:
+        records: History lines in file order
+
+    Returns:
+        Tuple[dict, List[dict]]: The merged metadata ({} if none) and the
+        messages in order
+    """
+    metadata: dict = {}
+    messages: List[dict] = []
+    for record in records:
+        role = record.get("role")
+        if role == METADATA_ROLE:
+            metadata.update(record)
+        elif role == EDIT_ROLE:
+            if messages and messages[-1].get("role") == record.get("edit_role"):
+                messages[-1] = {**messages[-1], "content": record.get("content")}
+        else:
+            messages.append(record)
+    return metadata, messages
+
+
+def has_overlay_records(records: List[dict]) -> bool:
+    """
+    Whether compaction would change a history: it has an edit line, or a
+    metadata line other than the leading header.
+    """
+    return any(
+        record.get("role") == EDIT_ROLE
+        or (record.get("role") == METADATA_ROLE and index > 0)
+        for index, record in enumerate(records)
+    )
+
+
+def read_jsonl_records(path: str) -> List[dict]:
+    """
+    Read the lines of a JSONL history file. Lines that do not parse, such as
+    a line cut short by a crash, are skipped.
+    """
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line {line_number} in {path}")
+    return records
+
+
+def read_history_file(path: str) -> Tuple[dict, List[dict]]:
+    """
+    Read a history file in either format.
+
+    Args:
+        path: Path to a .jsonl or legacy .json history file
+
+    Returns:
+        Tuple[dict, List[dict]]: The metadata ({} if none) and the messages
+
+    Raises:
+        ValueError: If a legacy file is not valid JSON or not a list of records
+    """
+    if path.endswith(HISTORY_EXT):
+        return fold_records(read_jsonl_records(path))
+    with open(path, "r", encoding="utf-8") as f:
+        history_data = json.load(f)
+    if not isinstance(history_data, list) or not all(
+        isinstance(record, dict) for record in history_data
+    ):
+        raise ValueError(f"{path} is not a list of history records")
+    if history_data and history_data[0].get("role") == METADATA_ROLE:
+        return history_data[0], history_data[1:]
+    return {}, history_data
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist a rename in the directory holding path (no-op where unsupported)"""
+    try:
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_history_file(path: str, metadata: dict, messages: List[dict]) -> None:
+    """
+    Write a compact JSONL history file, replacing any existing one atomically.
+
+    Args:
+        path: Destination .jsonl path
+        metadata: Metadata header, skipped if empty
+        messages: Messages in order
+    """
+    tmp_path = f"{path}{TMP_SUFFIX}"
+    with open(tmp_path, "wb") as f:
+        if metadata:
+            f.write(_dump_line(metadata))
+        for message in messages:
+            f.write(_dump_line(message))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path)
+
+
+def migrate_legacy_file(legacy_path: str) -> str:
+    """
+    Convert a legacy .json history into a .jsonl one and remove the original.
+
+    Args:
+        legacy_path: Path to the .json history
+
+    Returns:
+        str: Path to the new .jsonl history
+    """
+    metadata, messages = read_history_file(legacy_path)
+    path = legacy_path[: -len(LEGACY_HISTORY_EXT)] + HISTORY_EXT
+    write_history_file(path, metadata, messages)
+    os.remove(legacy_path)
+    logger.info(f"Migrated history {legacy_path} to {path}")
+    return path
+
+
+def append_records(path: str, records: List[dict], sync: bool = False) -> None:
+    """
+    Append lines to a JSONL history file, creating it if needed.
+
+    If the file does not end with a newline (the last write was cut short),
+    one is added first so the new lines stay readable.
+
+    Args:
+        path: History file path
+        records: Lines to append, written with a single write call
+        sync: fsync the file before returning
+    """
+    data = b"".join(_dump_line(record) for record in records)
+    with open(path, "a+b") as f:
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def repair_torn_tail(path: str) -> bool:
+    """
+    Fix a JSONL file whose last write was cut short. A last line that still
+    parses only lacks its newline, which is added; otherwise it is removed.
+
+    Returns:
+        bool: Whether the file was changed
+    """
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return False
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return False
+        # Find the start of the unterminated last line
+        line_start = size
+        while line_start > 0:
+            block_start = max(0, line_start - 8192)
+            f.seek(block_start)
+            newline = f.read(line_start - block_start).rfind(b"\n")
+            if newline >= 0:
+                line_start = block_start + newline + 1
+                break
+            line_start = block_start
+        f.seek(line_start)
+        tail = f.read()
+        try:
+            json.loads(tail)
+            f.seek(size)
+            f.write(b"\n")
+        except ValueError:
+            f.truncate(line_start)
+        f.flush()
+        os.fsync(f.fileno())
+    return True
+
+
+def recover_history_dir(base_dir: str) -> Dict[str, int]:
+    """
+    Repair what an interrupted write can leave in a chat history directory:
+    - temp files of an unfinished rewrite are removed (the target is intact)
+    - a torn last line of a JSONL history is completed or dropped
+    - a legacy .json history that was already migrated is removed
+    - an unreadable legacy .json history is renamed to .json.corrupt, so it
+      is kept for manual recovery instead of being read as empty
+
+    Returns:
+        Dict[str, int]: Number of files fixed per kind of problem
+    """
+    report = {"temp_files": 0, "torn_lines": 0, "migrations": 0, "corrupt": 0}
+    if not os.path.isdir(base_dir):
+        return report
+    for conf_uid in os.listdir(base_dir):
+        conf_dir = os.path.join(base_dir, conf_uid)
+        if not os.path.isdir(conf_dir):
+            continue
+        filenames = set(os.listdir(conf_dir))
+        for filename in sorted(filenames):
+            path = os.path.join(conf_dir, filename)
+            try:
+                if filename.endswith(HISTORY_EXT + TMP_SUFFIX):
+                    os.remove(path)
+                    report["temp_files"] += 1
+                elif filename.endswith(HISTORY_EXT):
+                    if repair_torn_tail(path):
+                        report["torn_lines"] += 1
+                elif filename.endswith(LEGACY_HISTORY_EXT):
+                    stem = filename[: -len(LEGACY_HISTORY_EXT)]
+                    if stem + HISTORY_EXT in filenames:
+                        # Crashed between writing the JSONL copy and removing this
+                        os.remove(path)
+                        report["migrations"] += 1
+                        continue
+                    try:
+                        read_history_file(path)
+                    except (ValueError, TypeError, AttributeError):
+                        os.replace(path, path + CORRUPT_SUFFIX)
+                        report["corrupt"] += 1
+                        logger.error(
+                            f"History {path} is unreadable; moved to {path}{CORRUPT_SUFFIX}"
+                        )
+            except OSError as e:
+                logger.error(f"Failed to recover {path}: {e}")
+    return report
+
+
+class JsonlHistoryStore(HistoryStoreInterface):
+    """History store keeping one append-only JSONL file per history"""
+
+    def __init__(self, base_dir: str = "chat_history"):
+        self.base_dir = base_dir
+        self._locks = [threading.RLock() for _ in range(_LOCK_STRIPES)]
+
+    def _lock(self, conf_uid: str, history_uid: str) -> threading.RLock:
+        """The lock serializing operations on one history"""
+        return self._locks[hash((conf_uid, history_uid)) % _LOCK_STRIPES]
+
+    def _path(self, conf_uid: str, history_uid: str, ext: str = HISTORY_EXT) -> str:
+        conf_dir = os.path.join(self.base_dir, conf_uid)
+        full_path = os.path.normpath(os.path.join(conf_dir, f"{history_uid}{ext}"))
+        if not full_path.startswith(os.path.normpath(conf_dir)):
+            raise ValueError("Invalid path: Path traversal detected")
+        return full_path
+
+    def _existing_path(self, conf_uid: str, history_uid: str) -> Optional[str]:
+        """Path of the history file in whichever format exists"""
+        for ext in (HISTORY_EXT, LEGACY_HISTORY_EXT):
+            path = self._path(conf_uid, history_uid, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _writable_path(self, conf_uid: str, history_uid: str) -> Optional[str]:
+        """Path of the JSONL file, migrating a legacy history first"""
+        path = self._existing_path(conf_uid, history_uid)
+        if path is not None and path.endswith(LEGACY_HISTORY_EXT):
+            path = migrate_legacy_file(path)
+        return path
+
+    def recover(self) -> Dict[str, int]:
+        return recover_history_dir(self.base_dir)
+
+    def create(self, conf_uid: str, history_uid: str, metadata: dict) -> None:
+        os.makedirs(os.path.join(self.base_dir, conf_uid), exist_ok=True)
+        with self._lock(conf_uid, history_uid):
+            write_history_file(self._path(conf_uid, history_uid), metadata, [])
+
+    def exists(self, conf_uid: str, history_uid: str) -> bool:
+        return self._existing_path(conf_uid, history_uid) is not None
+
+    def append_message(self, conf_uid: str, history_uid: str, message: dict) -> None:
+        self.append_messages(conf_uid, history_uid, [message])
+
+    def append_messages(
+        self, conf_uid: str, history_uid: str, messages: List[dict], sync: bool = False
+    ) -> None:
+        with self._lock(conf_uid, history_uid):
+            path = self._writable_path(conf_uid, history_uid) or self._path(
+                conf_uid, history_uid
+            )
+            append_records(path, messages, sync)
+
+    def get_metadata(self, conf_uid: str, history_uid: str) -> dict:
+        with self._lock(conf_uid, history_uid):
+            path = self._existing_path(conf_uid, history_uid)
+            if path is None:
+                return {}
+            if not path.endswith(HISTORY_EXT):
+                return read_history_file(path)[0]
+            # Only the metadata lines matter; skip decoding messages. Every
+            # line this store writes starts with its role.
+            records = []
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith(_METADATA_LINE_PREFIX):
+                        try:
+                            records.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            continue
+        return fold_records(records)[0]
+
+    def update_metadata(self, conf_uid: str, history_uid: str, metadata: dict) -> bool:
+        with self._lock(conf_uid, history_uid):
+            path = self._writable_path(conf_uid, history_uid)
+            if path is None:
+                return False
+            record = {"role": METADATA_ROLE}
+            with open(path, "r", encoding="utf-8") as f:
+                if not f.readline().startswith(_METADATA_LINE_PREFIX):
+                    # No header yet: start one like a new history would have
+                    record["timestamp"] = datetime.now().isoformat(timespec="seconds")
+            record.update(metadata)
+            append_records(path, [record])
+        return True
+
+    def get_messages(self, conf_uid: str, history_uid: str) -> Optional[List[dict]]:
+        with self._lock(conf_uid, history_uid):
+            path = self._existing_path(conf_uid, history_uid)
+            if path is None:
+                return None
+            return read_history_file(path)[1]
+
+    def modify_latest_message(
+        self, conf_uid: str, history_uid: str, role: str, content: str
+    ) -> bool:
+        with self._lock(conf_uid, history_uid):
+            path = self._writable_path(conf_uid, history_uid)
+            if path is None:
+                logger.warning(f"History file not found: {history_uid}")
+                return False
+            messages = read_history_file(path)[1]
+            if not messages:
+                logger.warning("History is empty")
+                return False
+            if messages[-1].get("role") != role:
+                logger.warning(
+                    f"Latest message role ({messages[-1].get('role')}) doesn't match requested role ({role})"
+                )
+                return False
+            append_records(
+                path,
+                [
+                    {
+                        "role": EDIT_ROLE,
+                        "edit_role": role,
+                        "timestamp": datetime.now().isoformat(timespec="seconds"),
+                        "content": content,
+                    }
+                ],
+            )
+        return True
+
+    def delete(self, conf_uid: str, history_uid: str) -> bool:
+        deleted = False
+        with self._lock(conf_uid, history_uid):
+            for ext in (HISTORY_EXT, LEGACY_HISTORY_EXT):
+                path = self._path(conf_uid, history_uid, ext)
+                if os.path.exists(path):
+                    os.remove(path)
+                    deleted = True
+        return deleted
+
+    def rename(self, conf_uid: str, old_history_uid: str, new_history_uid: str) -> bool:
+        # Take both locks in a fixed order so concurrent renames can't deadlock
+        first, second = sorted(
+            (
+                self._lock(conf_uid, old_history_uid),
+                self._lock(conf_uid, new_history_uid),
+            ),
+            key=id,
+        )
+        with first, second:
+            old_path = self._existing_path(conf_uid, old_history_uid)
+            if old_path is None:
+                return False
+            ext = HISTORY_EXT if old_path.endswith(HISTORY_EXT) else LEGACY_HISTORY_EXT
+            os.rename(old_path, self._path(conf_uid, new_history_uid, ext))
+        return True
+
+    def history_size(self, conf_uid: str, history_uid: str) -> int:
+        path = self._existing_path(conf_uid, history_uid)
+        return os.path.getsize(path) if path is not None else 0
+
+    def list_conf_uids(self) -> List[str]:
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.base_dir)
+            if os.path.isdir(os.path.join(self.base_dir, name))
+        )
+
+    def list_history_summaries(self, conf_uid: str) -> List[HistorySummary]:
+        conf_dir = os.path.join(self.base_dir, conf_uid)
+        if not os.path.isdir(conf_dir):
+            return []
+        history_uids = []
+        for filename in os.listdir(conf_dir):
+            for ext in (HISTORY_EXT, LEGACY_HISTORY_EXT):
+                if filename.endswith(ext):
+                    history_uids.append(filename[: -len(ext)])
+                    break
+
+        summaries = []
+        for history_uid in dict.fromkeys(history_uids):
+            try:
+                messages = self.get_messages(conf_uid, history_uid) or []
+            except Exception as e:
+                logger.error(f"Error reading history file {history_uid}: {e}")
+                continue
+            summaries.append(
+                HistorySummary(
+                    history_uid, messages[-1] if messages else None, len(messages)
+                )
+            )
+        return summaries
+
+    def compact(self, conf_uid: str, history_uid: str) -> bool:
+        with self._lock(conf_uid, history_uid):
+            path = self._existing_path(conf_uid, history_uid)
+            if path is None:
+                return False
+            # Legacy files have no overlay lines; they are migrated on write.
+            # Files without any are left alone so their mtime (and the
+            # exporter's view of them) stays unchanged.
+            if path.endswith(LEGACY_HISTORY_EXT):
+                return True
+            records = read_jsonl_records(path)
+            if has_overlay_records(records):
+                write_history_file(path, *fold_records(records))
+        return True
@@ -0,0 +1,314 @@
+"""
+SQLite history store.
+
+All histories live in one database file. Messages are indexed by
+(conf_uid, history_uid, id) for ordered reads and latest-message lookups,
+and by (conf_uid, history_uid, timestamp) for time-based queries, so
+listing histories and fetching a page of messages are index lookups
+instead of parsing every history file.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .history_store_interface import HistoryStoreInterface, HistorySummary
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS histories (
+    conf_uid TEXT NOT NULL,
+    history_uid TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (conf_uid, history_uid)
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conf_uid TEXT NOT NULL,
+    history_uid TEXT NOT NULL,
+    role TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    content TEXT NOT NULL,
+    name TEXT,
+    avatar TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_messages_history
+    ON messages (conf_uid, history_uid, id);
+CREATE INDEX IF NOT EXISTS idx_messages_timestamp
+    ON messages (conf_uid, history_uid, timestamp);
+"""
+
+_MESSAGE_COLUMNS = "role, timestamp, content, name, avatar"
+
+
+def _row_to_message(row: tuple) -> dict:
+    role, timestamp, content, name, avatar = row
+    message = {"role": role, "timestamp": timestamp, "content": content}
+    if name is not None:
+        message["name"] = name
+    if avatar is not None:
+        message["avatar"] = avatar
+    return message
+
+
+class SqliteHistoryStore(HistoryStoreInterface):
+    """History store keeping every history in one SQLite database"""
+
+    def __init__(self, db_path: str = "chat_history/history.db"):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        # One connection shared by the event loop and worker threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+        logger.info(f"Using SQLite history store at {db_path}")
+
+    def recover(self) -> Dict[str, int]:
+        # Transactions roll back on their own; only check nothing is corrupt
+        with self._lock:
+            problems = [
+                row[0] for row in self._conn.execute("PRAGMA quick_check").fetchall()
+            ]
+        if problems != ["ok"]:
+            for problem in problems:
+                logger.error(f"History database {self.db_path}: {problem}")
+            return {"corrupt": len(problems)}
+        return {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _ensure_history(self, conf_uid: str, history_uid: str) -> None:
+        self._conn.execute(
+            "INSERT OR IGNORE INTO histories (conf_uid, history_uid) VALUES (?, ?)",
+            (conf_uid, history_uid),
+        )
+
+    def _insert_messages(
+        self, conf_uid: str, history_uid: str, messages: List[dict]
+    ) -> None:
+        self._conn.executemany(
+            "INSERT INTO messages (conf_uid, history_uid, role, timestamp, content,"
+            " name, avatar) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    conf_uid,
+                    history_uid,
+                    message["role"],
+                    message.get("timestamp", ""),
+                    message.get("content", ""),
+                    message.get("name"),
+                    message.get("avatar"),
+                )
+                for message in messages
+            ],
+        )
+
+    def create(self, conf_uid: str, history_uid: str, metadata: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO histories (conf_uid, history_uid, metadata)"
+                " VALUES (?, ?, ?)",
+                (conf_uid, history_uid, json.dumps(metadata, ensure_ascii=False)),
+            )
+
+    def import_history(
+        self, conf_uid: str, history_uid: str, metadata: dict, messages: List[dict]
+    ) -> None:
+        """Insert a whole history at once, replacing any with the same uid"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM messages WHERE conf_uid = ? AND history_uid = ?",
+                (conf_uid, history_uid),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO histories (conf_uid, history_uid, metadata)"
+                " VALUES (?, ?, ?)",
+                (conf_uid, history_uid, json.dumps(metadata, ensure_ascii=False)),
+            )
+            self._insert_messages(conf_uid, history_uid, messages)
+
+    def exists(self, conf_uid: str, history_uid: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM histories WHERE conf_uid = ? AND history_uid = ?",
+                (conf_uid, history_uid),
+            ).fetchone()
+        return row is not None
+
+    def append_message(self, conf_uid: str, history_uid: str, message: dict) -> None:
+        self.append_messages(conf_uid, history_uid, [message])
+
+    def append_messages(
+        self, conf_uid: str, history_uid: str, messages: List[dict], sync: bool = False
+    ) -> None:
+        # Every transaction is committed; sync needs nothing extra
+        with self._lock, self._conn:
+            self._ensure_history(conf_uid, history_uid)
+            self._insert_messages(conf_uid, history_uid, messages)
+
+    def get_metadata(self, conf_uid: str, history_uid: str) -> dict:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata FROM histories WHERE conf_uid = ? AND history_uid = ?",
+                (conf_uid, history_uid),
+            ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def update_metadata(self, conf_uid: str, history_uid: str, metadata: dict) -> bool:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT metadata FROM histories WHERE conf_uid = ? AND history_uid = ?",
+                (conf_uid, history_uid),
+            ).fetchone()
+            if row is None:
+                return False
+            current = json.loads(row[0])
+            current.update(metadata)
+            self._conn.execute(
+                "UPDATE histories SET metadata = ? WHERE conf_uid = ? AND history_uid = ?",
+                (json.dumps(current, ensure_ascii=False), conf_uid, history_uid),
+            )
+        return True
+
+    def get_messages(self, conf_uid: str, history_uid: str) -> Optional[List[dict]]:
+        if not self.exists(conf_uid, history_uid):
+            return None
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_MESSAGE_COLUMNS} FROM messages"
+                " WHERE conf_uid = ? AND history_uid = ? ORDER BY id",
+                (conf_uid, history_uid),
+            ).fetchall()
+        return [_row_to_message(row) for row in rows]
+
+    def get_message_page(
+        self, conf_uid: str, history_uid: str, offset: Optional[int], limit: int
+    ) -> Optional[Tuple[List[dict], int, int]]:
+        if not self.exists(conf_uid, history_uid):
+            return None
+        limit = max(0, limit)
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE conf_uid = ? AND history_uid = ?",
+                (conf_uid, history_uid),
+            ).fetchone()[0]
+            offset = max(0, total - limit if offset is None else offset)
+            rows = self._conn.execute(
+                f"SELECT {_MESSAGE_COLUMNS} FROM messages"
+                " WHERE conf_uid = ? AND history_uid = ? ORDER BY id"
+                " LIMIT ? OFFSET ?",
+                (conf_uid, history_uid, limit, offset),
+            ).fetchall()
+        return [_row_to_message(row) for row in rows], offset, total
+
+    def count_messages_before(
+        self, conf_uid: str, history_uid: str, timestamp: str
+    ) -> Optional[int]:
+        if not self.exists(conf_uid, history_uid):
+            return None
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM messages"
+                " WHERE conf_uid = ? AND history_uid = ? AND timestamp < ?",
+                (conf_uid, history_uid, timestamp),
+            ).fetchone()[0]
+
+    def modify_latest_message(
+        self, conf_uid: str, history_uid: str, role: str, content: str
+    ) -> bool:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id, role FROM messages WHERE conf_uid = ? AND history_uid = ?"
+                " ORDER BY id DESC LIMIT 1",
+                (conf_uid, history_uid),
+            ).fetchone()
+            if row is None:
+                logger.warning("History is empty")
+                return False
+            if row[1] != role:
+                logger.warning(
+                    f"Latest message role ({row[1]}) doesn't match requested role ({role})"
+                )
+                return False
+            self._conn.execute(
+                "UPDATE messages SET content = ? WHERE id = ?", (content, row[0])
+            )
+        return True
+
+    def delete(self, conf_uid: str, history_uid: str) -> bool:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM messages WHERE conf_uid = ? AND history_uid = ?",
+                (conf_uid, history_uid),
+            )
+            deleted = self._conn.execute(
+                "DELETE FROM histories WHERE conf_uid = ? AND history_uid = ?",
+                (conf_uid, history_uid),
+            ).rowcount
+        return deleted > 0
+
+    def rename(self, conf_uid: str, old_history_uid: str, new_history_uid: str) -> bool:
+        with self._lock, self._conn:
+            renamed = self._conn.execute(
+                "UPDATE histories SET history_uid = ?"
+                " WHERE conf_uid = ? AND history_uid = ?",
+                (new_history_uid, conf_uid, old_history_uid),
+            ).rowcount
+            self._conn.execute(
+                "UPDATE messages SET history_uid = ?"
+                " WHERE conf_uid = ? AND history_uid = ?",
+                (new_history_uid, conf_uid, old_history_uid),
+            )
+        return renamed > 0
+
+    def history_size(self, conf_uid: str, history_uid: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT LENGTH(metadata) + COALESCE(("
+                "   SELECT SUM(LENGTH(role) + LENGTH(timestamp) + LENGTH(content)"
+                "     + COALESCE(LENGTH(name), 0) + COALESCE(LENGTH(avatar), 0))"
+                "   FROM messages WHERE conf_uid = ? AND history_uid = ?"
+                " ), 0) FROM histories WHERE conf_uid = ? AND history_uid = ?",
+                (conf_uid, history_uid, conf_uid, history_uid),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def list_conf_uids(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT conf_uid FROM histories ORDER BY conf_uid"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def list_history_summaries(self, conf_uid: str) -> List[HistorySummary]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT h.history_uid,"
+                " m.role, m.timestamp, m.content, m.name, m.avatar,"
+                " (SELECT COUNT(*) FROM messages"
+                "   WHERE conf_uid = h.conf_uid AND history_uid = h.history_uid)"
+                " FROM histories h LEFT JOIN messages m ON m.id = ("
+                "   SELECT MAX(id) FROM messages"
+                "   WHERE conf_uid = h.conf_uid AND history_uid = h.history_uid"
+                " ) WHERE h.conf_uid = ?",
+                (conf_uid,),
+            ).fetchall()
+        return [
+            HistorySummary(
+                row[0],
+                _row_to_message(row[1:6]) if row[1] is not None else None,
+                row[6],
+            )
+            for row in rows
+        ]
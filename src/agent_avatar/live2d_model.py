@@ -1,7 +1,13 @@
 import json
+import re
+from typing import List, Optional, Tuple
+
 import chardet
 from loguru import logger
 
+from .utils.emotion_classifier import EmotionClassifier
+from .utils.text_rules import EMOTION_TAGS, MOTION_TAGS, trie_alternation
+
 # This class will only prepare the payload for the live2d model
 # the process of sending the payload should be done by the caller
 # This class is **Not responsible** for sending the payload to the server
@@ -17,6 +23,10 @@ class Live2dModel:
         model_info (dict): The information of the Live2D model.
         emo_map (dict): The emotion map of the Live2D model.
         emo_str (str): The string representation of the emotion map of the Live2D model.
+        emo_pattern (re.Pattern | None): Compiled matcher for the `[emotion]` tags of the model.
+        motion_map (dict): The motion map of the Live2D model, from `{motion}` tag to motion group.
+        action_pattern (re.Pattern): Compiled matcher for `[emotion]` and `{motion}` tags.
+        emotion_classifier (EmotionClassifier): Keyword and emoji classifier for untagged text.
     """
 
     model_dict_path: str
@@ -24,6 +34,10 @@ class Live2dModel:
     model_info: dict
     emo_map: dict
     emo_str: str
+    emo_pattern: Optional[re.Pattern]
+    motion_map: dict
+    action_pattern: re.Pattern
+    emotion_classifier: EmotionClassifier
 
     def __init__(
         self, live2d_model_name: str, model_dict_path: str = "model_dict.json"
@@ -34,7 +48,7 @@ class Live2dModel:
 
     def set_model(self, model_name: str) -> None:
         """
-        Set the model with its name and load the model information. This method will initialize the `self.model_info`, `self.emo_map`, and `self.emo_str` attributes.
+        Set the model with its name and load the model information. This method will initialize the `self.model_info`, `self.emo_map`, `self.emo_str`, `self.emo_pattern`, `self.motion_map`, `self.action_pattern`, and `self.emotion_classifier` attributes.
         This method is called in the constructor.
 
         Parameters:
@@ -51,6 +65,38 @@ class Live2dModel:
         self.emo_str: str = " ".join([f"[{key}]," for key in self.emo_map.keys()])
         # emo_str is a string of the keys in the emoMap dictionary. The keys are enclosed in square brackets.
         # example: `"[fear], [anger], [disgust], [sadness], [joy], [neutral], [surprise]"`
+        self.emo_pattern = self._compile_emotion_pattern(self.emo_map.keys())
+        # motionMap is optional; models without it still have their motion tags stripped
+        self.motion_map: dict = {
+            k.lower(): v for k, v in self.model_info.get("motionMap", {}).items()
+        }
+        self.action_pattern = self._compile_action_pattern(
+            set(self.emo_map) | set(EMOTION_TAGS),
+            set(self.motion_map) | set(MOTION_TAGS),
+        )
+        self.emotion_classifier = EmotionClassifier(self.emo_map)
+
+    @staticmethod
+    def _compile_emotion_pattern(keys) -> Optional[re.Pattern]:
+        """
+        Compile a single case-insensitive alternation matching every `[emotion]` tag
+        of the model, so the text is scanned once regardless of the number of emotions.
+        """
+        keys = list(keys)
+        if not keys:
+            return None
+        return re.compile(rf"\[({trie_alternation(keys)})\]", re.IGNORECASE)
+
+    @staticmethod
+    def _compile_action_pattern(emotions, motions) -> re.Pattern:
+        """
+        Compile a single case-insensitive alternation matching `[emotion]` tags (group 1)
+        and `{motion}` tags (group 2).
+        """
+        return re.compile(
+            rf"\[({trie_alternation(emotions)})\]|\{{({trie_alternation(motions)})\}}",
+            re.IGNORECASE,
+        )
 
     def _load_file_content(self, file_path: str) -> str:
         """Load the content of a file with robust encoding handling."""
@@ -143,6 +189,56 @@ class Live2dModel:
 
         return matched_model
 
+    def parse_action_tags(self, text: str) -> Tuple[List[int], List[str], str]:
+        """
+        Extract the expression indices and motion groups of the `[emotion]` and `{motion}`
+        tags in the input string and remove the tags, in a single pass.
+        Tags the model has no mapping for are removed without producing an action.
+
+        Parameters:
+            text (str): The string to check for emotion and motion tags.
+
+        Returns:
+            Tuple[List[int], List[str], str]: The expression indices and motion groups in
+            order of appearance, and the string with the tags removed.
+        """
+
+        if "[" not in text and "{" not in text:
+            return [], [], text
+
+        expression_list = []
+        motion_list = []
+
+        def collect(match: re.Match) -> str:
+            emotion, motion = match.groups()
+            if emotion is not None:
+                expression = self.emo_map.get(emotion.lower())
+                if expression is not None:
+                    expression_list.append(expression)
+            else:
+                group = self.motion_map.get(motion.lower())
+                if group is not None:
+                    motion_list.append(group)
+            return ""
+
+        cleaned_text = self.action_pattern.sub(collect, text)
+        return expression_list, motion_list, cleaned_text
+
+    def remove_action_tags(self, target_str: str) -> str:
+        """
+        Remove the emotion and motion tags from the input string and return the cleaned string.
+
+        Parameters:
+            target_str (str): The string to clean.
+
+        Returns:
+            str: The cleaned string with the emotion and motion tags removed.
+        """
+
+        if "[" not in target_str and "{" not in target_str:
+            return target_str
+        return self.action_pattern.sub("", target_str)
+
     def extract_emotion(self, str_to_check: str) -> list:
         """
         Check the input string for any emotion keywords and return a list of values (the expression index) of the emotions found in the string.
@@ -154,22 +250,12 @@ class Live2dModel:
             list: A list of values of the emotions found in the string. An empty list is returned if no emotions are found.
         """
 
-        expression_list = []
-        str_to_check = str_to_check.lower()
-
-        i = 0
-        while i < len(str_to_check):
-            if str_to_check[i] != "[":
-                i += 1
-                continue
-            for key in self.emo_map.keys():
-                emo_tag = f"[{key}]"
-                if str_to_check[i : i + len(emo_tag)] == emo_tag:
-                    expression_list.append(self.emo_map[key])
-                    i += len(emo_tag) - 1
-                    break
-            i += 1
-        return expression_list
+        if self.emo_pattern is None or "[" not in str_to_check:
+            return []
+        return [
+            self.emo_map[match.group(1).lower()]
+            for match in self.emo_pattern.finditer(str_to_check)
+        ]
 
     def remove_emotion_keywords(self, target_str: str) -> str:
         """
@@ -182,13 +268,6 @@ class Live2dModel:
             str: The cleaned string with the emotion keywords removed.
         """
 
-        lower_str = target_str.lower()
-
-        for key in self.emo_map.keys():
-            lower_key = f"[{key}]".lower()
-            while lower_key in lower_str:
-                start_index = lower_str.find(lower_key)
-                end_index = start_index + len(lower_key)
-                target_str = target_str[:start_index] + target_str[end_index:]
-                lower_str = lower_str[:start_index] + lower_str[end_index:]
-        return target_str
+        if self.emo_pattern is None or "[" not in target_str:
+            return target_str
+        return self.emo_pattern.sub("", target_str)
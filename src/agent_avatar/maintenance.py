@@ -0,0 +1,281 @@
+"""
+Background maintenance of chat_history and the audio cache.
+
+MaintenanceTask periodically:
+- deletes histories beyond the retention limits (age of the latest message,
+  number of histories or total size per conf_uid), oldest first
+- prunes empty histories once they are older than a grace period
+- compacts histories that changed since they were last compacted and have
+  been idle for a while
+- removes audio files left in the cache directory, e.g. by a crash before
+  they were sent
+
+Histories that a client currently has open are never deleted or compacted.
+Every step is a small store call run in a thread (deletes and compactions go
+through the history write queue), with the event loop free in between, so a
+pass never holds up request handling. Each pass logs what it reclaimed.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .chat_history_manager import (
+    async_compact_history,
+    async_delete_history,
+    get_history_store,
+)
+from .history_store.history_store_interface import HistorySummary
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Which histories to keep, per conf_uid. A limit of 0 disables it.
+
+    Attributes:
+        max_age_days: Delete histories whose latest message is older
+        max_count: Keep only this many of the most recent histories
+        max_size_mb: Keep the most recent histories up to this total size
+        empty_grace_minutes: Delete empty histories created longer ago
+        compact_idle_minutes: Compact changed histories idle this long
+    """
+
+    max_age_days: int = 0
+    max_count: int = 0
+    max_size_mb: float = 0
+    empty_grace_minutes: int = 60
+    compact_idle_minutes: int = 10
+
+
+@dataclass
+class MaintenanceReport:
+    """What one maintenance pass did"""
+
+    histories_deleted: int = 0
+    empty_histories_pruned: int = 0
+    histories_compacted: int = 0
+    history_bytes_reclaimed: int = 0
+    cache_files_removed: int = 0
+    cache_bytes_reclaimed: int = 0
+    errors: int = 0
+    duration_ms: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"deleted {self.histories_deleted} histories, "
+            f"pruned {self.empty_histories_pruned} empty, "
+            f"compacted {self.histories_compacted}, "
+            f"reclaimed {self.history_bytes_reclaimed / 1024:.1f} KiB of history; "
+            f"removed {self.cache_files_removed} cache files "
+            f"({self.cache_bytes_reclaimed / 1024:.1f} KiB); "
+            f"{self.errors} errors in {self.duration_ms:.0f} ms"
+        )
+
+
+def _parse_time(timestamp: Optional[str]) -> Optional[datetime]:
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+
+
+class MaintenanceTask:
+    """Periodic retention, compaction and cache sweeping"""
+
+    def __init__(
+        self,
+        policy: Optional[RetentionPolicy] = None,
+        interval_minutes: float = 30,
+        cache_dir: str = "cache",
+        cache_max_age_minutes: float = 10,
+        is_active: Optional[Callable[[str, str], bool]] = None,
+    ):
+        """
+        Args:
+            policy: History retention limits
+            interval_minutes: Time between passes; the first pass runs at start
+            cache_dir: Directory TTS audio files are written to
+            cache_max_age_minutes: Remove cache files older than this
+            is_active: Called as is_active(conf_uid, history_uid); histories it
+                returns True for are left alone
+        """
+        self.policy = policy or RetentionPolicy()
+        self.interval = interval_minutes * 60
+        self.cache_dir = cache_dir
+        self.cache_max_age = cache_max_age_minutes * 60
+        self.is_active = is_active or (lambda conf_uid, history_uid: False)
+        self.last_report: Optional[MaintenanceReport] = None
+        # History size at its last compaction, to skip unchanged histories.
+        # Not persisted, so the first pass checks every idle history once;
+        # compaction only reads those that have nothing to fold.
+        self._compacted_sizes: Dict[Tuple[str, str], int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Maintenance pass failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> MaintenanceReport:
+        """Run one full maintenance pass and log its report"""
+        started = time.perf_counter()
+        report = MaintenanceReport()
+        store = get_history_store()
+        try:
+            conf_uids = await asyncio.to_thread(store.list_conf_uids)
+        except Exception as e:
+            logger.error(f"Maintenance could not list histories: {e}")
+            conf_uids = []
+            report.errors += 1
+        for conf_uid in conf_uids:
+            await self._maintain_conf(conf_uid, report)
+        await self._sweep_cache(report)
+
+        report.duration_ms = (time.perf_counter() - started) * 1000
+        self.last_report = report
+        logger.info(f"Maintenance: {report.summary()}")
+        return report
+
+    async def _maintain_conf(self, conf_uid: str, report: MaintenanceReport) -> None:
+        store = get_history_store()
+        try:
+            summaries = await asyncio.to_thread(store.list_history_summaries, conf_uid)
+        except Exception as e:
+            logger.error(f"Maintenance could not list histories of {conf_uid}: {e}")
+            report.errors += 1
+            return
+
+        now = datetime.now()
+        kept: List[Tuple[HistorySummary, Optional[datetime]]] = []
+        for summary in summaries:
+            if self.is_active(conf_uid, summary.history_uid):
+                continue
+            if summary.latest_message is None:
+                await self._prune_empty(conf_uid, summary.history_uid, now, report)
+                continue
+            kept.append((summary, _parse_time(summary.latest_message.get("timestamp"))))
+
+        # Newest first; histories without a readable timestamp count as oldest
+        kept.sort(key=lambda item: item[1] or datetime.min, reverse=True)
+        policy = self.policy
+        max_bytes = policy.max_size_mb * 1024 * 1024
+        total_bytes = 0
+        for index, (summary, latest_time) in enumerate(kept):
+            history_uid = summary.history_uid
+            size = await asyncio.to_thread(store.history_size, conf_uid, history_uid)
+            total_bytes += size
+            expired = (
+                policy.max_age_days > 0
+                and latest_time is not None
+                and now - latest_time > timedelta(days=policy.max_age_days)
+            )
+            if (
+                expired
+                or (policy.max_count > 0 and index >= policy.max_count)
+                or (max_bytes > 0 and total_bytes > max_bytes)
+            ):
+                if await self._delete(conf_uid, history_uid, report):
+                    report.histories_deleted += 1
+                    report.history_bytes_reclaimed += size
+                    total_bytes -= size
+                continue
+
+            if (
+                latest_time is not None
+                and now - latest_time > timedelta(minutes=policy.compact_idle_minutes)
+                and self._compacted_sizes.get((conf_uid, history_uid)) != size
+            ):
+                await self._compact(conf_uid, history_uid, size, report)
+
+    async def _prune_empty(
+        self, conf_uid: str, history_uid: str, now: datetime, report: MaintenanceReport
+    ) -> None:
+        store = get_history_store()
+        metadata = await asyncio.to_thread(store.get_metadata, conf_uid, history_uid)
+        created = _parse_time(metadata.get("timestamp"))
+        if created is not None and now - created < timedelta(
+            minutes=self.policy.empty_grace_minutes
+        ):
+            return
+        if await self._delete(conf_uid, history_uid, report):
+            report.empty_histories_pruned += 1
+
+    async def _delete(
+        self, conf_uid: str, history_uid: str, report: MaintenanceReport
+    ) -> bool:
+        if await async_delete_history(conf_uid, history_uid):
+            self._compacted_sizes.pop((conf_uid, history_uid), None)
+            logger.debug(f"Maintenance removed history {conf_uid}/{history_uid}")
+            return True
+        report.errors += 1
+        return False
+
+    async def _compact(
+        self, conf_uid: str, history_uid: str, size: int, report: MaintenanceReport
+    ) -> None:
+        if not await async_compact_history(conf_uid, history_uid):
+            report.errors += 1
+            return
+        store = get_history_store()
+        new_size = await asyncio.to_thread(store.history_size, conf_uid, history_uid)
+        self._compacted_sizes[(conf_uid, history_uid)] = new_size
+        # Only a rewrite shrinks a history: histories with nothing to fold
+        # and backends without compaction are left as they were
+        if new_size < size:
+            report.histories_compacted += 1
+            report.history_bytes_reclaimed += size - new_size
+
+    async def _sweep_cache(self, report: MaintenanceReport) -> None:
+        if self.cache_max_age <= 0 or not os.path.isdir(self.cache_dir):
+            return
+        removed, reclaimed, errors = await asyncio.to_thread(
+            self._remove_stale_files, self.cache_dir, time.time() - self.cache_max_age
+        )
+        report.cache_files_removed += removed
+        report.cache_bytes_reclaimed += reclaimed
+        report.errors += errors
+
+    @staticmethod
+    def _remove_stale_files(directory: str, cutoff: float) -> Tuple[int, int, int]:
+        """Remove files last modified before cutoff; returns (files, bytes, errors)"""
+        removed = reclaimed = errors = 0
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                    if stat.st_mtime < cutoff:
+                        os.remove(path)
+                        removed += 1
+                        reclaimed += stat.st_size
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    logger.warning(f"Could not remove cache file {path}: {e}")
+                    errors += 1
+        return removed, reclaimed, errors
@@ -1,4 +1,5 @@
 import json
+from typing import Dict, Set
 from uuid import uuid4
 import numpy as np
 import asyncio
@@ -7,14 +8,19 @@ from fastapi import APIRouter, WebSocket, UploadFile, File, Response, Request
 from starlette.websockets import WebSocketDisconnect
 from loguru import logger
 from .service_context import ServiceContext
-from .websocket_handler import WebSocketHandler
+from .websocket_handler import WebSocketHandler, normalize_history_uid
 from .conversations.tts_manager import TTSTaskManager
+from .conversations.types import WebSocketSend
 from .agent.transformers import actions_extractor
 from .agent.output_types import DisplayText, Actions
+from .utils.text_rules import collapse_whitespace, strip_action_tags
 
 # Simple response_id tracking for stop commands
 stopped_response_ids = set()
 
+# Seconds a finished stream session may take to deliver its remaining audio
+STREAM_SESSION_DRAIN_TIMEOUT = 120.0
+
 
 def init_client_ws_route(default_context_cache: ServiceContext):
     """
@@ -30,10 +36,54 @@ def init_client_ws_route(default_context_cache: ServiceContext):
     router = APIRouter()
     ws_handler = WebSocketHandler(default_context_cache)
 
-    # Create TTS manager for streaming chunks
-    streaming_tts_manager = TTSTaskManager()
+    # Ordered TTS sessions for streamed chunks, keyed by history_uid.
+    # Created on the first chunk of a turn and torn down after the final one.
+    stream_sessions: Dict[str, TTSTaskManager] = {}
+    # Keep references to the teardown tasks until they finish
+    stream_close_tasks: Set[asyncio.Task] = set()
+
+    def history_sender(history_key: str) -> WebSocketSend:
+        """Create a send function delivering to the clients currently on a history"""
+
+        async def send(message: str) -> None:
+            await ws_handler.send_to_clients(
+                ws_handler.get_history_clients(history_key), message
+            )
+
+        return send
+
+    def get_stream_session(history_key: str) -> TTSTaskManager:
+        """Get the stream session of a history, creating it on first chunk"""
+        session = stream_sessions.get(history_key)
+        if session is None:
+            session = TTSTaskManager()
+            stream_sessions[history_key] = session
+            logger.debug(f"Opened stream session for history {history_key}")
+        return session
+
+    async def close_stream_session(history_key: str, session: TTSTaskManager):
+        """Tear down a stream session once its queued audio has been delivered"""
+        try:
+            await session.wait_until_idle(timeout=STREAM_SESSION_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stream session for history {history_key} did not drain in time")
+        else:
+            # Chunks of a new turn arrived while draining; that turn keeps
+            # the session and closes it with its own final chunk.
+            if not session.is_idle():
+                return
 
-    async def process_chunk_with_tts(chunk: str, context: ServiceContext, websocket_clients: list):
+        if stream_sessions.get(history_key) is session:
+            del stream_sessions[history_key]
+        session.clear()
+        logger.debug(f"Closed stream session for history {history_key}")
+
+    async def process_chunk_with_tts(
+        chunk: str,
+        context: ServiceContext,
+        tts_manager: TTSTaskManager,
+        websocket_send: WebSocketSend,
+    ):
         """Process streaming chunk through TTS pipeline"""
         try:
             if not context.tts_engine or not context.live2d_model or not chunk.strip():
@@ -41,36 +91,34 @@ def init_client_ws_route(default_context_cache: ServiceContext):
 
             logger.debug(f"🎬 Processing streaming chunk for TTS: {chunk[:50]}...")
 
-            # Extract emotions directly from the Live2D model
-            expressions = context.live2d_model.extract_emotion(chunk)
-            actions = Actions(expressions=expressions) if expressions else None
+            # Turn emotion and motion tags into structured actions
+            expressions, motions, text = context.live2d_model.parse_action_tags(chunk)
+            actions = (
+                Actions(expressions=expressions or None, motions=motions or None)
+                if expressions or motions
+                else None
+            )
 
             # Create display text object (ensure no duration parameter)
             # Use only the specific fields we need to avoid any duration issues
             display_text = DisplayText(
-                text=chunk,
+                text=text,
                 name="VTube AI",
                 avatar="shizuku.png"
             )
 
-            logger.debug(f"🎬 TTS text: {chunk}, Actions: {actions}")
+            logger.debug(f"🎬 TTS text: {text}, Actions: {actions}")
             logger.debug(f"🔍 DisplayText object: {display_text}, type: {type(display_text)}")
 
             # Trigger TTS immediately - add more specific error handling
             try:
-                # Ensure all parameters are properly typed for debugging
-                websocket_func = websocket_clients[0][1].send_text if websocket_clients else None
-                logger.debug(f"🔍 Parameters: tts_text={type(chunk)}, display_text={type(display_text)}, actions={type(actions)}")
-                logger.debug(f"🔍 live2d_model={type(context.live2d_model)}, tts_engine={type(context.tts_engine)}")
-                logger.debug(f"🔍 websocket_send={type(websocket_func)}")
-
-                await streaming_tts_manager.speak(
-                    tts_text=chunk,
+                await tts_manager.speak(
+                    tts_text=text,
                     display_text=display_text,
                     actions=actions,
                     live2d_model=context.live2d_model,
                     tts_engine=context.tts_engine,
-                    websocket_send=websocket_func
+                    websocket_send=websocket_send
                 )
             except Exception as speak_error:
                 logger.error(f"🚨 Exact TTS speak error: {speak_error}")
@@ -108,7 +156,8 @@ def init_client_ws_route(default_context_cache: ServiceContext):
         Also handles stop_audio commands to clear the audio queue.
         
         This endpoint allows external applications to send audio with lip-sync data
-        that will be broadcast to all connected VTube clients, or stop all audio.
+        to the clients on the history given by `history_uid` or `context_id`
+        (all connected clients if neither is set), or stop all audio.
         """
         try:
             data = await request.json()
@@ -141,27 +190,29 @@ def init_client_ws_route(default_context_cache: ServiceContext):
             display_text = data.get("display_text", {"text": ""})
             text = display_text.get("text", "")
             
-            # Extract emotions from text if no actions provided
-            actions = data.get("actions")
-            if not actions and text and hasattr(ws_handler, 'default_context_cache'):
+            # Extract emotion and motion tags and strip them in one pass over the text
+            expressions, motions, clean_text = [], [], strip_action_tags(text)
+            if text and hasattr(ws_handler, 'default_context_cache'):
                 try:
                     # Get the Live2D model from the default context
                     live2d_model = ws_handler.default_context_cache.live2d_model
                     if live2d_model:
-                        # Extract emotions from text
-                        expressions = live2d_model.extract_emotion(text)
-                        if expressions:
-                            actions = {"expressions": expressions}
-                            logger.debug(f"Extracted expressions {expressions} from text: {text[:50]}...")
+                        expressions, motions, clean_text = live2d_model.parse_action_tags(text)
                 except Exception as e:
                     logger.debug(f"Could not extract emotions: {e}")
 
-            # Strip emotion tags from display text if display_clean flag is set
+            # Use the extracted tags if no actions provided
+            actions = data.get("actions")
+            if not actions and (expressions or motions):
+                actions = Actions(
+                    expressions=expressions or None, motions=motions or None
+                ).to_dict()
+                logger.debug(f"Extracted actions {actions} from text: {text[:50]}...")
+
+            # Strip emotion and motion tags from display text if display_clean flag is set
             if display_text.get("display_clean", False):
-                import re
-                clean_text = re.sub(r'\[(?:joy|sadness|anger|fear|neutral|surprise|smirk|disgust)\]\s*', '', display_text.get("text", ""), flags=re.IGNORECASE)
                 display_text = {
-                    "text": clean_text,
+                    "text": collapse_whitespace(clean_text),
                     "duration": display_text.get("duration")
                 }
 
@@ -183,25 +234,29 @@ def init_client_ws_route(default_context_cache: ServiceContext):
             response_id = data.get("response_id", 0)
             logger.info(f"Received external audio from {source} (response_id: {response_id}): '{text[:50]}...'")
             
-            # Send to connected clients immediately (Agent Zero now handles interruption)
-            connected_clients = list(ws_handler.client_connections.keys())
-            if connected_clients:
-                success_count = 0
-                for client_uid in connected_clients:
-                    try:
-                        websocket = ws_handler.client_connections.get(client_uid)
-                        if websocket:
-                            await websocket.send_text(json.dumps(audio_payload))
-                            success_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to send audio to client {client_uid}: {e}")
-                
+            # Route to the clients on the payload's history (Agent-Zero sends its
+            # context id, "avatar_<history_uid>"), never to other sessions.
+            # Payloads without a target are still broadcast to every client for
+            # older integrations.
+            target_history = data.get("history_uid") or data.get("context_id")
+            if target_history:
+                target_clients = ws_handler.get_history_clients(target_history)
+            else:
+                target_clients = list(ws_handler.client_connections.items())
+
+            success_count = 0
+            if target_clients:
+                success_count = await ws_handler.send_to_clients(
+                    target_clients, json.dumps(audio_payload)
+                )
                 logger.debug(f"Sent audio from response_id: {response_id} to {success_count} clients")
-            
+            elif target_history:
+                logger.warning(f"No clients connected for history {target_history}, audio not sent")
+
             return {
                 "status": "success", 
-                "message": f"Audio sent to {len(connected_clients)} clients",
-                "clients_reached": success_count if 'success_count' in locals() else 0
+                "message": f"Audio sent to {success_count} clients",
+                "clients_reached": success_count
             }
             
         except json.JSONDecodeError:
@@ -217,10 +272,9 @@ def init_client_ws_route(default_context_cache: ServiceContext):
         Receive streaming text chunks from Agent-Zero for real-time display.
         This enables live text generation without waiting for complete response.
         """
-        logger.info(f"🚀 Received streaming chunk for history {history_uid}")
+        logger.debug(f"🚀 Received streaming chunk for history {history_uid}")
         try:
             data = await request.json()
-            logger.debug(f"📋 Stream data: {data}")
 
             chunk_type = data.get("type", "")
             if chunk_type != "stream_chunk":
@@ -231,56 +285,47 @@ def init_client_ws_route(default_context_cache: ServiceContext):
             chunk = data.get("chunk", "")
             is_final = data.get("is_final", False)
 
-            logger.info(f"📝 Processing chunk: '{chunk[:50]}...' (final: {is_final})")
+            logger.debug(f"📝 Processing chunk: '{chunk[:50]}...' (final: {is_final})")
 
-            if not chunk:
+            # Agent-Zero sends "vtube_XXX" while VTube stores "XXX"
+            history_key = normalize_history_uid(history_uid)
+
+            if chunk:
+                # Look up the clients on this history in the handler's index
+                matching_clients = ws_handler.get_history_clients(history_key)
+                logger.debug(f"🎯 Found {len(matching_clients)} matching WebSocket clients")
+
+                # Don't send text_stream to clients - audio messages already contain display_text
+                # This prevents "Unknown message type: text_stream" warnings in frontend
+
+                # Get TTS context for processing
+                tts_context = None
+                if matching_clients:
+                    first_client_uid = matching_clients[0][0]
+                    tts_context = ws_handler.client_contexts.get(first_client_uid)
+
+                if tts_context and tts_context.tts_engine and tts_context.live2d_model:
+                    try:
+                        await process_chunk_with_tts(
+                            chunk,
+                            tts_context,
+                            get_stream_session(history_key),
+                            history_sender(history_key),
+                        )
+                    except Exception as tts_error:
+                        logger.error(f"❌ TTS processing failed: {tts_error}")
+            else:
                 logger.debug("⚠️ Empty chunk received")
-                return {"status": "success", "message": "Empty chunk received"}
 
-            # Find active WebSocket connections for this history
-            matching_clients = []
-            logger.debug(f"🔍 Searching for WebSocket clients with history_uid: {history_uid}")
-            logger.debug(f"🔍 Available client contexts: {list(ws_handler.client_contexts.keys())}")
-
-            logger.debug(f"🔍 client_connections keys: {list(ws_handler.client_connections.keys())}")
-
-            for client_uid, context in ws_handler.client_contexts.items():
-                logger.debug(f"🔍 Checking client {client_uid}, context: {context}")
-                if hasattr(context, 'history_uid'):
-                    logger.debug(f"🔍 Client {client_uid} has history_uid: {context.history_uid}")
-                    # Match both with and without "vtube_" prefix
-                    # Agent-Zero sends "vtube_XXX" but VTube stores "XXX"
-                    client_history = context.history_uid
-                    history_matches = (client_history == history_uid or
-                                     f"vtube_{client_history}" == history_uid or
-                                     client_history == history_uid.replace("vtube_", ""))
-
-                    if history_matches:
-                        websocket = ws_handler.client_connections.get(client_uid)
-                        logger.debug(f"🔍 WebSocket for {client_uid}: {websocket is not None}")
-                        if websocket:
-                            matching_clients.append((client_uid, websocket))
-                            logger.info(f"✅ Found matching client: {client_uid}")
-                        else:
-                            logger.error(f"❌ Client {client_uid} has context but NO websocket in client_connections!")
-
-            logger.info(f"🎯 Found {len(matching_clients)} matching WebSocket clients")
-
-            # Don't send text_stream to clients - audio messages already contain display_text
-            # This prevents "Unknown message type: text_stream" warnings in frontend
-            logger.debug(f"📝 Processing chunk (not sending text_stream): '{chunk[:30]}...'")
-
-            # Get TTS context for processing
-            tts_context = None
-            if matching_clients:
-                first_client_uid = matching_clients[0][0]
-                tts_context = ws_handler.client_contexts.get(first_client_uid)
-
-            if tts_context and tts_context.tts_engine and tts_context.live2d_model:
-                try:
-                    await process_chunk_with_tts(chunk, tts_context, matching_clients)
-                except Exception as tts_error:
-                    logger.error(f"❌ TTS processing failed: {tts_error}")
+            if is_final and history_key in stream_sessions:
+                close_task = asyncio.create_task(
+                    close_stream_session(history_key, stream_sessions[history_key])
+                )
+                stream_close_tasks.add(close_task)
+                close_task.add_done_callback(stream_close_tasks.discard)
+
+            if not chunk:
+                return {"status": "success", "message": "Empty chunk received"}
 
             return {
                 "status": "success",
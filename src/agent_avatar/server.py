@@ -1,6 +1,7 @@
 import os
 import shutil
 import asyncio
+from contextlib import asynccontextmanager
 from typing import Optional
 
 from fastapi import FastAPI
@@ -12,7 +13,13 @@ from loguru import logger
 from .routes import init_client_ws_route, init_webtool_routes
 from .service_context import ServiceContext
 from .config_manager.utils import Config
-from .agent_zero_client import init_agent_zero_client
+from .agent_zero_client import init_agent_zero_client, get_agent_zero_client
+from .chat_history_manager import (
+    async_flush_history,
+    init_history_store,
+    recover_history_store,
+)
+from .maintenance import MaintenanceTask, RetentionPolicy
 
 
 class CustomStaticFiles(StaticFiles):
@@ -33,7 +40,7 @@ class AvatarStaticFiles(StaticFiles):
 
 class WebSocketServer:
     def __init__(self, config: Config):
-        self.app = FastAPI()
+        self.app = FastAPI(lifespan=self._lifespan)
         self.config = config
         self.ws_handler = None
 
@@ -56,6 +63,15 @@ class WebSocketServer:
             enabled=True
         )
 
+        init_history_store(
+            history_backend=config.system_config.history_backend,
+            db_path=config.system_config.history_db_path,
+            cache_messages=config.system_config.history_cache_messages,
+            # Without the maintenance task, empty histories are pruned on listing
+            prune_empty_on_list=config.system_config.maintenance_interval_minutes == 0,
+        )
+        recover_history_store()
+
         # Load configurations and initialize the default context cache
         default_context_cache = ServiceContext()
         default_context_cache.load_from_config(config)
@@ -107,6 +123,58 @@ class WebSocketServer:
             name="frontend",
         )
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        """Open shared connections on startup and release them on shutdown"""
+        agent_zero_client = get_agent_zero_client()
+        await agent_zero_client.start()
+        await agent_zero_client.warm_up()
+        system_config = self.config.system_config
+        maintenance = None
+        if system_config.maintenance_interval_minutes > 0:
+            maintenance = MaintenanceTask(
+                RetentionPolicy(
+                    max_age_days=system_config.history_max_age_days,
+                    max_count=system_config.history_max_count,
+                    max_size_mb=system_config.history_max_size_mb,
+                ),
+                interval_minutes=system_config.maintenance_interval_minutes,
+                cache_max_age_minutes=system_config.cache_max_age_minutes,
+                # Leave the histories clients have open alone
+                is_active=lambda conf_uid, history_uid: self.ws_handler is not None
+                and history_uid in self.ws_handler.history_clients,
+            )
+            maintenance.start()
+        try:
+            yield
+        finally:
+            if maintenance is not None:
+                await maintenance.stop()
+            await agent_zero_client.close()
+            await self._close_translators()
+            # Make sure queued history writes reach the disk
+            await async_flush_history()
+
+    async def _close_translators(self) -> None:
+        """Close the HTTP clients of every translate engine in use"""
+        if self.ws_handler is None:
+            return
+        contexts = [
+            self.ws_handler.default_context_cache,
+            *self.ws_handler.client_contexts.values(),
+        ]
+        # Client contexts share the default engine unless they switched config
+        engines = {
+            id(context.translate_engine): context.translate_engine
+            for context in contexts
+            if context.translate_engine is not None
+        }
+        for engine in engines.values():
+            try:
+                await engine.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close translate engine: {e}")
+
     def run(self):
         pass
 
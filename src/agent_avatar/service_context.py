@@ -257,6 +257,9 @@ class ServiceContext:
                 getattr(
                     translator_config, translator_config.translate_provider
                 ).model_dump(),
+                batch_window_ms=translator_config.batch_window_ms,
+                max_batch_size=translator_config.max_batch_size,
+                cache_size=translator_config.cache_size,
             )
             self.character_config.tts_preprocessor_config.translator_config = (
                 translator_config
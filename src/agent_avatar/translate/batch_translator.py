@@ -0,0 +1,135 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+from .translate_interface import TranslateInterface
+
+
+class BatchTranslator(TranslateInterface):
+    """
+    Wraps a translate engine with an LRU cache and request coalescing.
+
+    Sentences submitted through async_translate within a short window are
+    sent to the engine as one async_translate_batch call, so concurrent
+    conversations (or a pipeline translating ahead of TTS) share requests.
+    Repeated sentences are answered from the cache without a request.
+    """
+
+    def __init__(
+        self,
+        engine: TranslateInterface,
+        batch_window_ms: int = 20,
+        max_batch_size: int = 16,
+        cache_size: int = 256,
+    ):
+        """
+        Args:
+            engine: The translate engine doing the actual requests
+            batch_window_ms: How long to wait for more sentences before
+                sending a batch. 0 sends whatever is queued on the next
+                loop iteration.
+            max_batch_size: Send a batch as soon as this many distinct
+                sentences are queued
+            cache_size: Number of translations to keep. 0 disables the cache.
+        """
+        self.engine = engine
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        # Sentences waiting for the next batch, each with the futures of
+        # every caller asking for it
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # Keep references so in-flight batches are not garbage collected
+        self._tasks: set = set()
+
+    def _cache_get(self, text: str) -> str | None:
+        translation = self._cache.get(text)
+        if translation is not None:
+            self._cache.move_to_end(text)
+        return translation
+
+    def _cache_put(self, text: str, translation: str) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[text] = translation
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def translate(self, text: str) -> str:
+        translation = self._cache_get(text)
+        if translation is None:
+            translation = self.engine.translate(text)
+            self._cache_put(text, translation)
+        return translation
+
+    async def async_translate(self, text: str) -> str:
+        translation = self._cache_get(text)
+        if translation is not None:
+            return translation
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(text, []).append(future)
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        return list(await asyncio.gather(*(self.async_translate(t) for t in texts)))
+
+    async def aclose(self) -> None:
+        """Cancel queued and in-flight batches and close the engine"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for futures in self._pending.values():
+            for future in futures:
+                future.cancel()
+        self._pending = {}
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.engine.aclose()
+
+    def _flush(self) -> None:
+        """Send everything queued as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch = list(self._pending.items())
+        self._pending = {}
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, List[asyncio.Future]]]) -> None:
+        texts = [text for text, _ in batch]
+        if len(texts) > 1:
+            logger.debug(f"Translating {len(texts)} sentences in one request")
+        try:
+            translations = await self.engine.async_translate_batch(texts)
+            if len(translations) != len(texts):
+                raise ValueError(
+                    f"Got {len(translations)} translations for {len(texts)} texts"
+                )
+        except Exception as e:
+            for _, futures in batch:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for (text, futures), translation in zip(batch, translations):
+            self._cache_put(text, translation)
+            for future in futures:
+                if not future.done():
+                    future.set_result(translation)
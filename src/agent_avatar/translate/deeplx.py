@@ -1,4 +1,7 @@
+import asyncio
 import json
+from typing import List
+
 import httpx
 from loguru import logger
 from .translate_interface import TranslateInterface
@@ -8,21 +11,82 @@ class DeepLXTranslate(TranslateInterface):
     api_endpoint: str = "http://127.0.0.1:1188/v2/translate"
     target_lang: str = "JP"
 
-    def __init__(self, api_endpoint: str, target_lang: str):
+    def __init__(self, api_endpoint: str, target_lang: str, timeout: float = 10.0):
         self.api_endpoint = api_endpoint
         self.target_lang = target_lang
+        self.timeout = timeout
+        # Pooled clients, created on first use so connections are reused
+        # across sentences instead of reconnecting for every request
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(timeout=self.timeout)
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=self.timeout)
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def _payload(self, texts: List[str]) -> str:
+        return json.dumps({"text": texts, "target_lang": self.target_lang})
+
+    def _parse(self, texts: List[str], body: str) -> List[str]:
+        """Extract the translations from a v2 response"""
+        try:
+            return [d["text"] for d in json.loads(body)["translations"]]
+        except Exception as e:
+            logger.critical(f"Error translating text {texts}. Error message: {e}")
+            logger.critical(f"Response: {body}")
+            raise e
 
     # translate v2 endpoint from DeepLX
     def translate(self, text: str) -> str:
         try:
-            data = {"text": [text], "target_lang": self.target_lang}
-            post_data = json.dumps(data)
-            req = httpx.post(url=self.api_endpoint, data=post_data).text
-            res = json.loads(req)["translations"]
-            res = " ".join([d["text"] for d in res])
+            body = self.client.post(
+                url=self.api_endpoint, content=self._payload([text])
+            ).text
         except Exception as e:
             logger.critical(f"Error translating text '{text}'. Error message: {e}")
-            logger.critical(f"Response: {req}")
             raise e
+        return " ".join(self._parse([text], body))
+
+    async def async_translate(self, text: str) -> str:
+        return (await self.async_translate_batch([text]))[0]
 
-        return res
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        """Translate all texts in a single v2 request"""
+        if not texts:
+            return []
+        try:
+            response = await self.async_client.post(
+                url=self.api_endpoint, content=self._payload(texts)
+            )
+        except Exception as e:
+            logger.critical(f"Error translating text {texts}. Error message: {e}")
+            raise e
+        translations = self._parse(texts, response.text)
+        if len(texts) == 1:
+            return [" ".join(translations)]
+        if len(translations) == len(texts):
+            return translations
+        # Some DeepLX builds merge a text list into one translation;
+        # fall back to one request per text
+        logger.warning(
+            f"DeepLX returned {len(translations)} translations for "
+            f"{len(texts)} texts, retrying one by one"
+        )
+        return list(await asyncio.gather(*(self.async_translate(t) for t in texts)))
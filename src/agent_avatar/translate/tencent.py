@@ -3,6 +3,7 @@ import hmac
 import json
 import time
 from datetime import datetime, timezone
+from typing import List, Tuple
 
 import httpx
 from loguru import logger
@@ -24,6 +25,7 @@ class TencentTranslate(TranslateInterface):
         region: str = "ap-guangzhou",
         source_lang: str = "zh",
         target_lang: str = "ja",
+        timeout: float = 10.0,
     ):
         self.secret_id = secret_id
         self.secret_key = secret_key
@@ -36,21 +38,56 @@ class TencentTranslate(TranslateInterface):
         self.algorithm = "TC3-HMAC-SHA256"
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self.timeout = timeout
+        # The derived signing key only changes with the UTC date
+        self._signing_key: Tuple[str, bytes] | None = None
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(timeout=self.timeout)
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=self.timeout)
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
 
     def create_signature(self, date, service):
         """Create signature"""
+        if service == self.service:
+            cached = self._signing_key
+            if cached is not None and cached[0] == date:
+                return cached[1]
         secret_date = sign(("TC3" + self.secret_key).encode("utf-8"), date)
         secret_service = sign(secret_date, service)
         secret_signing = sign(secret_service, "tc3_request")
+        if service == self.service:
+            self._signing_key = (date, secret_signing)
         return secret_signing
 
-    def _prepare_headers(self, payload: str, timestamp: int, date: str) -> dict:
+    def _prepare_headers(
+        self, payload: str, timestamp: int, date: str, action: str | None = None
+    ) -> dict:
         """Prepare request headers"""
+        action = action or self.action
         ct = "application/json; charset=utf-8"
         canonical_uri = "/"
         canonical_querystring = ""
         canonical_headers = (
-            f"content-type:{ct}\nhost:{self.host}\nx-tc-action:{self.action.lower()}\n"
+            f"content-type:{ct}\nhost:{self.host}\nx-tc-action:{action.lower()}\n"
         )
         signed_headers = "content-type;host;x-tc-action"
         hashed_request_payload = hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -82,7 +119,7 @@ class TencentTranslate(TranslateInterface):
             "Authorization": authorization,
             "Content-Type": ct,
             "Host": self.host,
-            "X-TC-Action": self.action,
+            "X-TC-Action": action,
             "X-TC-Timestamp": str(timestamp),
             "X-TC-Version": self.version,
         }
@@ -93,29 +130,77 @@ class TencentTranslate(TranslateInterface):
 
         return headers
 
-    def translate(self, text: str) -> str:
-        """Translate text"""
+    def _prepare_request(self, action: str, body: dict) -> Tuple[str, dict]:
+        """Serialize the request body and sign it"""
         timestamp = int(time.time())
         date = datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
-
         payload = json.dumps(
             {
-                "SourceText": text,
+                **body,
                 "Source": self.source_lang,
                 "Target": self.target_lang,
                 "ProjectId": 0,
             }
         )
+        return payload, self._prepare_headers(payload, timestamp, date, action)
 
-        headers = self._prepare_headers(payload, timestamp, date)
+    @staticmethod
+    def _target_text(res: dict) -> str:
+        """Extract the translation from a TextTranslate response"""
+        target_text = res.get("Response", {}).get("TargetText")
+        if not isinstance(target_text, str):
+            raise ValueError(f"Translation failed: {res}")
+        return target_text
+
+    def translate(self, text: str) -> str:
+        """Translate text"""
+        payload, headers = self._prepare_request(self.action, {"SourceText": text})
 
         try:
-            response = httpx.post(
-                url="https://" + self.host, headers=headers, data=payload
+            response = self.client.post(
+                url="https://" + self.host, headers=headers, content=payload
             )
             res = response.json()
             logger.info(f"Request successful: {res}")
-            return res.get("Response", {}).get("TargetText", "Translation failed")
         except Exception as e:
             logger.critical(f"API call error: {e}")
             raise e
+        return self._target_text(res)
+
+    async def async_translate(self, text: str) -> str:
+        """Translate text without blocking the event loop"""
+        payload, headers = self._prepare_request(self.action, {"SourceText": text})
+
+        try:
+            response = await self.async_client.post(
+                url="https://" + self.host, headers=headers, content=payload
+            )
+            res = response.json()
+            logger.info(f"Request successful: {res}")
+        except Exception as e:
+            logger.critical(f"API call error: {e}")
+            raise e
+        return self._target_text(res)
+
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        """Translate all texts in a single TextTranslateBatch request"""
+        if len(texts) <= 1:
+            return [await self.async_translate(text) for text in texts]
+        payload, headers = self._prepare_request(
+            "TextTranslateBatch", {"SourceTextList": texts}
+        )
+
+        try:
+            response = await self.async_client.post(
+                url="https://" + self.host, headers=headers, content=payload
+            )
+            res = response.json()
+            logger.info(f"Request successful: {res}")
+        except Exception as e:
+            logger.critical(f"API call error: {e}")
+            raise e
+
+        translations = res.get("Response", {}).get("TargetTextList")
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise ValueError(f"Batch translation failed: {res}")
+        return translations
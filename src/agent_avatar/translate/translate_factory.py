@@ -1,3 +1,4 @@
+from .batch_translator import BatchTranslator
 from .deeplx import DeepLXTranslate
 from .tencent import TencentTranslate
 from .translate_interface import TranslateInterface
@@ -6,6 +7,21 @@ from .translate_interface import TranslateInterface
 class TranslateFactory:
     @staticmethod
     def get_translator(
+        translate_provider: str,
+        translate_provider_config: dict,
+        batch_window_ms: int = 20,
+        max_batch_size: int = 16,
+        cache_size: int = 256,
+    ) -> TranslateInterface:
+        return BatchTranslator(
+            TranslateFactory.get_engine(translate_provider, translate_provider_config),
+            batch_window_ms=batch_window_ms,
+            max_batch_size=max_batch_size,
+            cache_size=cache_size,
+        )
+
+    @staticmethod
+    def get_engine(
         translate_provider: str, translate_provider_config: dict
     ) -> TranslateInterface:
         translate_provider = translate_provider.lower()
@@ -1,4 +1,6 @@
 import abc
+import asyncio
+from typing import List
 
 
 class TranslateInterface(metaclass=abc.ABCMeta):
@@ -7,3 +9,31 @@ class TranslateInterface(metaclass=abc.ABCMeta):
         """
         Translate the input text to the target language."""
         raise NotImplementedError
+
+    async def async_translate(self, text: str) -> str:
+        """
+        Asynchronously translate the input text to the target language.
+
+        By default, this runs the synchronous translate in a thread so the
+        event loop never blocks. Subclasses can override this method to
+        provide a true async implementation.
+        """
+        return await asyncio.to_thread(self.translate, text)
+
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Asynchronously translate several texts, returning one translation per
+        text in the same order.
+
+        By default, this translates the texts one by one concurrently.
+        Engines whose API accepts a list of texts should override this to
+        send them in a single request.
+        """
+        return list(await asyncio.gather(*(self.async_translate(t) for t in texts)))
+
+    async def aclose(self) -> None:
+        """
+        Release the connections held by the engine. Call once on shutdown.
+
+        Engines without connections of their own can keep this no-op.
+        """
@@ -0,0 +1,200 @@
+"""
+Keyword and emoji based emotion classification.
+
+Used when a response carries no [emotion] tag. All keywords of all emotions
+are compiled into one prefix-factored alternation, so a text is scored in a
+single pass instead of one substring search per keyword.
+"""
+
+import re
+from typing import Dict, List
+
+from .text_rules import collapse_whitespace, trie_alternation
+
+# Emoji -> emotion, used both to score text and to turn emojis into tags
+EMOJI_EMOTIONS: Dict[str, str] = {
+    # Joy/Happy
+    "😊": "joy",
+    "😄": "joy",
+    "😂": "joy",
+    "🎉": "joy",
+    "😃": "joy",
+    "😁": "joy",
+    "😆": "joy",
+    "🥰": "joy",
+    "😍": "joy",  # Love -> Joy
+    # Sadness
+    "😢": "sadness",
+    "😭": "sadness",
+    "😞": "sadness",
+    "☹️": "sadness",
+    "😔": "sadness",
+    "😿": "sadness",
+    # Anger
+    "😠": "anger",
+    "😡": "anger",
+    "🤬": "anger",
+    "😤": "anger",
+    "💢": "anger",
+    # Surprise
+    "😮": "surprise",
+    "😲": "surprise",
+    "🤯": "surprise",
+    "😱": "surprise",  # Also fear, but using surprise
+    "🤔": "surprise",  # Thinking -> Surprise
+    # Fear
+    "😨": "fear",
+    "😰": "fear",
+    "😬": "fear",
+    # Disgust
+    "🤢": "disgust",
+    "🤮": "disgust",
+    "😖": "disgust",
+    "🤧": "disgust",
+    # Smirk
+    "😏": "smirk",
+    "😼": "smirk",
+    "😎": "smirk",  # Cool -> Smirk
+    # Others
+    "😴": "neutral",  # Sleepy -> Neutral
+    "🙄": "disgust",  # Eye roll -> Disgust
+    "😵": "surprise",  # Dizzy -> Surprise
+}
+
+# Emotion -> words hinting at it, matched case-insensitively at word starts
+EMOTION_KEYWORDS: Dict[str, List[str]] = {
+    "joy": [
+        "happy",
+        "joy",
+        "excited",
+        "cheerful",
+        "glad",
+        "smile",
+        "laugh",
+        "joke",
+    ],
+    "sadness": [
+        "sad",
+        "sorry",
+        "sorrow",
+        "disappointed",
+        "upset",
+        "depressed",
+        "grief",
+    ],
+    "anger": ["angry", "anger", "mad", "furious", "irritated", "annoyed", "rage"],
+    "surprise": [
+        "wow",
+        "amazing",
+        "incredible",
+        "surprised",
+        "shocked",
+        "unexpected",
+    ],
+    "fear": ["scared", "afraid", "terrified", "nervous", "worried", "anxious"],
+    "disgust": ["disgusting", "gross", "awful", "terrible", "yuck"],
+    "smirk": ["smirk", "clever", "sly", "mischievous"],
+}
+
+
+_KEYWORD_EMOTIONS: Dict[str, str] = {
+    keyword: emotion
+    for emotion, keywords in EMOTION_KEYWORDS.items()
+    for keyword in keywords
+}
+
+# Keywords only match at the start of a word, so "mad" does not hit "nomad"
+_KEYWORD_PATTERN = re.compile(r"(?<!\w)" + trie_alternation(_KEYWORD_EMOTIONS))
+# Emojis are looked up by their first character: a set intersection with the
+# characters of the text finds the few present without scanning for each one
+_EMOJIS_BY_FIRST_CHAR: Dict[str, List[str]] = {}
+for _emoji in EMOJI_EMOTIONS:
+    _EMOJIS_BY_FIRST_CHAR.setdefault(_emoji[0], []).append(_emoji)
+_EMOJI_FIRST_CHARS = frozenset(_EMOJIS_BY_FIRST_CHAR)
+
+
+def _emojis_in(text: str) -> List[str]:
+    """Return the known emojis present in text"""
+    if text.isascii():
+        return []
+    return [
+        emoji
+        for char in _EMOJI_FIRST_CHARS.intersection(text)
+        for emoji in _EMOJIS_BY_FIRST_CHAR[char]
+        if emoji in text
+    ]
+
+
+def convert_emojis_to_tags(text: str) -> str:
+    """
+    Replace emojis with the matching [emotion] tag.
+
+    Args:
+        text: Text to convert
+
+    Returns:
+        str: Text with emojis replaced by emotion tags, whitespace collapsed
+    """
+    for emoji in _emojis_in(text):
+        text = text.replace(emoji, f" [{EMOJI_EMOTIONS[emoji]}]")
+    return collapse_whitespace(text)
+
+
+class EmotionClassifier:
+    """
+    Scores emotions by counting keyword and emoji hits in one scan of the
+    text, then maps them to the expression indices of a Live2D model.
+    """
+
+    def __init__(self, emo_map: Dict[str, int]):
+        """
+        Args:
+            emo_map: Emotion name -> expression index. Emotions the model
+                does not map are never returned.
+        """
+        self.emo_map = emo_map
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """
+        Count the keyword and emoji hits per emotion.
+
+        Args:
+            text: Text to score
+
+        Returns:
+            Dict[str, int]: Emotion -> hit count, in order of first hit
+        """
+        counts: Dict[str, int] = {}
+        if not text:
+            return counts
+        text = text.lower()
+        hits = [
+            (match.start(), _KEYWORD_EMOTIONS[match.group()], 1)
+            for match in _KEYWORD_PATTERN.finditer(text)
+        ]
+        emojis = _emojis_in(text)
+        if emojis:
+            hits.extend(
+                (text.find(emoji), EMOJI_EMOTIONS[emoji], text.count(emoji))
+                for emoji in emojis
+            )
+            hits.sort()
+        for _, emotion, count in hits:
+            if emotion in self.emo_map:
+                counts[emotion] = counts.get(emotion, 0) + count
+        return counts
+
+    def classify(self, text: str) -> List[int]:
+        """
+        Rank the model expressions hinted at by the text.
+
+        Args:
+            text: Text to classify
+
+        Returns:
+            List[int]: Expression indices, most hits first (ties keep the
+            order of first appearance). Empty if nothing matched.
+        """
+        counts = self.scores(text)
+        ranked = sorted(counts, key=counts.get, reverse=True)
+        return list(dict.fromkeys(self.emo_map[emotion] for emotion in ranked))
@@ -1,49 +1,25 @@
+import math
 import re
-from typing import List, Tuple, AsyncIterator, Optional
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, AsyncIterator, Optional
 import pysbd
 from loguru import logger
-from langdetect import detect
+from langdetect import detect, detect_langs
 from enum import Enum
-from dataclasses import dataclass
-
-# Constants for additional checks
-COMMAS = [
-    ",",
-    "،",
-    "，",
-    "、",
-    "፣",
-    "၊",
-    ";",
-    "΄",
-    "‛",
-    "।",
-    "﹐",
-    "꓾",
-    "⹁",
-    "︐",
-    "﹑",
-    "､",
-    "،",
-]
-
-END_PUNCTUATIONS = [".", "!", "?", "。", "！", "？", "...", "。。。"]
-ABBREVIATIONS = [
-    "Mr.",
-    "Mrs.",
-    "Dr.",
-    "Prof.",
-    "Inc.",
-    "Ltd.",
-    "Jr.",
-    "Sr.",
-    "e.g.",
-    "i.e.",
-    "vs.",
-    "St.",
-    "Rd.",
-    "Dr.",
-]
+from dataclasses import dataclass, field
+from .text_rules import (  # COMMAS, ABBREVIATIONS etc. stay importable from here
+    ABBREVIATIONS,  # noqa: F401
+    COMMA_CHARS,
+    COMMAS,
+    END_PUNCTUATION_CHARS,
+    END_PUNCTUATIONS,  # noqa: F401
+    PUNCTUATION_CHARS,
+    SENTENCE_END_PATTERN,
+    iter_complete_word_ends,
+    ends_with_abbreviation,
+    ends_with_end_punctuation,
+)
 
 # Set of languages directly supported by pysbd
 SUPPORTED_LANGUAGES = {
@@ -73,6 +49,51 @@ SUPPORTED_LANGUAGES = {
 }
 
 
+# Minimum probability and text length for a detection to be trusted for a
+# whole stream. Shorter texts are too ambiguous for langdetect.
+LANGUAGE_CONFIDENCE_THRESHOLD = 0.9
+MIN_LANGUAGE_DETECTION_LENGTH = 20
+MAX_LANGUAGE_DETECTION_LENGTH = 500
+
+
+@lru_cache(maxsize=None)
+def get_segmenter(language: str) -> pysbd.Segmenter:
+    """
+    Get a pysbd segmenter for a language, built once and reused.
+
+    Args:
+        language: pysbd language code
+
+    Returns:
+        pysbd.Segmenter: Segmenter for the language
+    """
+    return pysbd.Segmenter(language=language, clean=False)
+
+
+def detect_language_confident(text: str) -> Tuple[Optional[str], bool]:
+    """
+    Detect text language and report whether the detection is confident.
+
+    Args:
+        text: Text to detect the language of
+
+    Returns:
+        Tuple[Optional[str], bool]: (pysbd-supported language or None,
+            whether the detection is confident enough to reuse)
+    """
+    if len(text.strip()) < MIN_LANGUAGE_DETECTION_LENGTH:
+        return detect_language(text), False
+
+    try:
+        best = detect_langs(text)[0]
+    except Exception as e:
+        logger.debug(f"Language detection failed, language not supported by pysdb: {e}")
+        return None, False
+
+    language = best.lang if best.lang in SUPPORTED_LANGUAGES else None
+    return language, best.prob >= LANGUAGE_CONFIDENCE_THRESHOLD
+
+
 def detect_language(text: str) -> str:
     """
     Detect text language and check if it's supported by pysbd.
@@ -100,10 +121,10 @@ def is_complete_sentence(text: str) -> bool:
     if not text:
         return False
 
-    if any(text.endswith(abbrev) for abbrev in ABBREVIATIONS):
+    if ends_with_abbreviation(text):
         return False
 
-    return any(text.endswith(punct) for punct in END_PUNCTUATIONS)
+    return ends_with_end_punctuation(text)
 
 
 def contains_comma(text: str) -> bool:
@@ -116,7 +137,7 @@ def contains_comma(text: str) -> bool:
     Returns:
         bool: Whether the text contains a comma
     """
-    return any(comma in text for comma in COMMAS)
+    return not COMMA_CHARS.isdisjoint(text)
 
 
 def comma_splitter(text: str) -> Tuple[str, str]:
@@ -151,10 +172,7 @@ def has_punctuation(text: str) -> bool:
     Returns:
         bool: Whether the text is a punctuation mark
     """
-    for punct in COMMAS + END_PUNCTUATIONS:
-        if punct in text:
-            return True
-    return False
+    return not PUNCTUATION_CHARS.isdisjoint(text)
 
 
 def contains_end_punctuation(text: str) -> bool:
@@ -167,7 +185,7 @@ def contains_end_punctuation(text: str) -> bool:
     Returns:
         bool: Whether the text contains ending punctuation
     """
-    return any(punct in text for punct in END_PUNCTUATIONS)
+    return not END_PUNCTUATION_CHARS.isdisjoint(text)
 
 
 def segment_text_by_regex(text: str) -> Tuple[List[str], str]:
@@ -187,12 +205,8 @@ def segment_text_by_regex(text: str) -> Tuple[List[str], str]:
     complete_sentences = []
     remaining_text = text.strip()
 
-    # Create pattern for matching sentences ending with any end punctuation
-    escaped_punctuations = [re.escape(p) for p in END_PUNCTUATIONS]
-    pattern = r"(.*?(?:[" + "|".join(escaped_punctuations) + r"]))"
-
     while remaining_text:
-        match = re.search(pattern, remaining_text)
+        match = SENTENCE_END_PATTERN.match(remaining_text)
         if not match:
             break
 
@@ -200,7 +214,7 @@ def segment_text_by_regex(text: str) -> Tuple[List[str], str]:
         potential_sentence = remaining_text[:end_pos].strip()
 
         # Skip if sentence ends with abbreviation
-        if any(potential_sentence.endswith(abbrev) for abbrev in ABBREVIATIONS):
+        if ends_with_abbreviation(potential_sentence):
             remaining_text = remaining_text[end_pos:].lstrip()
             continue
 
@@ -210,13 +224,16 @@ def segment_text_by_regex(text: str) -> Tuple[List[str], str]:
     return complete_sentences, remaining_text
 
 
-def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
+def segment_text_by_pysbd(
+    text: str, language: Optional[str] = None
+) -> Tuple[List[str], str]:
     """
     Segment text into complete sentences and remaining text.
     Uses pysbd for supported languages, falls back to regex for others.
 
     Args:
         text: Text to segment into sentences
+        language: Language of the text. Detected from the text if None.
 
     Returns:
         Tuple[List[str], str]: (list of complete sentences, remaining incomplete text)
@@ -226,11 +243,11 @@ def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
 
     try:
         # Detect language
-        lang = detect_language(text)
+        lang = language if language is not None else detect_language(text)
 
-        if lang is not None:
+        if lang in SUPPORTED_LANGUAGES:
             # Use pysbd for supported languages
-            segmenter = pysbd.Segmenter(language=lang, clean=False)
+            segmenter = get_segmenter(lang)
             sentences = segmenter.segment(text)
 
             if not sentences:
@@ -249,7 +266,8 @@ def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
                 complete_sentences.append(last_sent)
                 remaining = ""
             else:
-                remaining = last_sent
+                # Keep trailing whitespace so the next token isn't glued on
+                remaining = sentences[-1].lstrip()
 
         else:
             # Use regex for unsupported languages
@@ -266,6 +284,102 @@ def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
         return segment_text_by_regex(text)
 
 
+_END_PUNCTUATION_CHARS = "".join(sorted(END_PUNCTUATION_CHARS))
+_COMMA_CHARS = "".join(sorted(COMMA_CHARS))
+
+
+@lru_cache(maxsize=None)
+def _compile_tag_pattern(valid_tags: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile one alternation matching opening, closing and self-closing tags.
+    The named group that matched tells the tag type.
+    """
+    names = "|".join(re.escape(tag) for tag in valid_tags)
+    return re.compile(rf"<(?:/(?P<end>{names})|(?P<self>{names})/|(?P<start>{names}))>")
+
+
+@lru_cache(maxsize=None)
+def _compile_trigger_pattern(valid_tags: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile one alternation matching everything that can complete a unit of
+    output: a tag, sentence-ending punctuation or a comma.
+    """
+    names = "|".join(re.escape(tag) for tag in valid_tags)
+    return re.compile(
+        rf"(?P<tag></?(?:{names})/?>)"
+        rf"|(?P<end>[{re.escape(_END_PUNCTUATION_CHARS)}])"
+        rf"|(?P<comma>[{re.escape(_COMMA_CHARS)}])"
+    )
+
+
+@dataclass
+class ChunkPolicy:
+    """
+    When to cut text that has no sentence-ending punctuation yet, so TTS can
+    start before the sentence is complete. Cuts are made at word boundaries.
+
+    The first chunk is cut after `first_words` words, or once `first_timeout_ms`
+    have passed since the first token. Each emitted chunk multiplies the word
+    limit by `growth`, so later chunks are longer and prosody stays natural;
+    once the limit exceeds `max_words`, only punctuation ends a chunk.
+    A value of 0 disables the word or time trigger.
+    """
+
+    first_words: int = 10
+    first_timeout_ms: int = 800
+    growth: float = 2.0
+    max_words: int = 40
+
+
+@dataclass
+class ChunkingMetrics:
+    """Time to the first chunk of each stream, and how chunks were cut"""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    first_chunk_reasons: Dict[str, int] = field(default_factory=dict)
+    forced_splits: Dict[str, int] = field(default_factory=dict)
+
+    def record_first_chunk(self, latency_ms: float, reason: str) -> None:
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        self.last_ms = latency_ms
+        self.first_chunk_reasons[reason] = self.first_chunk_reasons.get(reason, 0) + 1
+
+    def record_forced_split(self, reason: str) -> None:
+        self.forced_splits[reason] = self.forced_splits.get(reason, 0) + 1
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.avg_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "last_ms": round(self.last_ms, 1),
+            "first_chunk_reasons": dict(self.first_chunk_reasons),
+            "forced_splits": dict(self.forced_splits),
+        }
+
+    def summary(self) -> str:
+        if not self.count:
+            return "no streams yet"
+        return (
+            f"first chunk after {self.last_ms:.0f} ms "
+            f"(avg {self.avg_ms:.0f} ms, max {self.max_ms:.0f} ms over {self.count} streams); "
+            f"first chunks by {self.first_chunk_reasons}, forced splits {self.forced_splits}"
+        )
+
+
+# Shared by every SentenceDivider in the process
+chunking_metrics = ChunkingMetrics()
+
+
 class TagState(Enum):
     """State of a tag in text"""
 
@@ -304,22 +418,59 @@ class SentenceDivider:
         faster_first_response: bool = True,
         segment_method: str = "pysbd",
         valid_tags: List[str] = None,
+        language: Optional[str] = None,
+        chunk_policy: Optional[ChunkPolicy] = None,
     ):
         """
         Initialize the SentenceDivider.
 
         Args:
             faster_first_response: Whether to split first sentence at commas
+                and apply the chunk policy
             segment_method: Method for segmenting sentences
             valid_tags: List of valid tag names to detect
+            language: Language of the stream for pysbd. Detected once per
+                stream if None.
+            chunk_policy: When to cut text without punctuation at a word
+                boundary. Text is only cut at punctuation if None.
         """
         self.faster_first_response = faster_first_response
+        self.chunk_policy = chunk_policy if faster_first_response else None
         self.segment_method = segment_method
         self.valid_tags = valid_tags or ["think"]
+        self.language = language
         self._is_first_sentence = True
         self._buffer = ""
         # Replace active_tags dict with a stack to handle nesting
         self._tag_stack = []
+        # Language detected for the current stream, once detection is confident
+        self._stream_language: Optional[str] = None
+        self._stream_language_known = False
+        self._full_response = []
+        # Compiled matchers and scan cursor for incremental token processing
+        self._tag_pattern = _compile_tag_pattern(tuple(self.valid_tags))
+        self._trigger_pattern = _compile_trigger_pattern(tuple(self.valid_tags))
+        # Longest tag minus one: a tag split across tokens can start this far back
+        self._tag_lookback = max(len(f"</{tag}>") for tag in self.valid_tags) - 1
+        self._tag_texts = tuple(
+            text
+            for tag in self.valid_tags
+            for text in (f"<{tag}>", f"</{tag}>", f"<{tag}/>")
+        )
+        self._scan_pos = 0
+        # Complete words in the buffer, counted as tokens arrive: where the
+        # next scan starts, the count, and the end of the last word and of
+        # the word that reaches the chunk word limit
+        self._word_scan_pos = 0
+        self._word_count = 0
+        self._last_word_end: Optional[int] = None
+        self._limit_word_end: Optional[int] = None
+        # Chunk policy state for the current stream
+        self._chunk_word_limit: Optional[int] = None
+        self._first_token_time: Optional[float] = None
+        self._first_chunk_sent = False
+        self._split_reason = "punctuation"
+        self._reset_chunk_state()
 
     def _get_current_tags(self) -> List[TagInfo]:
         """
@@ -351,44 +502,19 @@ class SentenceDivider:
             Tuple of (TagInfo if tag found else None, remaining text)
         """
         # Find the first occurrence of any tag
-        first_tag = None
-        first_pos = len(text)
-        tag_type = None
-        matched_tag = None
-
-        # Check for self-closing tags
-        for tag in self.valid_tags:
-            pattern = f"<{tag}/>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.SELF_CLOSING
-                matched_tag = tag
-
-        # Check for opening tags
-        for tag in self.valid_tags:
-            pattern = f"<{tag}>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.START
-                matched_tag = tag
-
-        # Check for closing tags
-        for tag in self.valid_tags:
-            pattern = f"</{tag}>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.END
-                matched_tag = tag
-
+        first_tag = self._tag_pattern.search(text)
         if not first_tag:
             return None, text
 
+        # The named group that matched tells the tag type
+        matched_tag = first_tag.group(first_tag.lastgroup)
+        if first_tag.lastgroup == "start":
+            tag_type = TagState.START
+        elif first_tag.lastgroup == "end":
+            tag_type = TagState.END
+        else:
+            tag_type = TagState.SELF_CLOSING
+
         # Handle the found tag
         if tag_type == TagState.START:
             # Push new tag onto stack
@@ -414,13 +540,8 @@ class SentenceDivider:
 
         while self._buffer.strip():
             # Find the next tag position
-            next_tag_pos = len(self._buffer)
-            for tag in self.valid_tags:
-                patterns = [f"<{tag}>", f"</{tag}>", f"<{tag}/>"]
-                for pattern in patterns:
-                    pos = self._buffer.find(pattern)
-                    if pos != -1 and pos < next_tag_pos:
-                        next_tag_pos = pos
+            tag_match = self._tag_pattern.search(self._buffer)
+            next_tag_pos = tag_match.start() if tag_match else len(self._buffer)
 
             if next_tag_pos == 0:
                 # Tag is at the start of buffer
@@ -496,6 +617,7 @@ class SentenceDivider:
                 and contains_comma(self._buffer)
             ):
                 sentence, remaining = comma_splitter(self._buffer)
+                self._split_reason = "comma"
                 if sentence.strip():
                     result.append(
                         SentenceWithTags(
@@ -512,6 +634,7 @@ class SentenceDivider:
                 sentences, remaining = self._segment_text(self._buffer)
                 self._buffer = remaining
                 self._is_first_sentence = False
+                self._split_reason = "punctuation"
                 for sentence in sentences:
                     if sentence.strip():
                         result.append(
@@ -520,6 +643,24 @@ class SentenceDivider:
                                 tags=current_tags or [TagInfo("", TagState.NONE)],
                             )
                         )
+
+            # Cut a long clause at a word boundary so TTS can start early.
+            # The buffer may have been cut above, so count its words afresh.
+            self._reset_word_scan()
+            split_at, reason = self._forced_split_position()
+            if split_at is not None:
+                chunk = self._buffer[:split_at]
+                self._buffer = self._buffer[split_at:].lstrip()
+                self._is_first_sentence = False
+                self._split_reason = reason
+                chunking_metrics.record_forced_split(reason)
+                logger.debug(f"Cut chunk after {reason}: '{chunk.strip()}'")
+                result.append(
+                    SentenceWithTags(
+                        text=chunk.strip(),
+                        tags=current_tags or [TagInfo("", TagState.NONE)],
+                    )
+                )
             break
 
         return result
@@ -536,21 +677,27 @@ class SentenceDivider:
             SentenceWithTags: Complete sentences with their tag information
         """
         self._full_response = []
+        self._reset_chunk_state()
 
         async for segment in segment_stream:
+            if self._first_token_time is None:
+                self._first_token_time = time.perf_counter()
             self._buffer += segment
             self._full_response.append(segment)
 
-            # Process buffer after punctuation, when buffer gets too long,
-            # or when we see a tag
-            should_process = any(
-                re.search(f"{tag}(?:/)?>", self._buffer) for tag in self.valid_tags
-            ) or has_punctuation(self._buffer)
-
-            if should_process:
+            # Process buffer after punctuation, when we see a tag, or when the
+            # chunk policy cuts the text. Only the newly appended text is scanned.
+            triggered = self._scan_for_trigger()
+            if triggered or self._forced_split_position()[0] is not None:
                 sentences = await self._process_buffer()
                 for sentence in sentences:
+                    self._on_chunk(sentence)
                     yield sentence
+                # Whatever is left in the buffer has been inspected
+                self._scan_pos = len(self._buffer)
+                self._reset_word_scan()
+
+        self._split_reason = "end"
 
         # Process remaining text at end of stream
         if self._buffer.strip():
@@ -568,15 +715,131 @@ class SentenceDivider:
 
                 for sentence in sentences:
                     if sentence.strip():
-                        yield SentenceWithTags(
+                        final = SentenceWithTags(
                             text=sentence.strip(),
                             tags=current_tags or [TagInfo("", TagState.NONE)],
                         )
+                        self._on_chunk(final)
+                        yield final
             if remaining.strip():
-                yield SentenceWithTags(
+                final = SentenceWithTags(
                     text=remaining.strip(),
                     tags=current_tags or [TagInfo("", TagState.NONE)],
                 )
+                self._on_chunk(final)
+                yield final
+
+    def _reset_chunk_state(self) -> None:
+        """Reset the chunk policy for a new stream"""
+        policy = self.chunk_policy
+        self._chunk_word_limit = (
+            policy.first_words if policy and policy.first_words > 0 else None
+        )
+        self._first_token_time = None
+        self._first_chunk_sent = False
+        self._split_reason = "punctuation"
+        self._reset_word_scan()
+
+    def _reset_word_scan(self) -> None:
+        """Forget the counted words after the buffer was cut; the next check rescans it"""
+        self._word_scan_pos = 0
+        self._word_count = 0
+        self._last_word_end = None
+        self._limit_word_end = None
+
+    def _scan_words(self) -> None:
+        """Count the complete words appended to the buffer since the last scan"""
+        for end in iter_complete_word_ends(self._buffer, self._word_scan_pos):
+            self._word_count += 1
+            self._last_word_end = end
+            if self._word_count == self._chunk_word_limit:
+                self._limit_word_end = end
+            self._word_scan_pos = end
+
+    def _ends_in_partial_tag(self) -> bool:
+        """Whether the buffer ends with the start of a tag still streaming in"""
+        start = self._buffer.rfind("<", max(0, len(self._buffer) - self._tag_lookback))
+        if start == -1:
+            return False
+        partial = self._buffer[start:]
+        return any(text.startswith(partial) for text in self._tag_texts)
+
+    def _forced_split_position(self) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Check whether the chunk policy cuts the buffer now.
+
+        Returns:
+            Tuple[Optional[int], Optional[str]]: Offset to cut the buffer at and
+            the reason ("words" or "timeout"), or (None, None)
+        """
+        policy = self.chunk_policy
+        if policy is None:
+            return None, None
+        timeout_pending = (
+            not self._first_chunk_sent
+            and policy.first_timeout_ms > 0
+            and self._first_token_time is not None
+        )
+        if self._chunk_word_limit is None and not timeout_pending:
+            return None, None
+        # Complete tags are handled by _process_buffer; wait for a partial one
+        if self._ends_in_partial_tag():
+            return None, None
+
+        self._scan_words()
+        if self._limit_word_end is not None:
+            return self._limit_word_end, "words"
+        if timeout_pending and self._last_word_end is not None:
+            elapsed_ms = (time.perf_counter() - self._first_token_time) * 1000
+            if elapsed_ms >= policy.first_timeout_ms:
+                return self._last_word_end, "timeout"
+        return None, None
+
+    def _on_chunk(self, sentence: SentenceWithTags) -> None:
+        """Record the first text chunk and grow the word limit for the next one"""
+        if not sentence.text or sentence.tags[0].state in (
+            TagState.START,
+            TagState.END,
+            TagState.SELF_CLOSING,
+        ):
+            return
+
+        if not self._first_chunk_sent:
+            self._first_chunk_sent = True
+            if self._first_token_time is not None:
+                latency_ms = (time.perf_counter() - self._first_token_time) * 1000
+                chunking_metrics.record_first_chunk(latency_ms, self._split_reason)
+                logger.debug(
+                    f"First chunk after {latency_ms:.0f} ms ({self._split_reason})"
+                )
+
+        policy = self.chunk_policy
+        if policy is not None and self._chunk_word_limit is not None:
+            grown = math.ceil(self._chunk_word_limit * policy.growth)
+            self._chunk_word_limit = grown if grown <= policy.max_words else None
+
+    def _scan_for_trigger(self) -> bool:
+        """
+        Scan the text appended since the last call for a tag, sentence-ending
+        punctuation, or (while the first sentence can still be split early)
+        a comma.
+
+        Returns:
+            bool: Whether the buffer should be processed
+        """
+        # Step back far enough to catch a tag split across tokens, but only
+        # count matches that end in the new text
+        start = max(0, self._scan_pos - self._tag_lookback)
+        scan_pos = self._scan_pos
+        self._scan_pos = len(self._buffer)
+
+        split_on_comma = self._is_first_sentence and self.faster_first_response
+        for match in self._trigger_pattern.finditer(self._buffer, start):
+            if match.end() <= scan_pos:
+                continue
+            if match.lastgroup != "comma" or split_on_comma:
+                return True
+        return False
 
     @property
     def complete_response(self) -> str:
@@ -587,10 +850,38 @@ class SentenceDivider:
         """Segment text using the configured method"""
         if self.segment_method == "regex":
             return segment_text_by_regex(text)
-        return segment_text_by_pysbd(text)
+
+        language = self._get_stream_language(text)
+        if language is None:
+            # Unsupported by pysbd
+            return segment_text_by_regex(text)
+        return segment_text_by_pysbd(text, language=language)
+
+    def _get_stream_language(self, text: str) -> Optional[str]:
+        """
+        Get the language of the stream. Uses the configured language if set,
+        otherwise detects it and keeps the first confident detection.
+        """
+        if self.language:
+            return self.language
+        if self._stream_language_known:
+            return self._stream_language
+
+        # The response so far is a better sample than the current buffer
+        detection_text = self.complete_response[:MAX_LANGUAGE_DETECTION_LENGTH] or text
+        language, confident = detect_language_confident(detection_text)
+        if confident:
+            self._stream_language = language
+            self._stream_language_known = True
+            logger.debug(f"Stream language detected: {language}")
+        return language
 
     def reset(self):
         """Reset the divider state for a new conversation"""
         self._is_first_sentence = True
         self._buffer = ""
         self._tag_stack = []
+        self._scan_pos = 0
+        self._stream_language = None
+        self._stream_language_known = False
+        self._reset_chunk_state()
@@ -0,0 +1,253 @@
+"""
+Shared text rules for the sentence and TTS pipeline.
+
+Punctuation tables, abbreviation lookups and regular expressions used on
+every streamed sentence live here, built once at import time, so the hot
+paths never rebuild a pattern or scan a list per call.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, Iterator, Tuple
+
+COMMAS: Tuple[str, ...] = (
+    ",",
+    "،",
+    "，",
+    "、",
+    "፣",
+    "၊",
+    ";",
+    "΄",
+    "‛",
+    "।",
+    "﹐",
+    "꓾",
+    "⹁",
+    "︐",
+    "﹑",
+    "､",
+)
+
+END_PUNCTUATIONS: Tuple[str, ...] = (".", "!", "?", "。", "！", "？", "...", "。。。")
+
+ABBREVIATIONS: Tuple[str, ...] = (
+    "Mr.",
+    "Mrs.",
+    "Dr.",
+    "Prof.",
+    "Inc.",
+    "Ltd.",
+    "Jr.",
+    "Sr.",
+    "e.g.",
+    "i.e.",
+    "vs.",
+    "St.",
+    "Rd.",
+)
+
+# Emotion tags the display layer strips from subtitles
+EMOTION_TAGS: Tuple[str, ...] = (
+    "neutral",
+    "joy",
+    "sadness",
+    "anger",
+    "surprise",
+    "fear",
+    "disgust",
+    "smirk",
+)
+
+# Motion tags Agent-Zero emits next to emotion tags, e.g. {wave}
+MOTION_TAGS: Tuple[str, ...] = (
+    "nod",
+    "wave",
+    "angry",
+    "sad",
+    "surprised",
+    "sneeze",
+)
+
+# Single characters; multi-char END_PUNCTUATIONS such as "..." are built
+# from these, so membership tests only need the characters
+COMMA_CHARS: FrozenSet[str] = frozenset(COMMAS)
+END_PUNCTUATION_CHARS: FrozenSet[str] = frozenset(p[-1] for p in END_PUNCTUATIONS)
+PUNCTUATION_CHARS: FrozenSet[str] = COMMA_CHARS | END_PUNCTUATION_CHARS
+
+
+def _build_suffix_table(words: Tuple[str, ...]) -> Dict[str, FrozenSet[str]]:
+    """Index words by their last character for suffix lookups"""
+    table: Dict[str, set] = {}
+    for word in words:
+        table.setdefault(word[-1], set()).add(word)
+    return {last: frozenset(group) for last, group in table.items()}
+
+
+_ABBREVIATION_SUFFIXES = _build_suffix_table(ABBREVIATIONS)
+_ABBREVIATION_LENGTHS: Tuple[int, ...] = tuple(
+    sorted({len(abbrev) for abbrev in ABBREVIATIONS})
+)
+
+# A run of characters up to and including sentence-ending punctuation
+SENTENCE_END_PATTERN = re.compile(
+    "(.*?[" + re.escape("".join(sorted(END_PUNCTUATION_CHARS))) + "])",
+    re.DOTALL,
+)
+
+# Text made of nothing but whitespace, punctuation and quotes has nothing to
+# synthesize
+NON_SPEECH_PATTERN = re.compile(r'[\s.,!?，。！？\'"』」）】]+')
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Scripts written without spaces; each character counts as a word
+_CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+CJK_CHAR_PATTERN = re.compile(f"[{_CJK_RANGES}]")
+
+# A word: one CJK character or a run of other non-space characters
+WORD_PATTERN = re.compile(f"[{_CJK_RANGES}]|[^\\s{_CJK_RANGES}]+")
+
+# Emotion or motion tags in any case, e.g. [joy] or {wave}
+ACTION_TAG_PATTERN = re.compile(
+    r"\[(?:"
+    + "|".join(re.escape(t) for t in EMOTION_TAGS)
+    + r")\]|\{(?:"
+    + "|".join(re.escape(t) for t in MOTION_TAGS)
+    + r")\}",
+    re.IGNORECASE,
+)
+
+
+def trie_alternation(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation with shared prefixes factored out, e.g.
+    ["sad", "sadness", "scared"] -> "s(?:ad(?:ness)?|cared)". The regex engine
+    then decides at the first differing character instead of retrying every
+    word at every position.
+
+    Args:
+        words: Literal words to match
+
+    Returns:
+        str: Regex source matching any of the words, longest match first
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        optional = "" in node
+        leaves = sorted(c for c, child in node.items() if c and list(child) == [""])
+        branches = [
+            re.escape(c) + build(child)
+            for c, child in sorted(node.items())
+            if c and list(child) != [""]
+        ]
+        if len(leaves) == 1:
+            branches.append(re.escape(leaves[0]))
+        elif leaves:
+            branches.append("[" + "".join(re.escape(c) for c in leaves) + "]")
+        if not branches:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if optional else body
+
+    return build(trie)
+
+
+def ends_with_abbreviation(text: str) -> bool:
+    """
+    Check if text ends with a known abbreviation such as "Dr.".
+
+    Args:
+        text: Text to check
+
+    Returns:
+        bool: Whether the text ends with an abbreviation
+    """
+    if not text:
+        return False
+    candidates = _ABBREVIATION_SUFFIXES.get(text[-1])
+    if not candidates:
+        return False
+    return any(text[-length:] in candidates for length in _ABBREVIATION_LENGTHS)
+
+
+def ends_with_end_punctuation(text: str) -> bool:
+    """
+    Check if text ends with sentence-ending punctuation.
+
+    Args:
+        text: Text to check
+
+    Returns:
+        bool: Whether the text ends with ending punctuation
+    """
+    return bool(text) and text[-1] in END_PUNCTUATION_CHARS
+
+
+def is_non_speech(text: str) -> bool:
+    """
+    Check if text has nothing for TTS to say (only whitespace and punctuation).
+
+    Args:
+        text: Text to check
+
+    Returns:
+        bool: Whether the text is empty for TTS purposes
+    """
+    return not text or NON_SPEECH_PATTERN.fullmatch(text) is not None
+
+
+def collapse_whitespace(text: str) -> str:
+    """
+    Collapse runs of whitespace into single spaces and strip the ends.
+
+    Args:
+        text: Text to clean
+
+    Returns:
+        str: The cleaned text
+    """
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def strip_action_tags(text: str) -> str:
+    """
+    Remove bracketed emotion tags like [joy] and motion tags like {wave} from text.
+
+    Args:
+        text: Text to clean
+
+    Returns:
+        str: Text without emotion or motion tags
+    """
+    if "[" not in text and "{" not in text:
+        return text
+    return ACTION_TAG_PATTERN.sub("", text)
+
+
+def iter_complete_word_ends(text: str, start: int = 0) -> Iterator[int]:
+    """
+    Find the end offsets of the words in text that are known to be complete.
+    A trailing word without whitespace after it may still be streaming, so it
+    only counts if it is a CJK character.
+
+    Args:
+        text: Text to scan
+        start: Offset to scan from, e.g. the end of the last complete word
+            found before more text was appended
+
+    Yields:
+        int: End offset of each complete word, in order
+    """
+    length = len(text)
+    for match in WORD_PATTERN.finditer(text, start):
+        if match.end() == length and not CJK_CHAR_PATTERN.fullmatch(match.group()):
+            return
+        yield match.end()
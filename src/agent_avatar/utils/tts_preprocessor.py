@@ -1,7 +1,10 @@
 import re
 import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 from loguru import logger
 from ..translate.translate_interface import TranslateInterface
+from .text_rules import collapse_whitespace
 
 
 def tts_filter(
@@ -30,33 +33,20 @@ def tts_filter(
     Returns:
         str: The filtered text.
     """
-    if ignore_asterisks:
-        try:
-            text = filter_asterisks(text)
-        except Exception as e:
-            logger.warning(f"Error ignoring asterisks: {e}")
-            logger.warning(f"Text: {text}")
-            logger.warning("Skipping...")
-
-    if ignore_brackets:
-        try:
-            text = filter_brackets(text)
-        except Exception as e:
-            logger.warning(f"Error ignoring brackets: {e}")
-            logger.warning(f"Text: {text}")
-            logger.warning("Skipping...")
-    if ignore_parentheses:
-        try:
-            text = filter_parentheses(text)
-        except Exception as e:
-            logger.warning(f"Error ignoring parentheses: {e}")
-            logger.warning(f"Text: {text}")
-            logger.warning("Skipping...")
-    if ignore_angle_brackets:
+    pairs = tuple(
+        pair
+        for pair, enabled in (
+            (("[", "]"), ignore_brackets),
+            (("(", ")"), ignore_parentheses),
+            (("<", ">"), ignore_angle_brackets),
+        )
+        if enabled
+    )
+    if pairs or ignore_asterisks:
         try:
-            text = filter_angle_brackets(text)
+            text = _filter_enclosed(text, pairs, ignore_asterisks)
         except Exception as e:
-            logger.warning(f"Error ignoring angle brackets: {e}")
+            logger.warning(f"Error ignoring enclosed text: {e}")
             logger.warning(f"Text: {text}")
             logger.warning("Skipping...")
     if remove_special_char:
@@ -80,6 +70,18 @@ def tts_filter(
     return text
 
 
+def _is_speakable_char(char: str) -> bool:
+    """Letters, numbers, punctuation and whitespace are kept for TTS."""
+    category = unicodedata.category(char)
+    return category[0] in "LNP" or char.isspace()
+
+
+# ASCII is unchanged by NFKC, so the special characters to drop are fixed
+_ASCII_SPECIAL_CHARS = {
+    code: None for code in range(128) if not _is_speakable_char(chr(code))
+}
+
+
 def remove_special_characters(text: str) -> str:
     """
     Filter text to remove all non-letter, non-number, and non-punctuation characters.
@@ -90,19 +92,118 @@ def remove_special_characters(text: str) -> str:
     Returns:
         str: The filtered text.
     """
+    if text.isascii():
+        return text.translate(_ASCII_SPECIAL_CHARS)
+
     normalized_text = unicodedata.normalize("NFKC", text)
+    # Classify each distinct character once instead of every occurrence
+    special_chars = {
+        ord(char): None for char in set(normalized_text) if not _is_speakable_char(char)
+    }
+    if not special_chars:
+        return normalized_text
+    return normalized_text.translate(special_chars)
+
+
+@lru_cache(maxsize=None)
+def _compile_enclosed_pattern(
+    pairs: Tuple[Tuple[str, str], ...], ignore_asterisks: bool
+) -> Tuple[re.Pattern, Dict[str, Tuple[int, bool]]]:
+    """
+    Compile a character class matching every symbol the enabled filters react to,
+    and map each bracket to its (layer, is_opening) role.
+    """
+    roles: Dict[str, Tuple[int, bool]] = {}
+    for layer, (left, right) in enumerate(pairs):
+        roles[left] = (layer, True)
+        roles[right] = (layer, False)
+    symbols = "".join(roles) + ("*" if ignore_asterisks else "")
+    return re.compile("[" + re.escape(symbols) + "]"), roles
 
-    def is_valid_char(char: str) -> bool:
-        category = unicodedata.category(char)
-        return (
-            category.startswith("L")
-            or category.startswith("N")
-            or category.startswith("P")
-            or char.isspace()
-        )
 
-    filtered_text = "".join(char for char in normalized_text if is_valid_char(char))
-    return filtered_text
+def _asterisk_span_end(text: str, start: int) -> Optional[int]:
+    """
+    Return where the asterisk-enclosed span starting at `start` ends, or None if the
+    asterisk is kept. Matches `\*+[^*\n]*?\*+`: a run of asterisks closed by the next
+    run on the same line, or a bare run of two or more asterisks.
+    """
+    run_end = start + 1
+    while run_end < len(text) and text[run_end] == "*":
+        run_end += 1
+
+    closing = text.find("*", run_end)
+    newline = text.find("\n", run_end, closing if closing != -1 else len(text))
+    if closing != -1 and newline == -1:
+        closing_end = closing + 1
+        while closing_end < len(text) and text[closing_end] == "*":
+            closing_end += 1
+        return closing_end
+    if run_end - start >= 2:
+        return run_end
+    return None
+
+
+def _filter_enclosed(
+    text: str, pairs: Tuple[Tuple[str, str], ...], ignore_asterisks: bool
+) -> str:
+    """
+    Remove asterisk-enclosed text and text within the given bracket pairs (nested
+    cases included) in one traversal, then collapse whitespace.
+
+    The result is the same as applying filter_asterisks and then `_filter_nested`
+    once per pair, in order: asterisk spans are removed before brackets are
+    counted, and a bracket inside an earlier pair is removed with its content
+    without affecting the depth of its own pair.
+
+    Args:
+        text (str): The text to filter.
+        pairs (Tuple[Tuple[str, str], ...]): The (left, right) symbols to filter.
+        ignore_asterisks (bool): Whether to remove asterisk-enclosed text.
+
+    Returns:
+        str: The filtered text.
+    """
+    if not isinstance(text, str):
+        raise TypeError("Input must be a string")
+
+    pattern, roles = _compile_enclosed_pattern(pairs, ignore_asterisks)
+    if pattern.search(text) is None:
+        return collapse_whitespace(text)
+
+    result = []
+    depths = [0] * len(pairs)
+    position = 0
+    while True:
+        match = pattern.search(text, position)
+        if match is None:
+            break
+        index = match.start()
+        outside = not any(depths)
+        if outside:
+            result.append(text[position:index])
+        char = text[index]
+        position = index + 1
+
+        if char == "*" and ignore_asterisks:
+            span_end = _asterisk_span_end(text, index)
+            if span_end is not None:
+                position = span_end
+            elif outside:
+                result.append(char)
+            continue
+
+        layer, opening = roles[char]
+        # Earlier pairs have already removed anything they enclose
+        if any(depths[:layer]):
+            continue
+        if opening:
+            depths[layer] += 1
+        elif depths[layer] > 0:
+            depths[layer] -= 1
+
+    if not any(depths):
+        result.append(text[position:])
+    return collapse_whitespace("".join(result))
 
 
 def _filter_nested(text: str, left: str, right: str) -> str:
@@ -121,21 +222,7 @@ def _filter_nested(text: str, left: str, right: str) -> str:
         raise TypeError("Input must be a string")
     if not text:
         return text
-
-    result = []
-    depth = 0
-    for char in text:
-        if char == left:
-            depth += 1
-        elif char == right:
-            if depth > 0:
-                depth -= 1
-        else:
-            if depth == 0:
-                result.append(char)
-    filtered_text = "".join(result)
-    filtered_text = re.sub(r"\s+", " ", filtered_text).strip()
-    return filtered_text
+    return _filter_enclosed(text, ((left, right),), False)
 
 
 def filter_brackets(text: str) -> str:
@@ -188,9 +275,4 @@ def filter_asterisks(text: str) -> str:
         The string with asterisk-enclosed text removed.
     """
     # Handle asterisks of any length (*, **, ***, etc.)
-    filtered_text = re.sub(r"\*{1,}((?!\*).)*?\*{1,}", "", text)
-
-    # Clean up any extra spaces
-    filtered_text = re.sub(r"\s+", " ", filtered_text).strip()
-
-    return filtered_text
+    return _filter_enclosed(text, (), True)
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Callable, TypedDict
+from typing import Dict, List, Optional, Callable, Set, Tuple, TypedDict
 from fastapi import WebSocket, WebSocketDisconnect
 import asyncio
 import json
@@ -16,10 +16,14 @@ from .chat_group import (
 from .message_handler import message_handler
 from .utils.stream_audio import prepare_audio_payload
 from .chat_history_manager import (
-    create_new_history,
-    get_history,
-    delete_history,
-    get_history_list,
+    async_create_new_history,
+    async_delete_history,
+    async_flush_history,
+    async_get_history,
+    async_get_history_list,
+    async_get_history_page,
+    HistoryPage,
+    page_cursor,
 )
 from .config_manager.utils import scan_config_alts_directory, scan_bg_directory
 from .conversations.conversation_handler import (
@@ -29,6 +33,44 @@ from .conversations.conversation_handler import (
 )
 from .agent_zero_client import get_agent_zero_client
 
+# Prefixes external integrations put in front of a history_uid
+# (Agent-Zero context ids are "avatar_<history_uid>", stream routes use "vtube_")
+EXTERNAL_HISTORY_PREFIXES = ("avatar_", "vtube_")
+
+
+def normalize_history_uid(history_uid: str) -> str:
+    """Strip external integration prefixes from a history_uid or context id"""
+    for prefix in EXTERNAL_HISTORY_PREFIXES:
+        if history_uid.startswith(prefix):
+            return history_uid[len(prefix) :]
+    return history_uid
+
+
+# Messages per history page when the client does not ask for a size
+HISTORY_PAGE_SIZE = 50
+MAX_HISTORY_PAGE_SIZE = 500
+
+
+def _page_limit(data: dict) -> int:
+    """Page size requested by a client, clamped to a sane range"""
+    try:
+        limit = int(data.get("limit") or HISTORY_PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = HISTORY_PAGE_SIZE
+    return min(max(limit, 1), MAX_HISTORY_PAGE_SIZE)
+
+
+def _page_payload(history_uid: str, page: HistoryPage) -> dict:
+    """Fields describing a history page, shared by the history responses"""
+    return {
+        "history_uid": history_uid,
+        "messages": [msg for msg in page["messages"] if msg["role"] != "system"],
+        "has_more": page["offset"] > 0,
+        # Send back as "before" to get the page preceding this one
+        "cursor": page_cursor(page),
+        "total": page["total"],
+    }
+
 
 class MessageType(Enum):
     """Enum for WebSocket message types"""
@@ -37,6 +79,7 @@ class MessageType(Enum):
     HISTORY = [
         "fetch-history-list",
         "fetch-and-set-history",
+        "fetch-history-page",
         "create-new-history",
         "delete-history",
     ]
@@ -55,6 +98,8 @@ class WSMessage(TypedDict, total=False):
     audio: Optional[List[float]]
     images: Optional[List[str]]
     history_uid: Optional[str]
+    before: Optional[str]
+    limit: Optional[int]
     file: Optional[str]
     display_text: Optional[dict]
 
@@ -70,6 +115,9 @@ class WebSocketHandler:
         self.current_conversation_tasks: Dict[str, Optional[asyncio.Task]] = {}
         self.default_context_cache = default_context_cache
         self.received_data_buffers: Dict[str, np.ndarray] = {}
+        # history_uid -> uids of the clients currently on that history
+        self.history_clients: Dict[str, Set[str]] = {}
+        self.client_history_map: Dict[str, str] = {}  # client_uid -> history_uid
 
         # Message handlers mapping
         self._message_handlers = self._init_message_handlers()
@@ -82,6 +130,7 @@ class WebSocketHandler:
             "request-group-info": self._handle_group_info,
             "fetch-history-list": self._handle_history_list_request,
             "fetch-and-set-history": self._handle_fetch_history,
+            "fetch-history-page": self._handle_fetch_history_page,
             "create-new-history": self._handle_create_history,
             "delete-history": self._handle_delete_history,
             "interrupt-signal": self._handle_interrupt,
@@ -143,6 +192,79 @@ class WebSocketHandler:
         self.chat_group_manager.client_group_map[client_uid] = ""
         await self.send_group_update(websocket, client_uid)
 
+    def _bind_client_history(self, client_uid: str, history_uid: str) -> None:
+        """Record that a client is now on the given history"""
+        self._unbind_client_history(client_uid)
+        if not history_uid:
+            return
+        self.client_history_map[client_uid] = history_uid
+        self.history_clients.setdefault(history_uid, set()).add(client_uid)
+
+    def _unbind_client_history(self, client_uid: str) -> None:
+        """Remove a client from the history index"""
+        history_uid = self.client_history_map.pop(client_uid, None)
+        if history_uid is None:
+            return
+        clients = self.history_clients.get(history_uid)
+        if clients is not None:
+            clients.discard(client_uid)
+            if not clients:
+                del self.history_clients[history_uid]
+
+    def get_history_clients(self, history_uid: str) -> List[Tuple[str, WebSocket]]:
+        """
+        Get the connected clients currently on a history.
+
+        Args:
+            history_uid: History UID, optionally with an external prefix
+                (e.g. an Agent-Zero context id "avatar_<history_uid>")
+
+        Returns:
+            List[Tuple[str, WebSocket]]: (client_uid, websocket) pairs
+        """
+        client_uids = self.history_clients.get(normalize_history_uid(history_uid), ())
+        return [
+            (client_uid, self.client_connections[client_uid])
+            for client_uid in client_uids
+            if client_uid in self.client_connections
+        ]
+
+    async def send_to_clients(
+        self,
+        clients: List[Tuple[str, WebSocket]],
+        message: str,
+        timeout: float = 5.0,
+    ) -> int:
+        """
+        Send a serialized message to several clients concurrently.
+
+        Each send gets its own timeout so one slow socket does not hold up
+        delivery to the others.
+
+        Args:
+            clients: (client_uid, websocket) pairs to send to
+            message: JSON text to send
+            timeout: Per-client send timeout in seconds
+
+        Returns:
+            int: Number of clients the message was delivered to
+        """
+
+        async def _send(client_uid: str, websocket: WebSocket) -> bool:
+            try:
+                await asyncio.wait_for(websocket.send_text(message), timeout)
+                return True
+            except asyncio.TimeoutError:
+                logger.warning(f"Timed out sending to client {client_uid}")
+            except Exception as e:
+                logger.error(f"Failed to send to client {client_uid}: {e}")
+            return False
+
+        results = await asyncio.gather(
+            *(_send(client_uid, websocket) for client_uid, websocket in clients)
+        )
+        return sum(results)
+
     async def _send_initial_messages(
         self,
         websocket: WebSocket,
@@ -299,6 +421,7 @@ class WebSocketHandler:
         )
 
         # Clean up other client data
+        self._unbind_client_history(client_uid)
         self.client_connections.pop(client_uid, None)
         self.client_contexts.pop(client_uid, None)
         self.received_data_buffers.pop(client_uid, None)
@@ -377,7 +500,7 @@ class WebSocketHandler:
     ) -> None:
         """Handle request for chat history list"""
         context = self.client_contexts[client_uid]
-        histories = get_history_list(context.character_config.conf_uid)
+        histories = await async_get_history_list(context.character_config.conf_uid)
         await websocket.send_text(
             json.dumps({"type": "history-list", "histories": histories})
         )
@@ -393,7 +516,11 @@ class WebSocketHandler:
         context = self.client_contexts[client_uid]
         # Update history_uid in service context
         context.history_uid = history_uid
-        context.agent_engine.set_memory_from_history(
+        self._bind_client_history(client_uid, history_uid)
+        # Memory is loaded from disk: wait for queued writes, read off the loop
+        await async_flush_history(context.character_config.conf_uid, history_uid)
+        await asyncio.to_thread(
+            context.agent_engine.set_memory_from_history,
             conf_uid=context.character_config.conf_uid,
             history_uid=history_uid,
         )
@@ -404,9 +531,24 @@ class WebSocketHandler:
             agent_zero_client.set_context_from_history(history_uid)
             logger.info(f"Agent-Zero context synced to history: {history_uid}")
 
+        if data.get("limit"):
+            # Paginated client: send the latest page, older ones are fetched
+            # with fetch-history-page
+            page = await async_get_history_page(
+                context.character_config.conf_uid,
+                history_uid,
+                limit=_page_limit(data),
+            )
+            await websocket.send_text(
+                json.dumps(
+                    {"type": "history-data", **_page_payload(history_uid, page)}
+                )
+            )
+            return
+
         messages = [
             msg
-            for msg in get_history(
+            for msg in await async_get_history(
                 context.character_config.conf_uid,
                 history_uid,
             )
@@ -416,15 +558,43 @@ class WebSocketHandler:
             json.dumps({"type": "history-data", "messages": messages})
         )
 
+    async def _handle_fetch_history_page(
+        self, websocket: WebSocket, client_uid: str, data: WSMessage
+    ) -> None:
+        """
+        Handle fetching one page of a chat history without switching to it.
+
+        The latest page is returned unless `before` holds the cursor of a
+        page already received, in which case the page preceding it is.
+        """
+        context = self.client_contexts[client_uid]
+        history_uid = data.get("history_uid") or context.history_uid
+        if not history_uid:
+            return
+
+        page = await async_get_history_page(
+            context.character_config.conf_uid,
+            history_uid,
+            limit=_page_limit(data),
+            before=data.get("before"),
+        )
+        await websocket.send_text(
+            json.dumps({"type": "history-page", **_page_payload(history_uid, page)})
+        )
+
     async def _handle_create_history(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle creation of new chat history"""
         context = self.client_contexts[client_uid]
-        history_uid = create_new_history(context.character_config.conf_uid)
+        history_uid = await async_create_new_history(
+            context.character_config.conf_uid
+        )
         if history_uid:
             context.history_uid = history_uid
-            context.agent_engine.set_memory_from_history(
+            self._bind_client_history(client_uid, history_uid)
+            await asyncio.to_thread(
+                context.agent_engine.set_memory_from_history,
                 conf_uid=context.character_config.conf_uid,
                 history_uid=history_uid,
             )
@@ -453,7 +623,7 @@ class WebSocketHandler:
             return
 
         context = self.client_contexts[client_uid]
-        success = delete_history(
+        success = await async_delete_history(
             context.character_config.conf_uid,
             history_uid,
         )
@@ -468,6 +638,7 @@ class WebSocketHandler:
         )
         if history_uid == context.history_uid:
             context.history_uid = None
+            self._unbind_client_history(client_uid)
 
     async def _handle_audio_data(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
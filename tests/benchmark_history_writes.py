@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of storing one chat message.
+
+Compares the legacy single-JSON rewrite (with and without the temp file,
+fsync and rename a crash-safe rewrite would need) against the append-only
+JSONL store (path lookup and per-history lock included, next to a raw
+append of the same line without either), the async write queue, and the
+SQLite store. Each history starts with EXISTING messages.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from src.agent_avatar import chat_history_manager  # noqa: E402
+from src.agent_avatar.history_store.jsonl_store import (  # noqa: E402
+    JsonlHistoryStore,
+    append_records,
+)
+from src.agent_avatar.history_store.sqlite_store import (  # noqa: E402
+    SqliteHistoryStore,
+)
+
+EXISTING = 300
+MESSAGES = 200
+
+
+def make_message(i: int) -> dict:
+    return {
+        "role": "human" if i % 2 == 0 else "ai",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "content": f"Message number {i}, about as long as a spoken sentence is.",
+    }
+
+
+def legacy_store(path: str, message: dict, atomic: bool) -> None:
+    with open(path, "r", encoding="utf-8") as f:
+        history = json.load(f)
+    history.append(message)
+    target = f"{path}.tmp" if atomic else path
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+        if atomic:
+            f.flush()
+            os.fsync(f.fileno())
+    if atomic:
+        os.replace(target, path)
+
+
+def per_message_us(func, count: int = MESSAGES) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    logger.remove()
+    existing = [make_message(i) for i in range(EXISTING)]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for atomic in (False, True):
+            path = os.path.join(tmp, f"legacy_{atomic}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(existing, f)
+            label = "legacy rewrite + fsync/rename" if atomic else "legacy rewrite"
+            results.append(
+                (
+                    label,
+                    per_message_us(
+                        lambda i: legacy_store(path, make_message(i), atomic)
+                    ),
+                )
+            )
+
+        store = JsonlHistoryStore(os.path.join(tmp, "jsonl"))
+        raw_path = os.path.join(tmp, "raw.jsonl")
+        append_records(raw_path, existing)
+        results.append(
+            (
+                "raw append (no lookup/lock)",
+                per_message_us(lambda i: append_records(raw_path, [make_message(i)])),
+            )
+        )
+        for sync in (False, True):
+            history_uid = f"h_{sync}"
+            store.create("c", history_uid, {"role": "metadata"})
+            store.append_messages("c", history_uid, existing)
+            label = "jsonl append + fsync" if sync else "jsonl append"
+            results.append(
+                (
+                    label,
+                    per_message_us(
+                        lambda i: store.append_messages(
+                            "c", history_uid, [make_message(i)], sync
+                        )
+                    ),
+                )
+            )
+
+        sqlite = SqliteHistoryStore(os.path.join(tmp, "history.db"))
+        sqlite.append_messages("c", "h", existing)
+        results.append(
+            (
+                "sqlite insert",
+                per_message_us(
+                    lambda i: sqlite.append_messages("c", "h", [make_message(i)])
+                ),
+            )
+        )
+        sqlite.close()
+
+        chat_history_manager.init_history_store(
+            "jsonl", base_dir=os.path.join(tmp, "queued"), cache_messages=0
+        )
+        history_uid = chat_history_manager.create_new_history("c")
+
+        async def queued(wait: bool) -> float:
+            start = time.perf_counter()
+            for i in range(MESSAGES):
+                await chat_history_manager.async_store_message(
+                    "c", history_uid, "human", f"Message {i}", wait=wait
+                )
+            await chat_history_manager.async_flush_history()
+            return (time.perf_counter() - start) / MESSAGES * 1e6
+
+        results.append(("queued, awaiting each write", asyncio.run(queued(True))))
+        results.append(("queued burst (amortized)", asyncio.run(queued(False))))
+
+    baseline = results[0][1]
+    print(f"Per message, history of {EXISTING} messages:")
+    for label, us in results:
+        print(f"  {label:32s} {us:9.1f} us  ({baseline / us:6.1f}x vs legacy)")
+
+
+if __name__ == "__main__":
+    main()
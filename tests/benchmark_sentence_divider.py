@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark sentence segmentation cost per streamed token.
+
+Compares the legacy pysbd path (language detection and a new Segmenter on
+every buffer flush) with the cached path (memoized segmenters and per-stream
+language detection).
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pysbd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from src.agent_avatar.utils.sentence_divider import (  # noqa: E402
+    SentenceDivider,
+    detect_language,
+    is_complete_sentence,
+    segment_text_by_regex,
+)
+
+RESPONSE = (
+    "[joy] Hello there, it is great to see you again! "
+    "Today I looked into the weather for your trip, and it seems the weekend "
+    "will be sunny with a light breeze. Dr. Smith said the museum opens at "
+    "nine, so you could visit in the morning. After that, maybe try the new "
+    "ramen place near the station? I heard the broth is amazing. "
+    "Let me know if you want me to book anything for you. "
+) * 4
+
+ROUNDS = 20
+
+
+class LegacySentenceDivider(SentenceDivider):
+    """SentenceDivider with the uncached segmentation used before"""
+
+    def _segment_text(self, text):
+        if self.segment_method == "regex":
+            return segment_text_by_regex(text)
+        lang = detect_language(text)
+        if lang is None:
+            return segment_text_by_regex(text)
+        sentences = pysbd.Segmenter(language=lang, clean=False).segment(text)
+        if not sentences:
+            return [], text
+        complete = [s.strip() for s in sentences[:-1] if s.strip()]
+        last = sentences[-1].strip()
+        if is_complete_sentence(last):
+            return complete + [last], ""
+        return complete, last
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into word-sized tokens the way an LLM stream would"""
+    return [word + " " for word in text.split(" ") if word]
+
+
+async def run_stream(divider: SentenceDivider, tokens: list[str]) -> int:
+    async def token_stream():
+        for token in tokens:
+            yield token
+
+    count = 0
+    async for _ in divider.process_stream(token_stream()):
+        count += 1
+    return count
+
+
+async def benchmark(divider_cls, tokens: list[str]) -> float:
+    """Return the average segmentation cost per token in microseconds"""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await run_stream(divider_cls(segment_method="pysbd"), tokens)
+    elapsed = time.perf_counter() - start
+    return elapsed / (ROUNDS * len(tokens)) * 1e6
+
+
+async def main():
+    logger.remove()
+    tokens = tokenize(RESPONSE)
+
+    # Warm up the segmenter cache and langdetect profiles
+    await run_stream(SentenceDivider(), tokens)
+
+    before = await benchmark(LegacySentenceDivider, tokens)
+    after = await benchmark(SentenceDivider, tokens)
+
+    print(f"Tokens per stream: {len(tokens)}, rounds: {ROUNDS}")
+    print(f"Before (uncached): {before:8.1f} us/token")
+    print(f"After  (cached):   {after:8.1f} us/token")
+    print(f"Speedup:           {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-sentence text rules.
+
+Compares the legacy inline implementations (patterns rebuilt per call, list
+scans, chained str.replace) with the precompiled rules in text_rules.
+"""
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.agent_avatar.utils.sentence_divider import (  # noqa: E402
+    is_complete_sentence,
+    segment_text_by_regex,
+)
+from src.agent_avatar.utils.text_rules import (  # noqa: E402
+    ABBREVIATIONS,
+    END_PUNCTUATIONS,
+    is_non_speech,
+    strip_action_tags,
+)
+
+SENTENCES = [
+    "[joy] {wave} Hello there, it is great to see you again!",
+    "Dr. Smith said the museum opens at nine.",
+    "After that, maybe try the new ramen place near the station?",
+    "[SADNESS] I heard the broth is amazing",
+    "...",
+    "今天天气很好。我们去公园吧！",
+    "「」",
+]
+TEXT = " ".join(SENTENCES)
+NUMBER = 20000
+
+LEGACY_ACTION_TAGS = [
+    "[neutral]",
+    "[joy]",
+    "[sadness]",
+    "[anger]",
+    "[surprise]",
+    "[fear]",
+    "[disgust]",
+    "[smirk]",
+    "{nod}",
+    "{wave}",
+    "{angry}",
+    "{sad}",
+    "{surprised}",
+    "{sneeze}",
+]
+
+
+def legacy_is_complete_sentence(text: str) -> bool:
+    text = text.strip()
+    if not text:
+        return False
+    if any(text.endswith(abbrev) for abbrev in ABBREVIATIONS):
+        return False
+    return any(text.endswith(punct) for punct in END_PUNCTUATIONS)
+
+
+def legacy_is_non_speech(text: str) -> bool:
+    return len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", text)) == 0
+
+
+def legacy_strip_action_tags(text: str) -> str:
+    for tag in LEGACY_ACTION_TAGS:
+        text = text.replace(tag, "").replace(tag.upper(), "").replace(tag.lower(), "")
+    return text
+
+
+def legacy_segment_text_by_regex(text: str):
+    complete_sentences = []
+    remaining_text = text.strip()
+    escaped_punctuations = [re.escape(p) for p in END_PUNCTUATIONS]
+    pattern = r"(.*?(?:[" + "|".join(escaped_punctuations) + r"]))"
+    while remaining_text:
+        match = re.search(pattern, remaining_text)
+        if not match:
+            break
+        end_pos = match.end(1)
+        potential_sentence = remaining_text[:end_pos].strip()
+        if any(potential_sentence.endswith(abbrev) for abbrev in ABBREVIATIONS):
+            remaining_text = remaining_text[end_pos:].lstrip()
+            continue
+        complete_sentences.append(potential_sentence)
+        remaining_text = remaining_text[end_pos:].lstrip()
+    return complete_sentences, remaining_text
+
+
+CASES = [
+    (
+        "is_complete_sentence",
+        lambda: [legacy_is_complete_sentence(s) for s in SENTENCES],
+        lambda: [is_complete_sentence(s) for s in SENTENCES],
+    ),
+    (
+        "non-speech check",
+        lambda: [legacy_is_non_speech(s) for s in SENTENCES],
+        lambda: [is_non_speech(s) for s in SENTENCES],
+    ),
+    (
+        "strip action tags",
+        lambda: [legacy_strip_action_tags(s) for s in SENTENCES],
+        lambda: [strip_action_tags(s) for s in SENTENCES],
+    ),
+    (
+        "segment_text_by_regex",
+        lambda: legacy_segment_text_by_regex(TEXT),
+        lambda: segment_text_by_regex(TEXT),
+    ),
+]
+
+
+def main():
+    print(f"Sentences per call: {len(SENTENCES)}, calls: {NUMBER}")
+    for name, before_fn, after_fn in CASES:
+        assert before_fn() == after_fn(), f"{name}: results differ"
+        before = timeit.timeit(before_fn, number=NUMBER) / NUMBER * 1e6
+        after = timeit.timeit(after_fn, number=NUMBER) / NUMBER * 1e6
+        print(
+            f"{name:24s} before {before:7.2f} us  after {after:7.2f} us"
+            f"  ({before / after:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
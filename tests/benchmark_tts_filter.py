@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark tts_filter on long responses.
+
+Compares the legacy chain (filter_asterisks, one `_filter_nested` pass per
+bracket type, then remove_special_characters with a category lookup per
+character) with the fused single-traversal filter.
+"""
+
+import re
+import sys
+import timeit
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from src.agent_avatar.utils.tts_preprocessor import tts_filter  # noqa: E402
+
+ENGLISH = (
+    "Sure! *smiles warmly* Here is what I found about your trip (including the "
+    "weather). The forecast says it will be sunny [source: weather service] with "
+    "a light breeze <aside>perfect for a walk</aside>. **Tip:** bring sunscreen, "
+    "and maybe a hat (the UV index is high (around 8)). Let me know if you want "
+    "me to book anything for you!\n"
+) * 20
+
+CHINESE = (
+    "好的！*微笑* 我帮你查了一下天气（包括周末）。预报说会是晴天【来源：气象局】，"
+    "微风习习。**提示：**记得带防晒霜 😊，如果需要我帮你预订，请告诉我！\n"
+) * 20
+
+NUMBER = 200
+
+
+def legacy_remove_special_characters(text: str) -> str:
+    normalized_text = unicodedata.normalize("NFKC", text)
+
+    def is_valid_char(char: str) -> bool:
+        category = unicodedata.category(char)
+        return (
+            category.startswith("L")
+            or category.startswith("N")
+            or category.startswith("P")
+            or char.isspace()
+        )
+
+    return "".join(char for char in normalized_text if is_valid_char(char))
+
+
+def legacy_filter_nested(text: str, left: str, right: str) -> str:
+    if not text:
+        return text
+    result = []
+    depth = 0
+    for char in text:
+        if char == left:
+            depth += 1
+        elif char == right:
+            if depth > 0:
+                depth -= 1
+        else:
+            if depth == 0:
+                result.append(char)
+    return re.sub(r"\s+", " ", "".join(result)).strip()
+
+
+def legacy_filter_asterisks(text: str) -> str:
+    filtered_text = re.sub(r"\*{1,}((?!\*).)*?\*{1,}", "", text)
+    return re.sub(r"\s+", " ", filtered_text).strip()
+
+
+def legacy_tts_filter(text: str) -> str:
+    text = legacy_filter_asterisks(text)
+    text = legacy_filter_nested(text, "[", "]")
+    text = legacy_filter_nested(text, "(", ")")
+    text = legacy_filter_nested(text, "<", ">")
+    return legacy_remove_special_characters(text)
+
+
+def fused_tts_filter(text: str) -> str:
+    return tts_filter(
+        text=text,
+        remove_special_char=True,
+        ignore_brackets=True,
+        ignore_parentheses=True,
+        ignore_asterisks=True,
+        ignore_angle_brackets=True,
+    )
+
+
+def main():
+    logger.remove()
+    for name, text in (("English", ENGLISH), ("Chinese", CHINESE)):
+        assert legacy_tts_filter(text) == fused_tts_filter(text), f"{name}: differs"
+        before = timeit.timeit(lambda: legacy_tts_filter(text), number=NUMBER)
+        after = timeit.timeit(lambda: fused_tts_filter(text), number=NUMBER)
+        before, after = before / NUMBER * 1e6, after / NUMBER * 1e6
+        print(
+            f"{name:8s} ({len(text):5d} chars) before {before:8.1f} us"
+            f"  after {after:8.1f} us  ({before / after:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
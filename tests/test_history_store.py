@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Tests for the chat history stores.
+
+Covers the JSONL overlay format and its crash repair, the cache's guard
+against caching a load that raced with a write, the ordering of the async
+write queue, cursor paging, and that the JSONL and SQLite backends behave
+the same through HistoryStoreInterface.
+
+Runs with pytest or directly: uv run python tests/test_history_store.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.agent_avatar import chat_history_manager  # noqa: E402
+from src.agent_avatar.history_store.history_cache import (  # noqa: E402
+    CachedHistoryStore,
+)
+from src.agent_avatar.history_store.history_store_interface import (  # noqa: E402
+    HistoryStoreInterface,
+)
+from src.agent_avatar.history_store.history_writer import (  # noqa: E402
+    HistoryWriter,
+)
+from src.agent_avatar.history_store.jsonl_store import (  # noqa: E402
+    JsonlHistoryStore,
+    fold_records,
+    has_overlay_records,
+    read_jsonl_records,
+    repair_torn_tail,
+)
+from src.agent_avatar.history_store.sqlite_store import (  # noqa: E402
+    SqliteHistoryStore,
+)
+
+CONF = "conf"
+HISTORY = "history"
+METADATA = {"role": "metadata", "timestamp": "2025-01-01T00:00:00"}
+
+
+def make_message(i: int, timestamp: str = "") -> dict:
+    return {
+        "role": "human" if i % 2 == 0 else "ai",
+        "timestamp": timestamp or f"2025-01-01T00:00:{i:02d}",
+        "content": f"message {i}",
+    }
+
+
+@contextmanager
+def temp_dir() -> Iterator[str]:
+    with tempfile.TemporaryDirectory() as base_dir:
+        yield base_dir
+
+
+@contextmanager
+def each_backend() -> Iterator[List[HistoryStoreInterface]]:
+    """A fresh JSONL store and a fresh SQLite store"""
+    with temp_dir() as base_dir:
+        sqlite = SqliteHistoryStore(os.path.join(base_dir, "history.db"))
+        try:
+            yield [JsonlHistoryStore(os.path.join(base_dir, "jsonl")), sqlite]
+        finally:
+            sqlite.close()
+
+
+def test_overlay_fold_round_trip():
+    with temp_dir() as base_dir:
+        store = JsonlHistoryStore(base_dir)
+        store.create(CONF, HISTORY, METADATA)
+        store.append_messages(CONF, HISTORY, [make_message(i) for i in range(4)])
+        assert store.update_metadata(CONF, HISTORY, {"agent_id": "a0"})
+        assert store.modify_latest_message(CONF, HISTORY, "ai", "edited")
+        # Only the latest message can be edited, and only with its role
+        assert not store.modify_latest_message(CONF, HISTORY, "human", "nope")
+
+        path = store._existing_path(CONF, HISTORY)
+        records = read_jsonl_records(path)
+        assert has_overlay_records(records)
+        metadata, messages = fold_records(records)
+        assert metadata["agent_id"] == "a0"
+        assert [m["content"] for m in messages] == [
+            "message 0",
+            "message 1",
+            "message 2",
+            "edited",
+        ]
+        assert store.get_messages(CONF, HISTORY) == messages
+        assert store.get_metadata(CONF, HISTORY) == metadata
+
+        # Compaction folds the overlays into a plain header + messages file
+        assert store.compact(CONF, HISTORY)
+        compacted = read_jsonl_records(path)
+        assert not has_overlay_records(compacted)
+        assert fold_records(compacted) == (metadata, messages)
+
+        # A compacted history is left untouched
+        mtime = os.stat(path).st_mtime_ns
+        assert store.compact(CONF, HISTORY)
+        assert os.stat(path).st_mtime_ns == mtime
+
+
+def test_repair_torn_tail():
+    with temp_dir() as base_dir:
+        store = JsonlHistoryStore(base_dir)
+        store.create(CONF, HISTORY, METADATA)
+        store.append_messages(CONF, HISTORY, [make_message(i) for i in range(3)])
+        path = store._existing_path(CONF, HISTORY)
+        assert not repair_torn_tail(path)
+
+        # A line cut short by a crash is dropped
+        with open(path, "ab") as f:
+            f.write(json.dumps(make_message(3)).encode()[:-10])
+        assert repair_torn_tail(path)
+        assert len(store.get_messages(CONF, HISTORY)) == 3
+
+        # A complete line missing only its newline is kept
+        with open(path, "ab") as f:
+            f.write(json.dumps(make_message(3)).encode())
+        assert repair_torn_tail(path)
+        with open(path, "rb") as f:
+            assert f.read().endswith(b"\n")
+        store.append_message(CONF, HISTORY, make_message(4))
+        contents = [m["content"] for m in store.get_messages(CONF, HISTORY)]
+        assert contents == [f"message {i}" for i in range(5)]
+
+
+class _RacingBackend(JsonlHistoryStore):
+    """Appends a message through the cache while a load is reading"""
+
+    cache: CachedHistoryStore = None
+    raced = False
+
+    def get_messages(self, conf_uid, history_uid):
+        messages = super().get_messages(conf_uid, history_uid)
+        if not self.raced:
+            self.raced = True
+            self.cache.append_message(conf_uid, history_uid, make_message(99))
+        return messages
+
+
+def test_cache_skips_load_that_raced_with_write():
+    with temp_dir() as base_dir:
+        backend = _RacingBackend(base_dir)
+        cache = CachedHistoryStore(backend, max_messages=100)
+        backend.cache = cache
+        cache.create(CONF, HISTORY, METADATA)
+        cache.append_messages(CONF, HISTORY, [make_message(i) for i in range(3)])
+
+        # The load read the history before the append landed, so it is
+        # returned stale but must not be cached
+        assert len(cache.get_messages(CONF, HISTORY)) == 3
+        assert len(cache.get_messages(CONF, HISTORY)) == 4
+        assert cache.get_messages(CONF, HISTORY) == backend.get_messages(CONF, HISTORY)
+
+
+class _SlowStore(JsonlHistoryStore):
+    """Records the size of every append batch and makes each one take a while"""
+
+    def __init__(self, base_dir: str):
+        super().__init__(base_dir)
+        self.batches: List[Tuple[str, int]] = []
+
+    def append_messages(self, conf_uid, history_uid, messages, sync=False):
+        self.batches.append((history_uid, len(messages)))
+        time.sleep(0.02)
+        super().append_messages(conf_uid, history_uid, messages, sync)
+
+
+def test_writer_flush_keeps_order():
+    async def run(store: _SlowStore) -> None:
+        writer = HistoryWriter(lambda: store)
+        writer.append(CONF, HISTORY, make_message(0))
+        # Let the first write start before queueing the rest
+        await asyncio.sleep(0.005)
+        writer.append_many(CONF, HISTORY, [make_message(1), make_message(2)])
+        writer.append(CONF, HISTORY, make_message(3))
+        # Runs after the appends above, so it edits message 3
+        edited = writer.submit(
+            CONF,
+            HISTORY,
+            lambda s, c, h: s.modify_latest_message(c, h, "ai", "edited"),
+        )
+        last = writer.append(CONF, HISTORY, make_message(4))
+        writer.append(CONF, "other", make_message(0))
+
+        await writer.flush(CONF, HISTORY)
+        assert edited.result() is True
+        assert last.done()
+        contents = [m["content"] for m in store.get_messages(CONF, HISTORY)]
+        assert contents == [
+            "message 0",
+            "message 1",
+            "message 2",
+            "edited",
+            "message 4",
+        ]
+        await writer.flush()
+        assert writer.pending() == 0
+
+    with temp_dir() as base_dir:
+        store = _SlowStore(base_dir)
+        store.create(CONF, HISTORY, METADATA)
+        asyncio.run(run(store))
+        # Appends queued while the first was in flight went out together
+        assert [n for uid, n in store.batches if uid == HISTORY] == [1, 3, 1]
+        assert store.get_messages(CONF, "other") == [make_message(0)]
+
+
+def test_cursor_paging_across_equal_timestamps():
+    previous = chat_history_manager.get_history_store()
+    for backend in ("jsonl", "sqlite"):
+        with temp_dir() as base_dir:
+            store = chat_history_manager.init_history_store(backend, base_dir=base_dir)
+            try:
+                store.create(CONF, HISTORY, METADATA)
+                # Stored within the same second, so timestamps cannot
+                # tell the pages apart
+                store.append_messages(
+                    CONF,
+                    HISTORY,
+                    [make_message(i, "2025-01-01T00:00:00") for i in range(7)],
+                )
+                seen = []
+                sizes = []
+                page = chat_history_manager.get_history_page(CONF, HISTORY, limit=3)
+                while page["messages"]:
+                    sizes.append(len(page["messages"]))
+                    seen = page["messages"] + seen
+                    page = chat_history_manager.get_history_page(
+                        CONF,
+                        HISTORY,
+                        limit=3,
+                        before=chat_history_manager.page_cursor(page),
+                    )
+                assert sizes == [3, 3, 1], backend
+                assert [m["content"] for m in seen] == [
+                    f"message {i}" for i in range(7)
+                ], backend
+            finally:
+                if isinstance(store.backend, SqliteHistoryStore):
+                    store.backend.close()
+    chat_history_manager._history_store = previous
+
+
+def test_backend_parity():
+    def exercise(store: HistoryStoreInterface) -> list:
+        store.create(CONF, HISTORY, METADATA)
+        store.create(CONF, "empty", METADATA)
+        store.append_messages(CONF, HISTORY, [make_message(i) for i in range(6)])
+        store.append_message(CONF, "implicit", make_message(0))
+        results = [
+            store.exists(CONF, HISTORY),
+            store.exists(CONF, "missing"),
+            store.update_metadata(CONF, HISTORY, {"agent_id": "a0"}),
+            store.get_metadata(CONF, HISTORY),
+            store.modify_latest_message(CONF, HISTORY, "human", "nope"),
+            store.modify_latest_message(CONF, HISTORY, "ai", "edited"),
+            store.get_messages(CONF, HISTORY),
+            store.get_messages(CONF, "missing"),
+            store.get_message_page(CONF, HISTORY, None, 4),
+            store.get_message_page(CONF, HISTORY, 2, 3),
+            store.get_message_page(CONF, "missing", None, 4),
+            store.count_messages_before(CONF, HISTORY, "2025-01-01T00:00:03"),
+            store.count_messages_before(CONF, "missing", "2025-01-01T00:00:03"),
+            sorted(store.list_history_summaries(CONF)),
+            store.list_conf_uids(),
+            store.rename(CONF, HISTORY, "renamed"),
+            store.get_messages(CONF, HISTORY),
+            store.get_messages(CONF, "renamed"),
+            store.delete(CONF, "empty"),
+            store.delete(CONF, "empty"),
+            sorted(uid for uid, _, _ in store.list_history_summaries(CONF)),
+            store.compact(CONF, "renamed"),
+            store.get_messages(CONF, "renamed"),
+        ]
+        assert store.history_size(CONF, "renamed") > 0
+        assert store.history_size(CONF, "missing") == 0
+        return results
+
+    with each_backend() as (jsonl, sqlite):
+        assert exercise(jsonl) == exercise(sqlite)
+
+
+if __name__ == "__main__":
+    tests = [
+        (name, test)
+        for name, test in list(globals().items())
+        if name.startswith("test_") and callable(test)
+    ]
+    for name, test in tests:
+        test()
+        print(f"ok  {name}")
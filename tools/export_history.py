@@ -0,0 +1,365 @@
+"""
+Export chat histories to a compressed columnar dataset for analytics.
+
+Every message becomes one row with its conf_uid, history_uid, position,
+role, timestamp, content length, the seconds since the previous message of
+the history, the `[emotion]` tags it contains and whether it marks a user
+interruption. With --content the message text and speaker name are
+included as well.
+
+The output directory holds one part file per run (Parquet with zstd, or
+Arrow IPC with --format arrow) plus `_export_state.json`, which records how
+many messages of each history were exported. A later run only exports
+messages appended since, so the directory can be refreshed regularly and
+read as one dataset (e.g. `pyarrow.dataset.dataset(out_dir)` or
+`duckdb "SELECT * FROM 'out_dir/*.parquet'"`). Rows are never rewritten:
+an edit to a message that was already exported is not picked up, and a
+history that shrank (deleted and recreated) is exported again from the
+start.
+
+Histories are read one at a time and rows are written in batches, so memory
+use does not depend on the amount of history.
+
+Requires pyarrow, which is not installed by default:
+    uv pip install pyarrow
+
+Usage:
+    uv run python -m tools.export_history [--dir chat_history] [--out chat_history_export]
+    uv run python -m tools.export_history --sqlite chat_history/history.db --format arrow
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.agent_avatar.history_store.jsonl_store import (
+    HISTORY_EXT,
+    LEGACY_HISTORY_EXT,
+    read_history_file,
+)
+
+STATE_FILE = "_export_state.json"
+BATCH_ROWS = 10000
+# Messages read at a time from a SQLite store
+SQLITE_PAGE = 1000
+INTERRUPTED_CONTENT = "[Interrupted by user]"
+
+_EMOTION_TAG = re.compile(r"\[([\w-]+)\]")
+
+
+def _schema(pa, include_content: bool):
+    fields = [
+        pa.field("conf_uid", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("history_uid", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("seq", pa.int32()),
+        pa.field("role", pa.dictionary(pa.int8(), pa.string())),
+        pa.field("timestamp", pa.timestamp("ms")),
+        pa.field("length", pa.int32()),
+        pa.field("seconds_since_previous", pa.float64()),
+        pa.field("emotions", pa.list_(pa.string())),
+        pa.field("interrupted", pa.bool_()),
+    ]
+    if include_content:
+        fields += [pa.field("name", pa.string()), pa.field("content", pa.string())]
+    return pa.schema(fields)
+
+
+def _parse_time(timestamp: Optional[str]) -> Optional[datetime]:
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+
+
+def message_rows(
+    conf_uid: str,
+    history_uid: str,
+    messages: List[dict],
+    start: int,
+    previous: Optional[dict] = None,
+) -> Iterator[dict]:
+    """
+    Rows for messages that are at positions start, start + 1, ... of a history.
+
+    Args:
+        previous: The message before messages[0], for the time delta
+    """
+    previous_time = _parse_time(previous.get("timestamp")) if previous else None
+    for seq, message in enumerate(messages, start):
+        content = message.get("content") or ""
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False)
+        time = _parse_time(message.get("timestamp"))
+        role = message.get("role", "")
+        yield {
+            "conf_uid": conf_uid,
+            "history_uid": history_uid,
+            "seq": seq,
+            "role": role,
+            "timestamp": time,
+            "length": len(content),
+            "seconds_since_previous": (
+                (time - previous_time).total_seconds()
+                if time is not None and previous_time is not None
+                else None
+            ),
+            "emotions": _EMOTION_TAG.findall(content) if role == "ai" else [],
+            "interrupted": role == "system" and content == INTERRUPTED_CONTENT,
+            "name": message.get("name"),
+            "content": content,
+        }
+        previous_time = time
+
+
+class _BatchWriter:
+    """Writes rows to one part file in record batches, created on the first row"""
+
+    def __init__(self, pa, path: str, file_format: str, include_content: bool):
+        self.pa = pa
+        self.path = path
+        self.file_format = file_format
+        self.schema = _schema(pa, include_content)
+        self.rows = 0
+        self._columns: Dict[str, list] = {name: [] for name in self.schema.names}
+        self._buffered = 0
+        self._writer = None
+
+    def add(self, row: dict) -> None:
+        for name, values in self._columns.items():
+            values.append(row[name])
+        self._buffered += 1
+        if self._buffered >= BATCH_ROWS:
+            self._flush()
+
+    def _open(self):
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        import pyarrow.ipc as ipc
+
+        return ipc.new_file(
+            self.path, self.schema, options=ipc.IpcWriteOptions(compression="zstd")
+        )
+
+    def _flush(self) -> None:
+        if not self._buffered:
+            return
+        batch = self.pa.RecordBatch.from_pydict(self._columns, schema=self.schema)
+        if self._writer is None:
+            self._writer = self._open()
+        if self.file_format == "parquet":
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write(batch)
+        self.rows += self._buffered
+        self._columns = {name: [] for name in self.schema.names}
+        self._buffered = 0
+
+    def close(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _load_state(out_dir: str) -> dict:
+    path = os.path.join(out_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {"histories": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_state(out_dir: str, state: dict) -> None:
+    path = os.path.join(out_dir, STATE_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def iter_history_files(base_dir: str) -> Iterator[Tuple[str, str, str]]:
+    """(conf_uid, history_uid, path) of every history file, JSONL preferred"""
+    for conf_uid in sorted(os.listdir(base_dir)):
+        conf_dir = os.path.join(base_dir, conf_uid)
+        if not os.path.isdir(conf_dir):
+            continue
+        filenames = sorted(os.listdir(conf_dir))
+        for filename in filenames:
+            if filename.endswith(HISTORY_EXT):
+                history_uid = filename[: -len(HISTORY_EXT)]
+            elif filename.endswith(LEGACY_HISTORY_EXT):
+                history_uid = filename[: -len(LEGACY_HISTORY_EXT)]
+                if f"{history_uid}{HISTORY_EXT}" in filenames:
+                    continue
+            else:
+                continue
+            yield conf_uid, history_uid, os.path.join(conf_dir, filename)
+
+
+def export_files(base_dir: str, writer: _BatchWriter, state: dict) -> Tuple[int, int]:
+    """
+    Export new messages of the history files under base_dir.
+
+    Returns:
+        Tuple[int, int]: Histories with new messages, and histories that failed
+    """
+    histories = state["histories"]
+    updated = failed = 0
+    for conf_uid, history_uid, path in iter_history_files(base_dir):
+        key = f"{conf_uid}/{history_uid}"
+        entry = histories.get(key, {})
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        if entry.get("signature") == signature:
+            continue
+        try:
+            _, messages = read_history_file(path)
+        except Exception as e:
+            print(f"Failed to read {path}: {e}")
+            failed += 1
+            continue
+        start = entry.get("exported", 0)
+        if len(messages) < start:
+            start = 0
+        if len(messages) > start:
+            previous = messages[start - 1] if start else None
+            for row in message_rows(
+                conf_uid, history_uid, messages[start:], start, previous
+            ):
+                writer.add(row)
+            updated += 1
+        histories[key] = {"exported": len(messages), "signature": signature}
+    return updated, failed
+
+
+def export_sqlite(db_path: str, writer: _BatchWriter, state: dict) -> Tuple[int, int]:
+    """
+    Export new messages of every history in a SQLite history store.
+
+    Returns:
+        Tuple[int, int]: Histories with new messages, and histories that failed
+    """
+    from src.agent_avatar.history_store.sqlite_store import SqliteHistoryStore
+
+    store = SqliteHistoryStore(db_path)
+    histories = state["histories"]
+    updated = failed = 0
+    try:
+        for conf_uid in store.list_conf_uids():
+            for summary in store.list_history_summaries(conf_uid):
+                key = f"{conf_uid}/{summary.history_uid}"
+                start = histories.get(key, {}).get("exported", 0)
+                if summary.message_count < start:
+                    start = 0
+                if summary.message_count == start:
+                    continue
+                try:
+                    previous = None
+                    if start:
+                        page = store.get_message_page(
+                            conf_uid, summary.history_uid, start - 1, 1
+                        )
+                        previous = page[0][0] if page and page[0] else None
+                    offset = start
+                    while offset < summary.message_count:
+                        page = store.get_message_page(
+                            conf_uid, summary.history_uid, offset, SQLITE_PAGE
+                        )
+                        if not page or not page[0]:
+                            break
+                        messages = page[0]
+                        for row in message_rows(
+                            conf_uid, summary.history_uid, messages, offset, previous
+                        ):
+                            writer.add(row)
+                        previous = messages[-1]
+                        offset += len(messages)
+                except Exception as e:
+                    print(f"Failed to export {key}: {e}")
+                    failed += 1
+                    continue
+                histories[key] = {"exported": offset}
+                updated += 1
+    finally:
+        store.close()
+    return updated, failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Export chat histories to Parquet or Arrow for analytics"
+    )
+    parser.add_argument("--dir", default="chat_history", help="Chat history directory")
+    parser.add_argument(
+        "--sqlite",
+        metavar="DB_PATH",
+        help="Export from this SQLite history store instead",
+    )
+    parser.add_argument(
+        "--out", default="chat_history_export", help="Output dataset directory"
+    )
+    parser.add_argument(
+        "--format", choices=["parquet", "arrow"], default="parquet", help="File format"
+    )
+    parser.add_argument(
+        "--content",
+        action="store_true",
+        help="Include message text and speaker name",
+    )
+    args = parser.parse_args()
+
+    try:
+        import pyarrow as pa
+    except ImportError:
+        print("pyarrow is required for exporting: uv pip install pyarrow")
+        return 1
+
+    if not args.sqlite and not os.path.isdir(args.dir):
+        print(f"No chat history directory at {args.dir}")
+        return 1
+
+    os.makedirs(args.out, exist_ok=True)
+    state = _load_state(args.out)
+    for option in ("format", "content"):
+        if state.get(option, getattr(args, option)) != getattr(args, option):
+            print(f"--{option} must match the earlier exports in {args.out}")
+            return 1
+    state["format"] = args.format
+    state["content"] = args.content
+
+    ext = "parquet" if args.format == "parquet" else "arrow"
+    part = f"part-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.{ext}"
+    writer = _BatchWriter(pa, os.path.join(args.out, part), args.format, args.content)
+    try:
+        if args.sqlite:
+            updated, failed = export_sqlite(args.sqlite, writer, state)
+        else:
+            updated, failed = export_files(args.dir, writer, state)
+        writer.close()
+    except BaseException:
+        # Progress is not saved, so drop the partial part file too
+        writer.close()
+        if os.path.exists(writer.path):
+            os.remove(writer.path)
+        raise
+    # Only record progress once the rows are safely in the part file
+    _save_state(args.out, state)
+
+    if writer.rows:
+        print(f"Exported {writer.rows} messages from {updated} histories to {part}")
+    else:
+        print("No new messages")
+    if failed:
+        print(f"Failed {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
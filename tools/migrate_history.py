@@ -0,0 +1,135 @@
+"""
+Migrate chat histories from the single-JSON-array format to JSONL, or import
+them into the SQLite history store.
+
+Every `chat_history/<conf_uid>/<history_uid>.json` file is rewritten as an
+append-only `<history_uid>.jsonl` file and the original is removed. With
+--compact, existing JSONL histories are also compacted, folding appended
+metadata updates and message edits back into a plain header + messages file.
+
+With --sqlite, every .json and .jsonl history is instead copied into the given
+database (files are left in place) for use with `history_backend: "sqlite"`.
+
+Usage:
+    uv run python -m tools.migrate_history [--dir chat_history] [--compact]
+    uv run python -m tools.migrate_history --sqlite chat_history/history.db
+"""
+
+import argparse
+import os
+import sys
+
+from src.agent_avatar.history_store.jsonl_store import (
+    HISTORY_EXT,
+    LEGACY_HISTORY_EXT,
+    migrate_legacy_file,
+    read_history_file,
+    write_history_file,
+)
+
+
+def migrate_histories(base_dir: str, compact: bool = False) -> tuple[int, int, int]:
+    """
+    Migrate (and optionally compact) every history under base_dir.
+
+    Returns:
+        tuple[int, int, int]: Histories migrated, compacted and failed
+    """
+    migrated = compacted = failed = 0
+    for conf_uid in sorted(os.listdir(base_dir)):
+        conf_dir = os.path.join(base_dir, conf_uid)
+        if not os.path.isdir(conf_dir):
+            continue
+        for filename in sorted(os.listdir(conf_dir)):
+            path = os.path.join(conf_dir, filename)
+            try:
+                if filename.endswith(LEGACY_HISTORY_EXT):
+                    if os.path.exists(path[: -len(LEGACY_HISTORY_EXT)] + HISTORY_EXT):
+                        print(f"Skipping {path}: a JSONL history already exists")
+                        continue
+                    migrate_legacy_file(path)
+                    migrated += 1
+                elif compact and filename.endswith(HISTORY_EXT):
+                    metadata, messages = read_history_file(path)
+                    write_history_file(path, metadata, messages)
+                    compacted += 1
+            except Exception as e:
+                print(f"Failed to migrate {path}: {e}")
+                failed += 1
+    return migrated, compacted, failed
+
+
+def import_histories_to_sqlite(base_dir: str, db_path: str) -> tuple[int, int]:
+    """
+    Copy every .json and .jsonl history under base_dir into a SQLite store.
+    A history already in the database is replaced.
+
+    Returns:
+        tuple[int, int]: Histories imported and failed
+    """
+    from src.agent_avatar.history_store.sqlite_store import SqliteHistoryStore
+
+    store = SqliteHistoryStore(db_path)
+    imported = failed = 0
+    try:
+        for conf_uid in sorted(os.listdir(base_dir)):
+            conf_dir = os.path.join(base_dir, conf_uid)
+            if not os.path.isdir(conf_dir):
+                continue
+            filenames = sorted(os.listdir(conf_dir))
+            for filename in filenames:
+                path = os.path.join(conf_dir, filename)
+                if filename.endswith(HISTORY_EXT):
+                    history_uid = filename[: -len(HISTORY_EXT)]
+                elif filename.endswith(LEGACY_HISTORY_EXT):
+                    history_uid = filename[: -len(LEGACY_HISTORY_EXT)]
+                    if f"{history_uid}{HISTORY_EXT}" in filenames:
+                        # The JSONL file is the newer copy
+                        continue
+                else:
+                    continue
+                try:
+                    metadata, messages = read_history_file(path)
+                    store.import_history(conf_uid, history_uid, metadata, messages)
+                    imported += 1
+                except Exception as e:
+                    print(f"Failed to import {path}: {e}")
+                    failed += 1
+    finally:
+        store.close()
+    return imported, failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Migrate chat histories from JSON to append-only JSONL or SQLite"
+    )
+    parser.add_argument("--dir", default="chat_history", help="Chat history directory")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Also compact histories that are already JSONL",
+    )
+    parser.add_argument(
+        "--sqlite",
+        metavar="DB_PATH",
+        help="Import all histories into this SQLite database instead",
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        print(f"No chat history directory at {args.dir}")
+        return 1
+
+    if args.sqlite:
+        imported, failed = import_histories_to_sqlite(args.dir, args.sqlite)
+        print(f"Imported {imported}, failed {failed}")
+        return 1 if failed else 0
+
+    migrated, compacted, failed = migrate_histories(args.dir, args.compact)
+    print(f"Migrated {migrated}, compacted {compacted}, failed {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())